@@ -0,0 +1,87 @@
+"""모델 캐스케이드(작은 모델 -> 큰 모델)의 지연과 비용을 큰 모델만 쓸 때와 비교합니다.
+
+두 개의 로컬 OpenAI 호환 스텁 서버(llm_stub_server.py)를 작은 모델(빠름)과 큰 모델(느림)로
+띄우고, cascade_queries.json의 메시지를 각 방식으로 보내 p50/p95 지연, 비용, 에스컬레이션
+비율을 출력합니다. 비용은 스텁이 돌려주는 토큰 수와 아래 가격(100만 토큰당 USD)으로 계산합니다.
+
+사용법:
+    python benchmarks/bench_cascade.py [--rounds 5] [--small-ms 80] [--large-ms 400] [--escalate-rate 0.1]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.model_settings import ModelSettings
+from agents.models.interface import ModelTracing
+
+from src.llm_factory import LLMFactory, model_stats
+from bench_llm_routing import stub_servers
+
+SMALL_PRICES = {"input_cost_per_1m": 0.15, "output_cost_per_1m": 0.6}
+LARGE_PRICES = {"input_cost_per_1m": 2.5, "output_cost_per_1m": 10.0}
+QUERIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cascade_queries.json")
+
+
+def _llm_config(mode):
+    config = {"llm_provider": "ollama", "model_name": "large", "ollama_base_url": "http://127.0.0.1:8102/v1", **LARGE_PRICES}
+    if mode is not None:
+        config["cascade"] = {
+            "small": {"llm_provider": "ollama", "model_name": "small", "ollama_base_url": "http://127.0.0.1:8101/v1", **SMALL_PRICES},
+            "mode": mode,
+        }
+    return config
+
+
+async def run_once(mode, queries, rounds: int) -> dict:
+    model = LLMFactory(_llm_config(mode)).get_model()
+    latencies = []
+    large_only_cost = 0.0
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            response = await model.get_response("You are a helpful assistant.", query, ModelSettings(), [], None, [],
+                                                ModelTracing.DISABLED, previous_response_id=None)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            large_only_cost += (response.usage.input_tokens * LARGE_PRICES["input_cost_per_1m"]
+                                + response.usage.output_tokens * LARGE_PRICES["output_cost_per_1m"]) / 1_000_000
+    latencies.sort()
+    stats = model_stats(model)
+    return {
+        "mode": mode or "large only",
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "cost": stats["cost_usd"] if stats else large_only_cost,
+        "escalation_rate": stats["escalation_rate"] if stats else 1.0,
+        "requests": len(latencies),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--small-ms", type=float, default=80)
+    parser.add_argument("--large-ms", type=float, default=400)
+    parser.add_argument("--escalate-rate", type=float, default=0.1, help="작은 모델이 [ESCALATE]를 답하는 비율")
+    args = parser.parse_args()
+
+    with open(QUERIES, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    stubs = [{"ttft_ms": args.small_ms, "escalate_rate": args.escalate_rate}, {"ttft_ms": args.large_ms}]
+    print(f"queries={len(queries)}, rounds={args.rounds}, small_ms={args.small_ms}, large_ms={args.large_ms}")
+    print(f"{'mode':>11} {'p50_ms':>8} {'p95_ms':>8} {'escalated':>9} {'$/1k req':>9}")
+    with stub_servers(stubs):
+        for mode in (None, "classifier", "confidence"):
+            r = await run_once(mode, queries, args.rounds)
+            print(f"{r['mode']:>11} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['escalation_rate']:>9.0%} "
+                  f"{r['cost'] / r['requests'] * 1000:>9.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""같은 FastMCP 서버를 stdio 서브프로세스와 in-process로 실행했을 때의 오버헤드를 비교합니다.
+
+slow_tool_server.py의 slow_echo를 delay_ms=0으로 호출해 도구 작업 시간을 빼고
+전송 계층 비용(연결 시간, 호출당 지연, 처리량)만 측정합니다.
+
+사용법:
+    python benchmarks/bench_inprocess.py [--calls 500] [--concurrency 1]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent_setup import create_mcp_server, connect_server
+
+
+def _server_config(in_process: bool) -> dict:
+    return {
+        "name": "slow-tool-server",
+        "command": sys.executable,
+        "args": [os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_tool_server.py")],
+        "in_process": in_process,
+    }
+
+
+async def run_once(in_process: bool, calls: int, concurrency: int) -> dict:
+    start = time.perf_counter()
+    server = await connect_server(create_mcp_server(_server_config(in_process)), use_schema_cache=False)
+    startup_ms = (time.perf_counter() - start) * 1000.0
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def _call(i: int):
+        async with semaphore:
+            call_start = time.perf_counter()
+            result = await server.call_tool("slow_echo", {"text": str(i), "delay_ms": 0})
+            latencies.append((time.perf_counter() - call_start) * 1000.0)
+            assert not result.isError and result.content[0].text == str(i)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(_call(i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.cleanup()
+
+    latencies.sort()
+    return {
+        "transport": "in-process" if in_process else "stdio",
+        "startup_ms": startup_ms,
+        "throughput": calls / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"calls={args.calls}, concurrency={args.concurrency}")
+    print(f"{'transport':>10} {'startup_ms':>11} {'calls/s':>9} {'p50_ms':>8} {'p95_ms':>8}")
+    for in_process in (False, True):
+        r = await run_once(in_process, args.calls, args.concurrency)
+        print(f"{r['transport']:>10} {r['startup_ms']:>11.1f} {r['throughput']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""두 개의 로컬 OpenAI 호환 스텁 서버(llm_stub_server.py)로 LLM 제공자 라우팅을 측정합니다.
+
+시나리오:
+    healthy  A는 빠르고 B는 느림 (weighted): 대부분의 요청이 A로 가는지
+    outage   A가 모든 요청에 503 (ordered): 실패 없이 B로 넘어가는지, A가 배정에서 빠지는지
+    tail     A에 가끔 10배 지연 (ordered, hedge 전/후): p99와 추가 요청 비율
+
+사용법:
+    python benchmarks/bench_llm_routing.py [--calls 200] [--concurrency 4] [--scenarios healthy outage tail]
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.model_settings import ModelSettings
+from agents.models.interface import ModelTracing
+
+from src.llm_factory import LLMFactory
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_stub_server.py")
+PORTS = (8101, 8102)
+
+SCENARIOS = {
+    "healthy": {"stubs": [{"ttft_ms": 50}, {"ttft_ms": 200}], "routing": "weighted", "hedge": [False]},
+    "outage": {"stubs": [{"ttft_ms": 50, "error_rate": 1.0}, {"ttft_ms": 80}], "routing": "ordered", "hedge": [False]},
+    "tail": {"stubs": [{"ttft_ms": 50, "stall_rate": 0.05}, {"ttft_ms": 60}], "routing": "ordered", "hedge": [False, True]},
+}
+
+
+def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"stub server on port {port} did not start")
+
+
+@contextmanager
+def stub_servers(stubs):
+    processes = []
+    try:
+        for name, port, options in zip("AB", PORTS, stubs):
+            command = [sys.executable, STUB, "--port", str(port), "--name", name]
+            for key, value in options.items():
+                command += [f"--{key.replace('_', '-')}", str(value)]
+            processes.append(subprocess.Popen(command))
+        for port in PORTS[:len(stubs)]:
+            _wait_for_port(port)
+        yield
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+async def run_once(routing: str, hedge: bool, calls: int, concurrency: int) -> dict:
+    factory = LLMFactory({
+        "providers": [
+            {"name": name, "llm_provider": "ollama", "model_name": "stub", "ollama_base_url": f"http://127.0.0.1:{port}/v1"}
+            for name, port in zip("AB", PORTS)
+        ],
+        "routing": routing,
+        "hedge": hedge,
+    })
+    model = factory.get_model()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def _call():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await model.get_response(None, "hello", ModelSettings(), [], None, [], ModelTracing.DISABLED,
+                                         previous_response_id=None)
+            except Exception:
+                failures += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+    await asyncio.gather(*(_call() for _ in range(calls)))
+    latencies.sort()
+    stats = model.stats()
+    return {
+        "share": {name: p["requests"] for name, p in stats["providers"].items()},
+        "failures": failures,
+        "failovers": stats["failovers"],
+        "extra": stats["hedged"] / calls,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+
+    print(f"calls={args.calls}, concurrency={args.concurrency}")
+    print(f"{'scenario':>8} {'routing':>8} {'hedge':>5} {'A req':>6} {'B req':>6} {'fail':>5} "
+          f"{'failover':>8} {'extra':>6} {'p50_ms':>8} {'p99_ms':>8}")
+    for name in args.scenarios:
+        scenario = SCENARIOS[name]
+        with stub_servers(scenario["stubs"]):
+            for hedge in scenario["hedge"]:
+                r = await run_once(scenario["routing"], hedge, args.calls, args.concurrency)
+                print(f"{name:>8} {scenario['routing']:>8} {'on' if hedge else 'off':>5} {r['share']['A']:>6} "
+                      f"{r['share']['B']:>6} {r['failures']:>5} {r['failovers']:>8} {r['extra']:>6.1%} "
+                      f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Ollama 모델 상주 유지(keep-warm)와 요청 대기열의 효과를 측정합니다.
+
+llm_stub_server.py를 Ollama처럼 동작하게 띄웁니다. keep_alive(기본 2초)가 지나면 모델이
+내려가고 다시 불러오는 데 --load-ms가 걸리며, 서버는 --parallel개 요청만 동시에 처리합니다.
+유휴 시간(--idle-s)을 두고 요청 묶음을 보내 keep-warm 끄기/켜기의 p50/p99와
+클라이언트 대기열 대기 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_ollama_warm.py [--bursts 5] [--burst-size 6] [--idle-s 3] [--load-ms 1500]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.model_settings import ModelSettings
+from agents.models.interface import ModelTracing
+
+import src.ollama
+from src.llm_factory import LLMFactory
+from bench_llm_routing import stub_servers
+
+PARALLEL = 2
+KEEP_ALIVE_S = 2.0
+
+
+async def run_once(keep_warm: bool, bursts: int, burst_size: int, idle_s: float) -> dict:
+    # 스텁의 keep_alive가 짧으므로 유지 ping 주기도 그에 맞춰 줄임
+    src.ollama.OLLAMA_KEEPALIVE_INTERVAL = KEEP_ALIVE_S / 2
+    model = LLMFactory({
+        "llm_provider": "ollama", "model_name": "stub", "ollama_base_url": "http://127.0.0.1:8101/v1",
+        "ollama_num_parallel": PARALLEL, "ollama_keep_warm": keep_warm,
+    }).get_model()
+    latencies = []
+
+    async def _call():
+        start = time.perf_counter()
+        await model.get_response(None, "hello", ModelSettings(), [], None, [], ModelTracing.DISABLED,
+                                 previous_response_id=None)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    await asyncio.sleep(idle_s)  # 시작 시 warm-up이 끝날 시간
+    for _ in range(bursts):
+        await asyncio.gather(*(_call() for _ in range(burst_size)))
+        await asyncio.sleep(idle_s)
+    latencies.sort()
+    wait = model.stats()["queue_wait"]
+    return {
+        "keep_warm": keep_warm,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "max_ms": latencies[-1],
+        "queue_wait_p50_ms": wait["p50_ms"],
+        "queue_wait_p95_ms": wait["p95_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-size", type=int, default=6)
+    parser.add_argument("--idle-s", type=float, default=3.0)
+    parser.add_argument("--load-ms", type=float, default=1500)
+    parser.add_argument("--ttft-ms", type=float, default=100)
+    parser.add_argument("--single", choices=["on", "off"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        # 프로세스 공용 OllamaServer 상태가 섞이지 않도록 방식마다 별도 프로세스에서 실행
+        result = asyncio.run(run_once(args.single == "on", args.bursts, args.burst_size, args.idle_s))
+        print(json.dumps(result))
+        return
+
+    print(f"bursts={args.bursts}x{args.burst_size}, idle_s={args.idle_s}, load_ms={args.load_ms}, "
+          f"server parallel={PARALLEL}, server keep_alive={KEEP_ALIVE_S}s")
+    print(f"{'keep_warm':>9} {'p50_ms':>8} {'p99_ms':>8} {'max_ms':>8} {'wait_p50':>9} {'wait_p95':>9}")
+    stub = {"ttft_ms": args.ttft_ms, "load_ms": args.load_ms, "keep_alive_s": KEEP_ALIVE_S, "parallel": PARALLEL}
+    for mode in ("off", "on"):
+        with stub_servers([stub]):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--single", mode, "--bursts", str(args.bursts),
+                 "--burst-size", str(args.burst_size), "--idle-s", str(args.idle_s)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>9} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} "
+              f"{r['queue_wait_p50_ms']:>9.1f} {r['queue_wait_p95_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
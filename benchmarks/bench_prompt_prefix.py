@@ -0,0 +1,81 @@
+"""도구 순서/스키마 고정(StablePromptModel)이 LLM 요청 앞부분을 얼마나 일정하게 유지하는지 측정합니다.
+
+tool_routing_queries.json의 도구 목록으로 실행마다 MCP 서버 연결 순서와 스키마 키 순서가
+달라지는 상황을 흉내 내고, Chat Completions 요청의 앞부분(도구 스키마 + 시스템 프롬프트)이
+직전 요청과 몇 % 일치하는지(= 제공자 프롬프트 캐시가 재사용할 수 있는 비율의 상한)를 출력합니다.
+
+사용법:
+    python benchmarks/bench_prompt_prefix.py [--runs 50]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.mcp.util import MCPUtil
+from agents.models.chatcmpl_converter import Converter
+
+from src.config import PROMPT_DIR
+from src.utils import load_prompt
+from src.prompt_assembly import stable_tools
+from bench_tool_routing import CatalogServer
+
+QUERIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_routing_queries.json")
+
+
+def _shuffled_schema(value, rng):
+    if isinstance(value, dict):
+        keys = list(value)
+        rng.shuffle(keys)
+        return {key: _shuffled_schema(value[key], rng) for key in keys}
+    return value
+
+
+def _request_prefix(tools, instructions: str) -> str:
+    payload = json.dumps([Converter.tool_to_openai(tool) for tool in tools], ensure_ascii=False)
+    return payload + instructions
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(QUERIES, "r", encoding="utf-8") as f:
+        catalog = json.load(f)["servers"]
+    instructions = load_prompt("prompt.txt", PROMPT_DIR)
+    rng = random.Random(0)
+
+    print(f"runs={args.runs}, tools={sum(len(tools) for tools in catalog.values())}")
+    print(f"{'stable':>6} {'distinct prefixes':>17} {'avg reusable prefix':>19}")
+    for stable in (False, True):
+        previous, prefixes, ratios = None, set(), []
+        for _ in range(args.runs):
+            # 실행마다 서버 연결 순서와 스키마 키 순서가 달라지는 상황
+            names = list(catalog)
+            rng.shuffle(names)
+            tools = []
+            for name in names:
+                server = CatalogServer(name, [dict(t, inputSchema=_shuffled_schema(t["inputSchema"], rng)) for t in catalog[name]])
+                tools.extend(MCPUtil.to_function_tool(tool, server, False) for tool in server.tools)
+            prefix = _request_prefix(stable_tools(tools) if stable else tools, instructions)
+            prefixes.add(prefix)
+            if previous is not None:
+                ratios.append(_common_prefix(previous, prefix) / len(prefix))
+            previous = prefix
+        print(f"{'yes' if stable else 'no':>6} {len(prefixes):>17} {sum(ratios) / len(ratios):>19.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""stdio MCP 서버 복제본 수에 따른 도구 호출 처리량을 측정합니다.
+
+--stall-rate로 일부 호출을 10배 느리게 만들고 --hedge를 주면 헤징(p95 이후 다른 복제본에
+재요청) 적용 시 꼬리 지연과 추가 요청 비율을 비교할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_replicas.py [--replicas 1 2 4] [--calls 40] [--concurrency 8] [--delay-ms 100]
+    python benchmarks/bench_replicas.py --replicas 4 --calls 600 --concurrency 2 --delay-ms 20 --stall-rate 0.02 --hedge
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent_setup import create_mcp_server, connect_server
+
+
+def _server_config(replicas: int, hedge: bool) -> dict:
+    return {
+        "name": "slow-tool-server",
+        "command": sys.executable,
+        "args": [os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_tool_server.py")],
+        "replicas": replicas,
+        "hedge_tools": ["slow_echo"] if hedge else [],
+    }
+
+
+async def run_once(replicas: int, calls: int, concurrency: int, delay_ms: int,
+                   stall_rate: float = 0.0, hedge: bool = False) -> dict:
+    server = await connect_server(create_mcp_server(_server_config(replicas, hedge)), use_schema_cache=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def _call(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await server.call_tool("slow_echo", {"text": str(i), "delay_ms": delay_ms, "stall_rate": stall_rate})
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(_call(i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.cleanup()
+
+    latencies.sort()
+    return {
+        "replicas": replicas,
+        "startup_ms": server.startup_ms,
+        "throughput": calls / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "mean_ms": statistics.mean(latencies),
+        "extra_requests": getattr(server, 'hedged_count', 0) / calls,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--delay-ms", type=int, default=100)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--hedge", action="store_true", help="헤징 적용 전/후를 비교")
+    args = parser.parse_args()
+
+    print(f"calls={args.calls}, concurrency={args.concurrency}, delay_ms={args.delay_ms}, stall_rate={args.stall_rate}")
+    print(f"{'replicas':>8} {'hedge':>5} {'startup_ms':>11} {'calls/s':>9} {'mean_ms':>8} "
+          f"{'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'extra':>6}")
+    baseline = None
+    for replicas in args.replicas:
+        for hedge in ([False, True] if args.hedge else [False]):
+            r = await run_once(replicas, args.calls, args.concurrency, args.delay_ms, args.stall_rate, hedge)
+            baseline = baseline or r["throughput"]
+            print(
+                f"{r['replicas']:>8} {'on' if hedge else 'off':>5} {r['startup_ms']:>11.1f} {r['throughput']:>9.1f} "
+                f"{r['mean_ms']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+                f"{r['extra_requests']:>6.1%}  (x{r['throughput'] / baseline:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""고정 질의 세트에서 도구 라우팅에 따른 프롬프트 토큰 감소량을 측정합니다.
+
+tool_routing_queries.json의 도구 목록(여러 MCP 서버의 예시 스키마)과 질의마다
+라우팅 전/후 LLM 요청에 실리는 도구 스키마의 토큰 수, 기대 도구 포함 여부(recall)를 출력합니다.
+tiktoken이 설치되어 있으면 o200k_base로 세고, 없으면 UTF-8 바이트 수 / 4로 추정합니다.
+
+사용법:
+    python benchmarks/bench_tool_routing.py [--top-k 8] [--queries benchmarks/tool_routing_queries.json]
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.mcp import MCPServer
+from mcp.types import Tool as MCPTool
+
+from src.tool_router import ToolRouter
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except ImportError:
+    _encoding = None
+
+
+class CatalogServer(MCPServer):
+    """도구 목록만 제공하는 측정용 서버."""
+
+    def __init__(self, name, tools):
+        self._name = name
+        self.tools = [MCPTool.model_validate(tool) for tool in tools]
+
+    @property
+    def name(self):
+        return self._name
+
+    async def connect(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def list_tools(self):
+        return self.tools
+
+    async def call_tool(self, tool_name, arguments):
+        raise NotImplementedError
+
+
+def count_tokens(tools) -> int:
+    """Chat Completions 요청의 tools 필드와 같은 형태로 직렬화한 도구 스키마의 토큰 수."""
+    payload = json.dumps([
+        {"type": "function", "function": {"name": t.name, "description": t.description, "parameters": t.inputSchema}}
+        for t in tools
+    ], ensure_ascii=False)
+    if _encoding is not None:
+        return len(_encoding.encode(payload))
+    return len(payload.encode("utf-8")) // 4
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--queries", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_routing_queries.json"))
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    servers = [CatalogServer(name, tools) for name, tools in data["servers"].items()]
+    router = ToolRouter(top_k=args.top_k, min_tools=0, enabled=True)
+    all_tools = [tool for server in servers for tool in server.tools]
+    full_tokens = count_tokens(all_tools)
+
+    print(f"tools={len(all_tools)}, top_k={args.top_k}, tokenizer={'o200k_base' if _encoding else 'bytes/4 estimate'}")
+    print(f"{'routed':>6} {'tools':>5} {'tokens':>7} {'saved':>6} {'recall':>6}  query")
+    total_tokens = 0
+    recalls = []
+    for item in data["queries"]:
+        selection = await router.select(servers, item["query"])
+        if selection is None:
+            selected = all_tools
+        else:
+            selected = [t for i, s in enumerate(servers) for t in s.tools if t.name in selection.get(i, set())]
+        tokens = count_tokens(selected)
+        total_tokens += tokens
+        names = {t.name for t in selected}
+        expected = item.get("expected", [])
+        recall = sum(1 for name in expected if name in names) / len(expected) if expected else None
+        if recall is not None:
+            recalls.append(recall)
+        print(
+            f"{'yes' if selection is not None else 'no':>6} {len(selected):>5} {tokens:>7} "
+            f"{1 - tokens / full_tokens:>6.0%} {'-' if recall is None else f'{recall:.0%}':>6}  {item['query']}"
+        )
+
+    average = total_tokens / len(data["queries"])
+    print(f"\nfull tool set: {full_tokens} tokens per LLM call")
+    print(f"routed average: {average:.0f} tokens per LLM call ({1 - average / full_tokens:.0%} reduction)")
+    print(f"expected-tool recall: {sum(recalls) / len(recalls):.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""벤치마크/테스트용 OpenAI 호환 Chat Completions 스텁 서버.
+
+지정한 지연 후 고정 답변을 돌려주고, 일정 비율로 503 오류를 냅니다. stream=true 요청에는
+SSE 청크로 응답합니다. --escalate-rate를 주면 그 비율로 "[ESCALATE]"를 답해
+작은 모델이 확신이 없는 경우를 흉내 냅니다. --load-ms를 주면 Ollama처럼 keep_alive가 지나
+내려간 모델을 다시 불러오는 시간을 흉내 내고, /api/generate로 keep_alive를 갱신할 수 있습니다.
+
+사용법:
+    python benchmarks/llm_stub_server.py --port 8101 --ttft-ms 200 --error-rate 0.0 --stall-rate 0.0 --escalate-rate 0.0
+"""
+import time
+import json
+import random
+import asyncio
+import argparse
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI()
+settings = {"name": "stub", "ttft_ms": 200.0, "error_rate": 0.0, "stall_rate": 0.0, "escalate_rate": 0.0,
+            "load_ms": 0.0, "keep_alive_s": 300.0, "parallel": 0}
+state = {"loaded_until": 0.0, "lock": None, "slots": None}
+
+
+def _parse_keep_alive(value) -> float:
+    """Ollama keep_alive 값("30m", "10s", 숫자 초)을 초로 변환합니다."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    return float(value[:-1]) * units[value[-1]] if value and value[-1] in units else float(value)
+
+
+async def _ensure_loaded(keep_alive_s: float) -> None:
+    if state["lock"] is None:
+        state["lock"] = asyncio.Lock()
+    async with state["lock"]:
+        if time.monotonic() >= state["loaded_until"] and settings["load_ms"] > 0:
+            await asyncio.sleep(settings["load_ms"] / 1000.0)
+        state["loaded_until"] = time.monotonic() + keep_alive_s
+
+
+@app.post("/api/generate")
+async def generate(request: Request):
+    body = await request.json()
+    start = time.perf_counter()
+    await _ensure_loaded(_parse_keep_alive(body.get("keep_alive", settings["keep_alive_s"])))
+    return {"model": body.get("model"), "done": True, "load_duration": int((time.perf_counter() - start) * 1e9)}
+
+
+def _chunk(model: str, delta: dict, finish_reason=None) -> str:
+    payload = {
+        "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    # OpenAI 호환 요청은 keep_alive를 서버 기본값으로 되돌림 (Ollama와 같은 동작)
+    await _ensure_loaded(settings["keep_alive_s"])
+    if settings["parallel"] > 0:
+        # 서버 병렬 처리 수를 넘는 요청은 서버 안에서 기다림
+        if state["slots"] is None:
+            state["slots"] = asyncio.Semaphore(settings["parallel"])
+        async with state["slots"]:
+            return await _complete(body, model)
+    return await _complete(body, model)
+
+
+async def _complete(body: dict, model: str):
+    delay = settings["ttft_ms"] / 1000.0
+    if random.random() < settings["stall_rate"]:
+        delay *= 10
+    await asyncio.sleep(delay)
+    if random.random() < settings["error_rate"]:
+        return JSONResponse(status_code=503, content={"error": {"message": "stub overloaded", "type": "server_error"}})
+
+    text = f"answer from {settings['name']}"
+    if random.random() < settings["escalate_rate"]:
+        text = "[ESCALATE]"
+    # 사용량은 대략 4글자당 1토큰으로 계산
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4 + 1
+    completion_tokens = len(text) // 4 + 1
+    if body.get("stream"):
+        async def _events():
+            yield _chunk(model, {"role": "assistant", "content": ""})
+            for word in text.split(" "):
+                yield _chunk(model, {"content": word + " "})
+            yield _chunk(model, {}, "stop")
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    return {
+        "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--name", default="stub")
+    parser.add_argument("--ttft-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--escalate-rate", type=float, default=0.0)
+    parser.add_argument("--load-ms", type=float, default=0.0)
+    parser.add_argument("--keep-alive-s", type=float, default=300.0)
+    parser.add_argument("--parallel", type=int, default=0, help="0이면 제한 없음")
+    args = parser.parse_args()
+    settings.update(name=args.name, ttft_ms=args.ttft_ms, error_rate=args.error_rate,
+                    stall_rate=args.stall_rate, escalate_rate=args.escalate_rate,
+                    load_ms=args.load_ms, keep_alive_s=args.keep_alive_s, parallel=args.parallel)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
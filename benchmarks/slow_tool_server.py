@@ -0,0 +1,23 @@
+"""벤치마크용 MCP 서버. 일정 시간 동안 프로세스를 점유하는 도구 하나를 제공합니다."""
+import time
+import random
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("slow-tool-server")
+
+
+@mcp.tool()
+def slow_echo(text: str, delay_ms: int = 100, stall_rate: float = 0.0) -> str:
+    """delay_ms 동안 작업한 뒤 text를 그대로 돌려줍니다 (CPU/IO 작업 흉내).
+
+    stall_rate 확률로 10배 오래 걸려 꼬리 지연(tail latency)을 흉내 냅니다.
+    """
+    if random.random() < stall_rate:
+        delay_ms *= 10
+    # 동기 도구는 서버 프로세스를 막으므로 한 프로세스는 호출을 하나씩 처리
+    time.sleep(delay_ms / 1000.0)
+    return text
+
+
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
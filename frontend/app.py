@@ -1,13 +1,18 @@
 import os
 import sys
 import asyncio
+import hashlib
 import json
 import logging
-import threading
 import subprocess
 import time
+from contextlib import asynccontextmanager, contextmanager
 from typing import List, Dict, Any, Optional, Tuple
-from flask import Flask, render_template, request, jsonify
+import uvicorn
+from fastapi import FastAPI, Request, Body
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
@@ -107,8 +112,21 @@ os.chdir(project_root)
 print(f"🔄 Changed working directory to: {os.getcwd()}")
 
 from src.agent_setup import setup_agent_and_servers
+from src.llm_clients import get_llm_client_registry
+from src.llm_factory import model_stats
+from src.ollama import stop_ollama_servers, warm_ollama_servers
 from src.utils import load_config
-from src.config import load_mcp_config, load_llm_config
+from src.config import (load_mcp_config, load_llm_config, REQUEST_DEADLINE_SECONDS, CHAT_JOB_MAX_WAIT_SECONDS,
+                        CONFIG_RELOAD_ENABLED, MCP_SETUP_TIMEOUT)
+from src.deadline import deadline_scope
+from src.run_metrics import run_scope, get_run_recorder
+from src.admission import AdmissionController, AdmissionRejected, BUSY_MESSAGE
+from src.chat_jobs import ChatJobStore
+from src.mcp_supervisor import MCPSupervisor
+from src.config_reloader import ConfigReloader
+from src.server_health import ServerHealthMonitor
+from src.tool_result_cache import get_tool_result_cache
+from src.tool_router import ToolRouter
 from agents.run import Runner
 
 # Configuration - Use the same loading method as main.py
@@ -116,27 +134,32 @@ config = load_mcp_config()
 config_path = os.path.join(os.path.dirname(__file__), '..', 'mcp_config.json')
 llm_config_path = os.path.join(os.path.dirname(__file__), '..', 'llm_config.json')
 
-# Flask app
-app = Flask(__name__)
-
 # Global variables
 main_agent = None
 mcp_servers = []
 agent_ready = False
-#  dedicated asyncio event loop running in a background thread
-background_loop = None
-background_thread = None
 # Server status tracking
 all_server_status = []  # 모든 서버들의 연결 상태 정보 저장
 last_server_status_check = 0  # 마지막 서버 상태 확인 시간 (timestamp)
 # Cache for MCP tools to avoid loading delay
 cached_mcp_tools = {}
-
-
-def start_background_loop(loop):
-    """Starts the asyncio event loop in a background thread."""
-    asyncio.set_event_loop(loop)
-    loop.run_forever()
+# Admission control for agent runs (used only on the server's event loop)
+admission = AdmissionController()
+# Per-message tool subset selection (falls back to all tools)
+tool_router = ToolRouter()
+# Health checks / automatic reconnects for the agent's MCP servers
+supervisor = None
+# Cached server status / tool lists from pings over the agent's live connections
+health_monitor = None
+# Background chat jobs (submit -> job ID -> poll), kept for CHAT_JOB_TTL_SECONDS after completion
+chat_jobs = ChatJobStore()
+# Blue/green reinit: the generation serving requests, the running init (single-flight) and
+# previous generations draining in-flight runs before their servers are closed
+current_generation = None
+init_task = None
+retiring_tasks = set()
+# Applies mcp_config.json / llm_config.json edits to the current generation (only changed servers reconnect)
+config_reloader = None
 
 
 # 이 함수들은 src.mcp_utils 모듈의 함수들로 대체되었습니다:
@@ -183,186 +206,508 @@ async def convert_server_results_to_app_format(server_results) -> List[Dict[str,
     
     return app_format_results
 
-async def initialize_agent():
-    """Initialize the MCP agent and servers."""
-    global main_agent, mcp_servers, agent_ready, all_server_status, last_server_status_check, cached_mcp_tools
-    
-    # Gracefully shut down existing servers before re-initializing
-    if mcp_servers:
-        print(f"🔄 Shutting down {len(mcp_servers)} existing MCP server(s)...")
+class AgentGeneration:
+    """One agent with its MCP servers, health checks and in-flight run count (blue/green reinit unit)."""
+
+    def __init__(self, agent, servers, supervisor=None, health_monitor=None):
+        self.agent = agent
+        self.servers = servers
+        self.supervisor = supervisor
+        self.health_monitor = health_monitor
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @contextmanager
+    def use(self):
+        """Count a run against this generation so it is not torn down underneath it."""
+        self.in_flight += 1
+        self._idle.clear()
         try:
-            # Concurrently shut down all servers that have a 'close' method
-            await asyncio.gather(
-                *(server.close() for server in mcp_servers if hasattr(server, 'close'))
-            )
-            print("✅ Existing servers shut down successfully.")
-        except Exception as e:
-            print(f"⚠️ Warning: Error while shutting down existing servers: {e}")
-            # Continue with initialization anyway
+            yield self.agent
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+    async def retire(self, drain_timeout: float = REQUEST_DEADLINE_SECONDS + 10):
+        """Wait for in-flight runs to finish (bounded by the request deadline), then close the servers."""
+        if self.in_flight:
+            print(f"⏳ Draining {self.in_flight} in-flight run(s) on the previous agent...")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                print(f"⚠️ Warning: {self.in_flight} run(s) still in flight after {drain_timeout:.0f}s; closing anyway.")
+        # Stop health checks before closing so the old servers are not reconnected during shutdown
+        if self.supervisor:
+            await self.supervisor.stop()
+        if self.health_monitor:
+            await self.health_monitor.stop()
+        if self.servers:
+            print(f"🔄 Shutting down {len(self.servers)} previous MCP server(s)...")
+            results = await asyncio.gather(*(server.cleanup() for server in self.servers), return_exceptions=True)
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if errors:
+                print(f"⚠️ Warning: Error while shutting down previous servers: {errors[0]}")
+            else:
+                print("✅ Previous servers shut down successfully.")
+
+
+def swap_generation(generation: AgentGeneration, server_status, tools):
+    """Atomically make a newly built generation current (no await, so requests see old or new, never a mix)."""
+    global current_generation, main_agent, mcp_servers, agent_ready, supervisor, health_monitor
+    global all_server_status, last_server_status_check, cached_mcp_tools
+    previous = current_generation
+    current_generation = generation
+    main_agent = generation.agent
+    mcp_servers = generation.servers
+    supervisor = generation.supervisor
+    health_monitor = generation.health_monitor
+    all_server_status = server_status
+    last_server_status_check = time.time()
+    cached_mcp_tools = tools
+    agent_ready = True
+    if config_reloader:
+        # 이후 설정 변경은 새 세대에 반영 (현재 파일 내용이 기준)
+        config_reloader.attach(generation.agent, generation.supervisor)
+    return previous
+
+
+def apply_config_reload(summary):
+    """Mirror a config reload into the health monitor so status/tools endpoints show the new server set."""
+    if not health_monitor:
+        return
+    servers = {server.name: server for server in mcp_servers}
+    for name in summary['removed']:
+        health_monitor.remove(name)
+    for name in summary['added'] + summary['changed']:
+        health_monitor.add(servers[name])
+    failed = {name: error for name, error in summary['failed'].items() if name != 'llm'}
+    if failed:
+        configs = {c.get('name'): c for c in load_mcp_config().get('mcpServers', [])}
+        for name, error in failed.items():
+            health_monitor.mark_failed(name, error, configs.get(name, {}))
+    print(f"🔁 Config reloaded: +{summary['added']} ~{summary['changed']} -{summary['removed']}"
+          f"{' (LLM model replaced)' if summary['llm'] else ''}")
+
+
+async def build_agent_generation():
+    """Build a new agent and server set without touching the one currently serving requests."""
+    # Apply logging filters again before agent initialization
+    mcp_filter = MCPErrorFilter()
+    all_possible_loggers = [
+        "", "agents", "openai", "openai.agents", "openai.agents.run", 
+        "openai.agents.runner", "agents.run", "agents.runner", "Runner",
+        "run", "runner", "mcp", "mcp.client", "mcp.server", "streamable",
+        "sse", "openai.agents.streamable", "agents.streamable", "httpx",
+        "httpcore", "anyio", "asyncio"
+    ]
+    
+    for logger_name in all_possible_loggers:
+        logger = logging.getLogger(logger_name)
+        logger.addFilter(mcp_filter)
+        logger.setLevel(logging.ERROR)
+
+    # Debug: Print current working directory and paths
+    from src.config import PROJECT_ROOT
+    print(f"🔍 Current working directory: {os.getcwd()}")
+    print(f"🔍 PROJECT_ROOT: {PROJECT_ROOT}")
+    print(f"🔍 PROJECT_ROOT exists: {os.path.exists(PROJECT_ROOT)}")
+    print(f"🔍 src directory exists: {os.path.exists(os.path.join(PROJECT_ROOT, 'src'))}")
+    
+    # 🔍 먼저 MCP 서버들의 연결 상태와 도구 목록을 동시에 가져오기
+    # (연결된 서버 핸들은 닫지 않고 에이전트가 그대로 넘겨받음)
+    print("🔍 MCP 서버 연결 상태 및 도구 목록 확인 중...")
+    server_results, available_tools = await check_and_get_servers(keep_connections=True)
     
-    # Reset previous state
-    main_agent = None
-    mcp_servers = []
-    agent_ready = False
+    # 서버 상태 변환
+    server_status = await convert_server_results_to_app_format(server_results)
+    
+    # 연결 성공한 서버들만 필터링
+    available_servers = [r for r in server_results if r.get('connected')]
     
     try:
-        print("🔄 Initializing MCP agent...")
-        
-        # Apply logging filters again before agent initialization
-        mcp_filter = MCPErrorFilter()
-        all_possible_loggers = [
-            "", "agents", "openai", "openai.agents", "openai.agents.run", 
-            "openai.agents.runner", "agents.run", "agents.runner", "Runner",
-            "run", "runner", "mcp", "mcp.client", "mcp.server", "streamable",
-            "sse", "openai.agents.streamable", "agents.streamable", "httpx",
-            "httpcore", "anyio", "asyncio"
-        ]
-        
-        for logger_name in all_possible_loggers:
-            logger = logging.getLogger(logger_name)
-            logger.addFilter(mcp_filter)
-            logger.setLevel(logging.ERROR)
-
-        # Debug: Print current working directory and paths
-        import os
-        from src.config import PROJECT_ROOT
-        print(f"🔍 Current working directory: {os.getcwd()}")
-        print(f"🔍 PROJECT_ROOT: {PROJECT_ROOT}")
-        print(f"🔍 PROJECT_ROOT exists: {os.path.exists(PROJECT_ROOT)}")
-        print(f"🔍 src directory exists: {os.path.exists(os.path.join(PROJECT_ROOT, 'src'))}")
-        
-        # 🔍 먼저 MCP 서버들의 연결 상태와 도구 목록을 동시에 가져오기
-        print("🔍 MCP 서버 연결 상태 및 도구 목록 확인 중...")
-        server_results, available_tools = await check_and_get_servers()
-        
-        # 서버 상태 변환 및 저장
-        all_server_status = await convert_server_results_to_app_format(server_results)
-        last_server_status_check = time.time()  # 상태 확인 시간 기록
-        
-        # 연결 성공한 서버들만 필터링
-        available_servers = [r for r in server_results if r.get('connected')]
-        
         if not available_servers:
             print("⚠️ 연결 가능한 MCP 서버가 없습니다. 서버 없이 에이전트를 초기화합니다.")
             # 빈 서버 설정으로 에이전트 초기화
-            main_agent, mcp_servers, server_names = await setup_agent_and_servers([])
+            agent, servers, server_names = await setup_agent_and_servers([])
         else:
             print(f"✅ {len(available_servers)}개의 MCP 서버 연결 확인됨. 에이전트를 초기화합니다.")
-            # 연결 가능한 서버들만으로 에이전트 초기화
-            main_agent, mcp_servers, server_names = await setup_agent_and_servers(available_servers)
-        
-        if main_agent and mcp_servers:
-            agent_ready = True
-            print(f"✅ MCP agent initialized successfully with {len(mcp_servers)} servers!")
-            print(f"   Servers: {[getattr(s, 'name', f'Server-{i+1}') for i, s in enumerate(mcp_servers)]}")
-            
-            # 이미 가져온 도구 목록을 바로 캐시에 저장
-            cached_mcp_tools = {}
-            for server_name, tools in available_tools.items():
-                tool_list = [
-                    {"name": tool.get("name", "Unknown"), 
-                     "description": tool.get("description", "No description available")}
-                    for tool in tools
-                ]
-                cached_mcp_tools[server_name] = tool_list
-            
-            print(f"📦 Cached MCP tools updated with {len(cached_mcp_tools)} servers")
-            
-            return True
-        elif main_agent:
-            agent_ready = True
-            print("✅ MCP agent initialized successfully (no servers configured)!")
-            return True
+            # 연결 가능한 서버들만으로 에이전트 초기화 (확인 시 연결한 서버를 재사용)
+            agent, servers, server_names = await setup_agent_and_servers(available_servers)
+    except BaseException:
+        # 새로 연결한 서버만 정리하고, 현재 서비스 중인 서버는 그대로 둠
+        await asyncio.gather(*(r['server'].cleanup() for r in available_servers if r.get('server')),
+                             return_exceptions=True)
+        raise
 
-            
+    # 이미 가져온 도구 목록을 바로 캐시에 저장
+    tools = {}
+    for server_name, tool_items in available_tools.items():
+        tools[server_name] = [
+            {"name": tool.get("name", "Unknown"), 
+             "description": tool.get("description", "No description available")}
+            for tool in tool_items
+        ]
+
+    # 이후 상태 확인은 새 연결 없이 에이전트의 연결에 ping만 보냄
+    # (연결에 실패한 서버의 상태는 다음 초기화 전까지 그대로 보여줌)
+    monitor = ServerHealthMonitor(servers, server_status, tools)
+    if servers:
+        # 캐시된 도구 스키마로 시작한 서버는 백그라운드에서 연결 중이므로 연결이 끝나기를 기다린 뒤
+        # 교체 전에 새 연결이 응답하는지 확인 (연결 태스크 자체도 MCP_SETUP_TIMEOUT으로 제한됨)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(member.wait_connected() for server in servers for member in server.members()),
+                               return_exceptions=True),
+                timeout=MCP_SETUP_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            pass
+        await monitor.refresh()
+    # 서버가 없어도 감시기를 만들어 두어 설정 변경으로 추가되는 서버도 감시
+    generation = AgentGeneration(agent, servers, MCPSupervisor(servers), monitor)
+    return generation, server_status, tools
+
+
+def generation_is_healthy(generation: AgentGeneration, previous: AgentGeneration) -> bool:
+    """Health gate for a swap: reject a new set that has failures and fewer healthy servers than the serving one."""
+    new_healthy, new_failed = generation.health_monitor.health_counts()
+    old_healthy, _ = previous.health_monitor.health_counts()
+    if new_failed and new_healthy < old_healthy:
+        print(f"❌ New agent has {new_healthy} healthy MCP server(s) ({new_failed} failed), "
+              f"the serving agent has {old_healthy}.")
+        return False
+    return True
+
+
+async def initialize_agent():
+    """Build a new agent set next to the serving one, swap it in, then drain and close the old set."""
+    try:
+        print("🔄 Initializing MCP agent...")
+        generation, server_status, tools = await build_agent_generation()
     except Exception as e:
         print(f"❌ Complete initialization failure: {e}")
         import traceback
         traceback.print_exc()
-        agent_ready = False
+        if current_generation:
+            print("↩️ Keeping the previous agent in service.")
+        return False
+
+    if current_generation and not generation_is_healthy(generation, current_generation):
+        print("↩️ Keeping the previous agent in service; closing the new server set.")
+        await generation.retire(drain_timeout=0)
         return False
 
+    previous = swap_generation(generation, server_status, tools)
+    if generation.supervisor:
+        generation.supervisor.start()
+    generation.health_monitor.start()
+    print(f"📦 Cached MCP tools updated with {len(tools)} servers")
+    if mcp_servers:
+        print(f"✅ MCP agent initialized successfully with {len(mcp_servers)} servers!")
+        print(f"   Servers: {[getattr(s, 'name', f'Server-{i+1}') for i, s in enumerate(mcp_servers)]}")
+    else:
+        print("✅ MCP agent initialized successfully (no servers configured)!")
+
+    if previous:
+        # 이전 세대는 진행 중인 실행이 끝난 뒤 정리 (응답은 기다리지 않음)
+        task = asyncio.create_task(previous.retire())
+        retiring_tasks.add(task)
+        task.add_done_callback(retiring_tasks.discard)
+    return True
+
+
+def reinitialize_agent() -> asyncio.Task:
+    """Start a reinit, or join the one already running (single-flight for concurrent /api/init calls)."""
+    global init_task
+    if init_task is None or init_task.done():
+        init_task = asyncio.create_task(initialize_agent())
+    else:
+        print("🔄 Agent initialization already in progress; waiting for it.")
+    return init_task
+
+def start_config_reloader():
+    """Watch the config files and apply edits to whichever generation is current."""
+    global config_reloader
+    config_reloader = ConfigReloader(main_agent, supervisor, on_reload=apply_config_reload)
+    config_reloader.start()
+
 # run_agent 함수는 더 이상 사용하지 않음 - create_fresh_agent로 대체됨
 
-@app.route('/')
-def index():
+async def shutdown_agent():
+    """Stop chat jobs, config watching, the serving and retiring agent sets and shared LLM connections on server shutdown."""
+    await chat_jobs.cancel_all()
+    if config_reloader:
+        await config_reloader.stop()
+    if init_task and not init_task.done():
+        init_task.cancel()
+    if current_generation:
+        await current_generation.retire(drain_timeout=0)
+    await asyncio.gather(*retiring_tasks, return_exceptions=True)
+    stop_ollama_servers()
+    await get_run_recorder().flush()
+    await get_llm_client_registry().aclose()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Initialize the agent on uvicorn's event loop so requests and the agent share one loop."""
+    # Set custom exception handler to suppress benign MCP shutdown errors
+    asyncio.get_running_loop().set_exception_handler(_suppress_async_shutdown_error_handler)
+
+    # uvicorn이 로거를 구성한 뒤에 억제 설정을 다시 적용
+    setup_comprehensive_logging_suppression()
+
+    try:
+        # shield: 시간 초과 시에도 초기화는 계속 진행되고, 서버는 먼저 요청을 받기 시작
+        await asyncio.wait_for(asyncio.shield(reinitialize_agent()), timeout=60)
+    except Exception as e:
+        print(f"❌ Agent initialization failed: {e}")
+
+    # Load Ollama models before accepting requests so the first chat does not pay the model load
+    await warm_ollama_servers()
+
+    if CONFIG_RELOAD_ENABLED:
+        start_config_reloader()
+
+    yield
+
+    print("\n👋 Shutting down gracefully...")
+    await shutdown_agent()
+
+
+# FastAPI app (served by uvicorn; agent runs execute directly on the server's event loop)
+app = FastAPI(lifespan=lifespan)
+app.mount('/static', StaticFiles(directory=os.path.join(os.path.dirname(__file__), 'static')), name='static')
+templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), 'templates'))
+
+
+@app.get('/')
+async def index(request: Request):
     """Serve the main chat interface."""
-    return render_template('index.html')
+    return templates.TemplateResponse(request, 'index.html')
+
+async def read_chat_message(request: Request) -> Tuple[Optional[str], Optional[JSONResponse]]:
+    """Parse the chat request body; returns (message, None) or (None, error response)."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return None, JSONResponse({'response': "❌ Invalid request format. Please send JSON data."}, status_code=400)
+
+    user_message = data.get('message', '')
+    if not isinstance(user_message, str):
+        return None, JSONResponse({'response': "❌ 'message' must be a string."}, status_code=400)
+    user_message = user_message.strip()
+    
+    if not user_message:
+        return None, JSONResponse({'response': "❌ Please enter a message."}, status_code=400)
+    
+    if not agent_ready or not main_agent:
+        return None, JSONResponse({
+            'response': "⚠️ Agent is not ready. Please wait or reinitialize."
+        }, status_code=503)
+
+    return user_message, None
+
+async def run_chat_agent(generation: AgentGeneration, message: str, client_id: Optional[str], **fields) -> str:
+    """Run the generation's agent once under admission control and the request deadline; returns the final text."""
+    # 대기열 대기 시간까지 포함한 요청 전체의 시간 예산
+    # (워커 스레드 없이 이 이벤트 루프에서 바로 실행하므로 동시 처리 수는 admission이 결정)
+    # 재초기화로 교체되어도 이 실행이 끝날 때까지 해당 세대의 서버는 닫히지 않음
+    with generation.use() as agent, \
+            run_scope("web", client=client_id, **fields) as run, deadline_scope(REQUEST_DEADLINE_SECONDS):
+        admit_start = time.perf_counter()
+        async with admission.admit(client_id):
+            run.add_phase('admission_wait', time.perf_counter() - admit_start)
+            # 에이전트 실행 직전에 한번 더 로깅 억제
+            setup_comprehensive_logging_suppression()
+            with run.phase('agent'):
+                # 메시지와 관련 있는 도구만 노출
+                routed_agent = await tool_router.route(agent, message)
+                result = await Runner.run(routed_agent, input=message)
+    return str(result.final_output)
 
-@app.route('/chat', methods=['POST'])
-def chat():
+@app.post('/chat')
+async def chat(request: Request):
     """Handle chat messages from the frontend."""
     try:
-        if not request.json:
-            return jsonify({'response': "❌ Invalid request format. Please send JSON data."}), 400
-            
-        data = request.json
-        user_message = data.get('message', '').strip()
-        
-        if not user_message:
-            return jsonify({'response': "❌ Please enter a message."}), 400
-        
-        if not agent_ready or not main_agent or not background_loop:
-            return jsonify({
-                'response': "⚠️ Agent is not ready. Please wait or reinitialize."
-            }), 503
+        user_message, error_response = await read_chat_message(request)
+        if error_response:
+            return error_response
         
         print(f"📨 Received chat message: {user_message[:100]}...")
 
         # 런타임에 새로 생성된 로거들에도 필터 적용
         setup_comprehensive_logging_suppression()
 
-        async def run_agent_async(agent, message):
-            """Coroutine to run the agent."""
-            # 에이전트 실행 직전에 한번 더 로깅 억제
-            setup_comprehensive_logging_suppression()
-            return await Runner.run(agent, input=message)
+        client_id = request.client.host if request.client else None
 
         try:
-            # Submit the agent run to the background event loop and wait for the result
-            future = asyncio.run_coroutine_threadsafe(
-                run_agent_async(main_agent, user_message), 
-                background_loop
-            )
-            
-            # Set a timeout for the agent's response
-            result = future.result(timeout=180) # 3-minute timeout
-            response_text = str(result.final_output)
+            response_text = await run_chat_agent(current_generation, user_message, client_id)
 
             print(f"✅ Agent run successful! response: {response_text[:100]}...")
-            return jsonify({'response': response_text})
+            return {'response': response_text}
+
+        except AdmissionRejected as rejected:
+            print(f"⏳ Chat request rejected: {rejected.reason}")
+            return JSONResponse({'response': BUSY_MESSAGE}, status_code=429)
             
         except Exception as run_error:
             print(f"❌ Agent run error: {run_error}")
             import traceback
             traceback.print_exc()
-            return jsonify({
+            return JSONResponse({
                 'response': f"🔧 Agent execution failed: {str(run_error)}"
-            }), 500
+            }, status_code=500)
         
     except Exception as e:
         print(f"❌ Chat endpoint error: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return JSONResponse({
             'response': f"❌ Server error: {str(e)}"
-        }), 500
+        }, status_code=500)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _elapsed_ms(start_time: float) -> float:
+    return round((time.perf_counter() - start_time) * 1000.0, 1)
+
+async def stream_agent_events(generation: AgentGeneration, message: str, client_id: Optional[str]):
+    """Run the agent with Runner.run_streamed and yield SSE events as they happen.
+
+    Events: start, token (text delta), tool_start, tool_end, done (final text and timing) and error.
+    """
+    start_time = time.perf_counter()
+    ttft_ms = None
+    tool_starts: Dict[str, float] = {}
+    try:
+        # 대기열 대기 시간까지 포함한 요청 전체의 시간 예산 (/chat과 동일)
+        with generation.use() as agent, \
+                run_scope("web", client=client_id, streamed=True) as run, deadline_scope(REQUEST_DEADLINE_SECONDS):
+            admit_start = time.perf_counter()
+            async with admission.admit(client_id):
+                run.add_phase('admission_wait', time.perf_counter() - admit_start)
+                yield sse_event('start', {'run_id': run.run_id, 'admission_wait_ms': run.phases['admission_wait']})
+                setup_comprehensive_logging_suppression()
+                with run.phase('agent'):
+                    routed_agent = await tool_router.route(agent, message)
+                    result = Runner.run_streamed(routed_agent, input=message)
+                    try:
+                        async for event in result.stream_events():
+                            if event.type == 'raw_response_event':
+                                if getattr(event.data, 'type', None) != 'response.output_text.delta':
+                                    continue
+                                if ttft_ms is None:
+                                    ttft_ms = _elapsed_ms(start_time)
+                                yield sse_event('token', {'delta': event.data.delta})
+                            elif event.type == 'run_item_stream_event' and event.name == 'tool_called':
+                                raw = event.item.raw_item
+                                call_id = getattr(raw, 'call_id', None) or getattr(raw, 'id', '')
+                                tool_starts[call_id] = time.perf_counter()
+                                yield sse_event('tool_start', {'call_id': call_id,
+                                                               'tool': getattr(raw, 'name', 'tool')})
+                            elif event.type == 'run_item_stream_event' and event.name == 'tool_output':
+                                raw = event.item.raw_item
+                                call_id = raw.get('call_id', '') if isinstance(raw, dict) else getattr(raw, 'call_id', '')
+                                started = tool_starts.pop(call_id, None)
+                                yield sse_event('tool_end', {
+                                    'call_id': call_id,
+                                    'ms': _elapsed_ms(started) if started is not None else None,
+                                })
+                    finally:
+                        # 클라이언트 연결이 끊기면 남은 LLM/도구 호출을 멈춤
+                        if not result.is_complete:
+                            result.cancel()
+                response_text = str(result.final_output)
+                print(f"✅ Agent stream successful! response: {response_text[:100]}...")
+                yield sse_event('done', {
+                    'response': response_text,
+                    'timing': {'ttft_ms': ttft_ms, 'total_ms': _elapsed_ms(start_time),
+                               **run.phases, **run.summary()},
+                })
+
+    except AdmissionRejected as rejected:
+        print(f"⏳ Chat stream rejected: {rejected.reason}")
+        yield sse_event('error', {'response': BUSY_MESSAGE, 'status': 429})
+
+    except Exception as run_error:
+        print(f"❌ Agent stream error: {run_error}")
+        import traceback
+        traceback.print_exc()
+        yield sse_event('error', {'response': f"🔧 Agent execution failed: {str(run_error)}", 'status': 500})
+
+@app.post('/chat/stream')
+async def chat_stream(request: Request):
+    """Stream tokens, tool calls and timing for a chat message as server-sent events."""
+    user_message, error_response = await read_chat_message(request)
+    if error_response:
+        return error_response
+
+    print(f"📨 Received chat message (stream): {user_message[:100]}...")
+    client_id = request.client.host if request.client else None
+    return StreamingResponse(
+        stream_agent_events(current_generation, user_message, client_id),
+        media_type='text/event-stream',
+        # 프록시가 이벤트를 모아서 보내지 않도록 버퍼링 비활성화
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.post('/api/jobs')
+async def submit_chat_job(request: Request):
+    """Submit a chat message as a background job and return its job ID immediately.
+
+    Resubmitting with the same Idempotency-Key header returns the existing job instead of running it again.
+    """
+    user_message, error_response = await read_chat_message(request)
+    if error_response:
+        return error_response
+
+    client_id = request.client.host if request.client else None
+    idempotency_key = request.headers.get('Idempotency-Key')
+    job, created = chat_jobs.submit(
+        client_id,
+        # 에이전트는 요청 시점의 세대로 실행 (도중에 재초기화되어도 같은 에이전트로 끝냄)
+        lambda generation=current_generation: run_chat_agent(generation, user_message, client_id, job=True),
+        idempotency_key,
+    )
+    if created:
+        print(f"📨 Received chat job {job.job_id}: {user_message[:100]}...")
+    return JSONResponse(job.to_dict(), status_code=202 if created else 200,
+                        headers={'Location': f"/api/jobs/{job.job_id}"})
 
+@app.get('/api/jobs/{job_id}')
+async def get_chat_job(job_id: str, wait: float = 0):
+    """Get a chat job's status and result; wait=N long-polls up to N seconds for completion."""
+    job = chat_jobs.get(job_id)
+    if job is None:
+        return JSONResponse({'error': 'Job not found or expired.'}, status_code=404)
+    await job.wait(min(max(wait, 0.0), CHAT_JOB_MAX_WAIT_SECONDS))
+    data = job.to_dict()
+    if job.status == 'rejected':
+        data['response'] = BUSY_MESSAGE
+    return data
 
-@app.route('/api/config', methods=['GET'])
+# 파일 입출력만 하는 설정 엔드포인트는 동기 함수로 두어 스레드 풀에서 실행 (이벤트 루프를 막지 않음)
+@app.get('/api/config')
 def get_config():
     """Get MCP configuration."""
     try:
-        return jsonify(config)
+        return config
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/api/config', methods=['POST'])
-def save_config():
+@app.post('/api/config')
+def save_config(new_config: Dict[str, Any] = Body(...)):
     """Save MCP configuration."""
     try:
-        new_config = request.json
-        
         # Save to file
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(new_config, f, indent=4, ensure_ascii=False)
@@ -371,46 +716,37 @@ def save_config():
         global config
         config = load_mcp_config()
         
-        # Reset agent ready status since config changed
-        global agent_ready
-        agent_ready = False
-        
-        # Clear the tools cache since server config changed
-        global cached_mcp_tools
-        cached_mcp_tools = {}
+        # The config watcher (or /api/reload) reconnects only the servers whose entries changed;
+        # unchanged servers keep their connections and caches
         
-        return jsonify({'success': True, 'message': 'Configuration saved successfully'})
+        return {'success': True, 'message': 'Configuration saved successfully'}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/api/llm_config', methods=['GET'])
+@app.get('/api/llm_config')
 def get_llm_config():
     """Get LLM configuration."""
     try:
         llm_config = load_llm_config()
-        return jsonify(llm_config)
+        return llm_config
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/api/llm_config', methods=['POST'])
-def save_llm_config():
+@app.post('/api/llm_config')
+def save_llm_config(new_config: Dict[str, Any] = Body(...)):
     """Save LLM configuration."""
     try:
-        new_config = request.json
-        
         # Save to file
         with open(llm_config_path, 'w', encoding='utf-8') as f:
             json.dump(new_config, f, indent=4, ensure_ascii=False)
         
-        # Reset agent ready status since config changed
-        global agent_ready
-        agent_ready = False
+        # The config watcher (or /api/reload) swaps the agent's model in place
         
-        return jsonify({'success': True, 'message': 'LLM configuration saved successfully'})
+        return {'success': True, 'message': 'LLM configuration saved successfully'}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/api/env', methods=['GET'])
+@app.get('/api/env')
 def get_env():
     """Get .env file contents."""
     try:
@@ -419,17 +755,16 @@ def get_env():
         if os.path.exists(env_file_path):
             with open(env_file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-            return jsonify({'content': content, 'exists': True})
+            return {'content': content, 'exists': True}
         else:
-            return jsonify({'content': '', 'exists': False})
+            return {'content': '', 'exists': False}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/api/env', methods=['POST'])
-def save_env():
+@app.post('/api/env')
+def save_env(data: Dict[str, Any] = Body(...)):
     """Save .env file."""
     try:
-        data = request.json
         content = data.get('content', '')
         
         env_file_path = os.path.join(project_root, '.env')
@@ -441,9 +776,9 @@ def save_env():
         # Reload environment variables
         load_dotenv(env_file_path, override=True)
         
-        return jsonify({'success': True, 'message': '.env file saved successfully'})
+        return {'success': True, 'message': '.env file saved successfully'}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
 
 
@@ -451,7 +786,7 @@ def save_env():
 def _suppress_async_shutdown_error_handler(loop, context):
     """
     Custom exception handler to suppress known, benign errors that occur
-    during the shutdown of the asyncio event loop in a threaded environment.
+    during the shutdown of MCP connections on the server's asyncio event loop.
     """
     exception = context.get("exception")
     message = context.get("message", "")
@@ -527,124 +862,69 @@ def _suppress_async_shutdown_error_handler(loop, context):
         # For all other errors, use the default handler to log them
         loop.default_exception_handler(context)
 
-async def update_mcp_tools_cache():
-    """Update the cached MCP tools from all servers."""
-    global cached_mcp_tools
-    
-    if not agent_ready or not mcp_servers:
-        return
+def etag_json_response(request: Request, data: Any, etag_source: Any = None):
+    """Return data as JSON with an ETag, or 304 Not Modified if the client already has this version.
 
-    tools_by_server = {}
-    server_names = [s.get('name') for s in config.get('mcpServers', [])]
-    
-    for i, server in enumerate(mcp_servers):
-        server_name = server_names[i] if i < len(server_names) else f"Server-{i+1}"
-        try:
-            tools = await server.list_tools()
-
-            if tools:
-                tool_list = [
-                    {"name": tool.name, "description": getattr(tool, 'description', 'No description available')}
-                    for tool in tools
-                ]
-                tools_by_server[server_name] = tool_list
-            else:
-                tools_by_server[server_name] = [{"name": "No tools", "description": "No tools available"}]
-        
-        except Exception as e:
-            print(f"❌ Error getting tools from {server_name}: {e}")
-            tools_by_server[server_name] = [{"name": "Error", "description": str(e)}]
-    
-    cached_mcp_tools = tools_by_server
-    print(f"📦 Cached MCP tools updated with {len(cached_mcp_tools)} servers")
-
-@app.route('/api/tools', methods=['GET'])
-def get_tools():
-    """Get list of available MCP tools from the cached variable."""
-    if not agent_ready or not mcp_servers or not background_loop:
-        return jsonify({'error': 'Agent or event loop not ready.'}), 503
+    etag_source: what the ETag is computed from (defaults to data); lets callers leave out
+    fields that change on every call, such as uptimes.
+    """
+    payload = json.dumps(data if etag_source is None else etag_source, sort_keys=True, default=str)
+    etag = f'W/"{hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]}"'
+    # no-cache: the browser revalidates with If-None-Match on every fetch
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(data, headers=headers)
+
+@app.get('/api/tools')
+async def get_tools(request: Request, refresh: Optional[str] = None):
+    """Get list of available MCP tools from the health monitor's cache."""
+    if not agent_ready or not mcp_servers or not health_monitor:
+        return JSONResponse({'error': 'Agent or event loop not ready.'}, status_code=503)
     
-    # If cache is empty or forced refresh requested, update it
-    if not cached_mcp_tools or request.args.get('refresh') == 'true':
+    # Forced refresh re-lists tools over the agent's open sessions (no new connections)
+    if refresh == 'true':
         try:
-            future = asyncio.run_coroutine_threadsafe(update_mcp_tools_cache(), background_loop)
-            future.result(timeout=30)  # 30-second timeout
+            await asyncio.wait_for(health_monitor.refresh(list_tools=True), timeout=30)  # 30-second timeout
         except Exception as e:
             print(f"❌ Error updating MCP tools cache: {e}")
             # Still return the existing cache even if update fails
     
-    return jsonify(cached_mcp_tools)
+    return etag_json_response(request, health_monitor.tools)
+
+
+# Fields of a server entry that describe its health; only these feed the server-status ETag
+SERVER_HEALTH_FIELDS = ('name', 'type', 'status', 'error', 'tools_count', 'healthy')
 
 
-@app.route('/api/server-status', methods=['GET'])
-def get_server_status():
+@app.get('/api/server-status')
+async def get_server_status(request: Request, refresh: Optional[str] = None):
     """Get status of all MCP servers (active and inactive)."""
-    global all_server_status, last_server_status_check, background_loop, cached_mcp_tools
-    
-    # 새로 고침 요청이 있거나 서버 상태가 없는 경우에만 상태 업데이트
-    current_time = time.time()
-    force_refresh = request.args.get('refresh') == 'true'
-    
-    if force_refresh or not all_server_status:
-        if background_loop and background_loop.is_running():
-            try:
-                # 비동기적으로 서버 상태 업데이트 요청
-                print("🔄 서버 상태 새로 고침 중...")
-                
-                try:
-                    # 서버 연결 상태와 도구 목록 동시 확인
-                    future = asyncio.run_coroutine_threadsafe(
-                        check_and_get_servers(), 
-                        background_loop
-                    )
-                    # 최대 20초 대기
-                    server_results, available_tools = future.result(timeout=20)
-                    
-                    # 결과 변환 및 캐시 업데이트
-                    format_future = asyncio.run_coroutine_threadsafe(
-                        convert_server_results_to_app_format(server_results),
-                        background_loop
-                    )
-                    all_server_status = format_future.result(timeout=5)
-                    last_server_status_check = current_time
-                    
-                    # 이미 가져온 도구 목록을 바로 캐시에 저장
-                    cached_mcp_tools = {}
-                    for server_name, tools in available_tools.items():
-                        tool_list = [
-                            {"name": tool.get("name", "Unknown"), 
-                             "description": tool.get("description", "No description available")}
-                            for tool in tools
-                        ]
-                        cached_mcp_tools[server_name] = tool_list
-                    
-                    print(f"✅ 서버 상태 및 도구 업데이트 완료: {len(all_server_status)}개 서버, {len(cached_mcp_tools)}개 도구 집합")
-                    
-                except Exception as inner_e:
-                    print(f"❌ 서버 상태 및 도구 업데이트 오류: {inner_e}")
-                    # 오류 발생 시 더 이상 추가 시도하지 않음
-                    import traceback
-                    traceback.print_exc()
-                    
-            except Exception as e:
-                import traceback
-                print(f"❌ 서버 상태 업데이트 실패: {e}")
-                traceback.print_exc()
-                # 업데이트 실패 시 기존 상태 유지
-    
-    if not all_server_status:
-        return jsonify({
+    if not health_monitor:
+        return {
             'active_servers': [],
             'inactive_servers': [],
             'message': 'Server status not available. Try initializing the agent first.',
             'last_check': last_server_status_check
-        })
+        }
+
+    # 상태는 에이전트가 쓰는 연결에 보낸 ping 결과 캐시 (SERVER_STATUS_MAX_AGE마다 백그라운드 갱신)
+    # 새로 고침 요청 시에만 기다려서 바로 다시 확인
+    if refresh == 'true':
+        try:
+            print("🔄 서버 상태 새로 고침 중...")
+            await asyncio.wait_for(health_monitor.refresh(list_tools=True), timeout=20)
+        except Exception as e:
+            print(f"❌ 서버 상태 업데이트 실패: {e}")
+            # 업데이트 실패 시 기존 상태 유지
+    server_statuses = health_monitor.snapshot()
     
     # 서버들을 active와 inactive로 분류
     active_servers = []
     inactive_servers = []
+    supervisor_stats = supervisor.stats() if supervisor else {}
     
-    for server_status in all_server_status:
+    for server_status in server_statuses:
         server_info = {
             'name': server_status.get('name', 'Unknown'),
             'type': server_status.get('type', 'Unknown'),
@@ -652,6 +932,10 @@ def get_server_status():
             'error': server_status.get('error'),
             'status': server_status.get('status')
         }
+        # 연결 감시 지표 (uptime, 재연결 횟수)
+        health = supervisor_stats.get(server_info['name'])
+        if health:
+            server_info.update(health)
         
         # 상태가 명확하게 'SUCCESS'인 경우에만 활성화 상태로 간주
         if server_status.get('status') == 'SUCCESS':
@@ -659,44 +943,63 @@ def get_server_status():
         else:
             inactive_servers.append(server_info)
     
-    return jsonify({
+    data = {
         'active_servers': active_servers,
         'inactive_servers': inactive_servers,
-        'total_servers': len(all_server_status),
+        'total_servers': len(server_statuses),
         'active_count': len(active_servers),
         'inactive_count': len(inactive_servers),
-        'last_check': last_server_status_check
-    })
+        'last_check': health_monitor.checked_at,
+        'tool_cache': get_tool_result_cache().stats(),
+        'llm': model_stats(main_agent.model) if main_agent else None,
+        'runs': get_run_recorder().stats(),
+        'jobs': chat_jobs.stats()
+    }
+    # ETag는 서버 상태 필드만으로 계산: uptime, 지연, 진행 중 호출 수, last_check, 실행/작업/캐시 통계는
+    # 호출마다 바뀌므로 넣으면 304가 나오지 않음 (상태가 같으면 304)
+    etag_source = {key: [{field: s.get(field) for field in SERVER_HEALTH_FIELDS} for s in servers]
+                   for key, servers in (('active_servers', active_servers), ('inactive_servers', inactive_servers))}
+    return etag_json_response(request, data, etag_source)
 
 
-@app.route('/api/status', methods=['GET'])
-def get_status():
+@app.get('/api/status')
+async def get_status():
     """Get agent status."""
-    return jsonify({
+    return {
         'agent_ready': agent_ready,
         'message': 'Agent is ready' if agent_ready else 'Agent is initializing...'
-    })
+    }
 
-@app.route('/api/init', methods=['POST'])
-def init_agent():
+@app.post('/api/init')
+async def init_agent():
     """Initialize or reinitialize the agent."""
-    global background_loop
-    if not background_loop or not background_loop.is_running():
-        return jsonify({'error': 'Background event loop is not running.'}), 503
-
     try:
-        # Submit the initialization to the background event loop
-        future = asyncio.run_coroutine_threadsafe(initialize_agent(), background_loop)
-        
-        # Wait for the result with a timeout
-        success = future.result(timeout=180) # 60-second timeout for initialization
+        # Concurrent calls share one initialization; the current agent keeps serving until the swap.
+        # Wait for the result with a timeout (initialization keeps running in the background after it)
+        success = await asyncio.wait_for(asyncio.shield(reinitialize_agent()), timeout=180)
         
-        return jsonify({'success': success})
+        return {'success': success}
     except Exception as e:
         print(f"❌ Error during re-initialization: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+
+@app.post('/api/reload')
+async def reload_config():
+    """Apply config file changes to the running agent, reconnecting only added/changed servers."""
+    if not current_generation or not config_reloader:
+        # Nothing to patch yet (or watching disabled): fall back to a full blue/green reinit
+        success = await asyncio.wait_for(asyncio.shield(reinitialize_agent()), timeout=180)
+        return {'success': success, 'reinitialized': True}
+    try:
+        # Waits for the initial connect of new servers (bounded by MCP_SETUP_TIMEOUT)
+        summary = await config_reloader.reload()
+        return {'success': True, **summary}
+    except Exception as e:
+        print(f"❌ Error while reloading config: {e}")
+        return JSONResponse({'error': str(e)}, status_code=500)
 
 
 def setup_comprehensive_logging_suppression():
@@ -710,7 +1013,7 @@ def setup_comprehensive_logging_suppression():
     for name in logging.Logger.manager.loggerDict:
         logger = logging.getLogger(name)
         logger.addFilter(mcp_filter)
-        if 'werkzeug' not in name.lower():
+        if 'uvicorn' not in name.lower():
             logger.setLevel(logging.ERROR)
     
     # 특정 로거들에 강제로 필터 적용
@@ -733,38 +1036,15 @@ if __name__ == '__main__':
     # 포괄적인 로깅 억제 설정 적용
     setup_comprehensive_logging_suppression()
 
-    # Set up and start the background event loop
-    background_loop = asyncio.new_event_loop()
-    
-    # Set custom exception handler to suppress benign MCP shutdown errors
-    background_loop.set_exception_handler(_suppress_async_shutdown_error_handler)
-    
-    background_thread = threading.Thread(target=start_background_loop, args=(background_loop,), daemon=True)
-    background_thread.start()
-    
-    # Initialize agent on startup within the background loop
-    init_future = asyncio.run_coroutine_threadsafe(initialize_agent(), background_loop)
-    try:
-        # Wait for initialization to complete
-        init_future.result(timeout=60)
-    except Exception as e:
-        print(f"❌ Agent initialization failed: {e}")
-
     print("🌐 Starting web server...")
     print("📱 Open http://127.0.0.1:5001 in your browser")
 
-    try:
-        # Note: We are now importing threading
-        app.run(
-            host='127.0.0.1',
-            port=5001,
-            debug=False,
-            threaded=True,
-            use_reloader=False
-        )
-    except KeyboardInterrupt:
-        print("\n👋 Shutting down gracefully...")
-    finally:
-        if background_loop:
-            background_loop.call_soon_threadsafe(background_loop.stop)
-            # background_thread.join() # This can hang, stopping is enough for daemon
\ No newline at end of file
+    # The agent is initialized in the lifespan handler on uvicorn's event loop;
+    # a single worker keeps the agent, MCP connections and admission control in one process
+    uvicorn.run(
+        app,
+        host='127.0.0.1',
+        port=5001,
+        workers=1,
+        log_level='warning'
+    )
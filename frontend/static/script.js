@@ -107,6 +107,39 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     // Chat functionality
+    const removeTypingIndicator = (typingId) => {
+        const typingElement = document.getElementById(typingId);
+        if (typingElement) {
+            typingElement.remove();
+        }
+    };
+
+    // Parse a server-sent events stream from a fetch response and call onEvent(name, data) per event
+    const readEventStream = async (response, onEvent) => {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let eventName = 'message';
+                let dataText = '';
+                frame.split('\n').forEach((line) => {
+                    if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataText += line.slice(5).trim();
+                });
+                if (dataText) onEvent(eventName, JSON.parse(dataText));
+            }
+        }
+    };
+
+    const formatMs = (ms) => (ms === null || ms === undefined) ? '-' : (ms >= 1000 ? `${(ms / 1000).toFixed(1)} s` : `${Math.round(ms)} ms`);
+
     const sendMessage = async () => {
         const messageText = userInput.value.trim();
         if (messageText === '') return;
@@ -118,8 +151,81 @@ document.addEventListener('DOMContentLoaded', () => {
         const typingId = 'typing-' + Date.now();
         appendMessage('bot-message', '생각 중...', typingId);
 
+        // Streaming message state; DOM updates are batched to one render per animation frame
+        let botMessage = null;
+        let responseText = '';
+        let renderScheduled = false;
+        const toolElements = {};
+
+        const ensureBotMessage = () => {
+            if (!botMessage) {
+                removeTypingIndicator(typingId);
+                botMessage = appendMessage('bot-message', '');
+            }
+            return botMessage;
+        };
+
+        const flushRender = () => {
+            renderScheduled = false;
+            const contentWrapper = ensureBotMessage().querySelector('.bot-message-content');
+            renderMarkdown(contentWrapper, responseText);
+            chatBox.scrollTop = chatBox.scrollHeight;
+        };
+
+        const scheduleRender = () => {
+            if (!renderScheduled) {
+                renderScheduled = true;
+                requestAnimationFrame(flushRender);
+            }
+        };
+
+        const toolStatusContainer = () => {
+            const wrapper = ensureBotMessage().querySelector('.bot-message-wrapper');
+            let container = wrapper.querySelector('.tool-status');
+            if (!container) {
+                container = document.createElement('div');
+                container.classList.add('tool-status');
+                wrapper.insertBefore(container, wrapper.firstChild);
+            }
+            return container;
+        };
+
+        const handleEvent = (eventName, data) => {
+            if (eventName === 'token') {
+                responseText += data.delta;
+                scheduleRender();
+            } else if (eventName === 'tool_start') {
+                const toolElement = document.createElement('div');
+                toolElement.classList.add('tool-event', 'running');
+                toolElement.innerHTML = `<i class="fas fa-cog fa-spin"></i> <span></span>`;
+                toolElement.querySelector('span').textContent = `${data.tool} 실행 중...`;
+                toolElement.dataset.tool = data.tool;
+                toolStatusContainer().appendChild(toolElement);
+                toolElements[data.call_id] = toolElement;
+                chatBox.scrollTop = chatBox.scrollHeight;
+            } else if (eventName === 'tool_end') {
+                const toolElement = toolElements[data.call_id];
+                if (toolElement) {
+                    toolElement.classList.remove('running');
+                    toolElement.innerHTML = `<i class="fas fa-check"></i> <span></span>`;
+                    toolElement.querySelector('span').textContent = `${toolElement.dataset.tool} (${formatMs(data.ms)})`;
+                }
+            } else if (eventName === 'done') {
+                responseText = data.response;
+                flushRender();
+                const message = ensureBotMessage();
+                message.querySelector('.copy-btn').onclick = (e) => copyToClipboard(responseText, e.currentTarget);
+                const timing = document.createElement('div');
+                timing.classList.add('message-timing');
+                timing.textContent = `첫 토큰 ${formatMs(data.timing.ttft_ms)} · 전체 ${formatMs(data.timing.total_ms)} · 도구 ${data.timing.tool_call_count}회`;
+                message.querySelector('.bot-message-wrapper').appendChild(timing);
+            } else if (eventName === 'error') {
+                throw new Error(data.response);
+            }
+        };
+
         try {
-            const response = await fetch('/chat', {
+            const response = await fetch('/chat/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -127,20 +233,13 @@ document.addEventListener('DOMContentLoaded', () => {
                 body: JSON.stringify({ message: messageText }),
             });
 
-            // Remove typing indicator
-            const typingElement = document.getElementById(typingId);
-            if (typingElement) {
-                typingElement.remove();
-            }
-
             if (!response.ok) {
                 const errorData = await response.json().catch(() => ({}));
                 const errorMessage = errorData.response || `HTTP ${response.status}: ${response.statusText}`;
                 throw new Error(errorMessage);
             }
 
-            const data = await response.json();
-            appendMessage('bot-message', data.response);
+            await readEventStream(response, handleEvent);
             
             // Refresh tools after successful chat (in case MCP tools were used)
             // setTimeout(loadTools, 1000);
@@ -148,10 +247,7 @@ document.addEventListener('DOMContentLoaded', () => {
         } catch (error) {
             console.error('Chat Error:', error);
             // Remove typing indicator if still present
-            const typingElement = document.getElementById(typingId);
-            if (typingElement) {
-                typingElement.remove();
-            }
+            removeTypingIndicator(typingId);
             
             let errorMessage = error.message;
             if (errorMessage.includes('503')) {
@@ -164,6 +260,44 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    // Render bot message text as markdown (also used to re-render streamed text)
+    const renderMarkdown = (contentWrapper, text) => {
+        if (window.marked) {
+            try {
+                // Configure marked for security and better rendering
+                const renderer = new marked.Renderer();
+
+                // Custom link renderer to open in new tab and add security
+                renderer.link = function(href, title, text) {
+                    return `<a href="${href}" title="${title || ''}" target="_blank" rel="noopener noreferrer">${text}</a>`;
+                };
+
+                marked.setOptions({
+                    renderer: renderer,
+                    breaks: true,
+                    gfm: true,
+                    sanitize: false,
+                    smartLists: true,
+                    smartypants: false
+                });
+
+                contentWrapper.innerHTML = marked.parse(text);
+
+                // Apply syntax highlighting to code blocks
+                if (window.hljs) {
+                    contentWrapper.querySelectorAll('pre code').forEach((block) => {
+                        hljs.highlightElement(block);
+                    });
+                }
+            } catch (error) {
+                console.error('Markdown parsing error:', error);
+                contentWrapper.textContent = text; // Fallback to plain text
+            }
+        } else {
+            contentWrapper.textContent = text;
+        }
+    };
+
     const appendMessage = (senderClass, text, messageId = null) => {
         // Hide chat header when first real message is added (exclude typing indicators)
         const chatHeader = document.querySelector('.chat-header');
@@ -197,40 +331,7 @@ document.addEventListener('DOMContentLoaded', () => {
             contentWrapper.classList.add('bot-message-content');
             
             // Convert markdown to HTML for bot messages
-            if (window.marked) {
-                try {
-                    // Configure marked for security and better rendering
-                    const renderer = new marked.Renderer();
-                    
-                    // Custom link renderer to open in new tab and add security
-                    renderer.link = function(href, title, text) {
-                        return `<a href="${href}" title="${title || ''}" target="_blank" rel="noopener noreferrer">${text}</a>`;
-                    };
-                    
-                    marked.setOptions({
-                        renderer: renderer,
-                        breaks: true,
-                        gfm: true,
-                        sanitize: false,
-                        smartLists: true,
-                        smartypants: false
-                    });
-                    
-                    contentWrapper.innerHTML = marked.parse(text);
-                    
-                    // Apply syntax highlighting to code blocks
-                    if (window.hljs) {
-                        contentWrapper.querySelectorAll('pre code').forEach((block) => {
-                            hljs.highlightElement(block);
-                        });
-                    }
-                } catch (error) {
-                    console.error('Markdown parsing error:', error);
-                    contentWrapper.textContent = text; // Fallback to plain text
-                }
-            } else {
-                contentWrapper.textContent = text;
-            }
+            renderMarkdown(contentWrapper, text);
             
             // Add copy button
             const copyButton = document.createElement('button');
@@ -253,6 +354,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         chatBox.appendChild(messageElement);
         chatBox.scrollTop = chatBox.scrollHeight;
+        return messageElement;
     };
     
     // Copy to clipboard function
@@ -604,9 +706,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 hideLlmModal(); // Close LLM modal first
                 // 다른 모달 닫고 진행 중 모달 표시
                 hideCompleteModal();
-                showProgressModal('✅ LLM 설정이 저장되었습니다. 에이전트를 초기화하는 중...');
+                showProgressModal('✅ LLM 설정이 저장되었습니다. 변경 사항을 적용하는 중...');
                 
-                // Reinitialize agent
+                // Apply the new model to the running agent
                 reinitializeApp();
             } else {
                 alert('Error saving LLM configuration: ' + result.error);
@@ -617,10 +719,11 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
-    // Function to reinitialize the agent and update UI
+    // Function to apply saved config to the running agent and update UI
+    // (/api/reload falls back to a full reinit when no agent is running yet)
     const reinitializeApp = async () => {
         try {
-            const initResponse = await fetch('/api/init', {
+            const initResponse = await fetch('/api/reload', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' }
             });
@@ -629,8 +732,12 @@ document.addEventListener('DOMContentLoaded', () => {
             if (initResult.success) {
                 // 진행 중 모달을 닫고 완료 모달로 전환
                 hideProgressModal();
+                const failed = Object.keys(initResult.failed || {});
+                const message = failed.length
+                    ? `설정을 적용했습니다. 연결 실패(기존 상태 유지): ${failed.join(', ')}`
+                    : '설정 변경이 적용되었습니다!';
                 setTimeout(() => {
-                    showCompleteModal('에이전트 초기화가 완료되었습니다!');
+                    showCompleteModal(message);
                 }, 300); // 잠시 지연 후 완료 모달 표시
                 
                 // Refresh config, tools, and server status
@@ -887,9 +994,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 // Show initial success message
                 // 다른 모달 닫고 진행 중 모달 표시
                 hideCompleteModal();
-                showProgressModal('✅ 설정이 저장되었습니다. 에이전트를 초기화하는 중...');
+                showProgressModal('✅ 설정이 저장되었습니다. 변경된 서버만 다시 연결하는 중...');
                 
-                // Reinitialize agent after successful save
+                // Reconnect only the servers whose settings changed
                 reinitializeApp();
 
             } else {
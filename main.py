@@ -9,8 +9,17 @@ from telegram.ext import Application, CommandHandler, MessageHandler, filters, C
 from agents.run import Runner
 
 from src.agent_setup import setup_agent_and_servers
+from src.telegram_sender import TelegramSendQueue
+from src.admission import AdmissionController, AdmissionRejected, BUSY_MESSAGE
+from src.mcp_supervisor import MCPSupervisor
+from src.config_reloader import ConfigReloader
 from src.utils import truncate_for_log, setup_file_logger
-from src.config import TELEGRAM_BOT_TOKEN
+from src.deadline import deadline_scope
+from src.run_metrics import run_scope, get_run_recorder
+from src.tool_router import ToolRouter
+from src.llm_clients import get_llm_client_registry
+from src.ollama import stop_ollama_servers, warm_ollama_servers
+from src.config import TELEGRAM_BOT_TOKEN, REQUEST_DEADLINE_SECONDS, CONFIG_RELOAD_ENABLED
 
 # .env 파일에서 환경 변수 로드 -> config.py에서 처리
 # load_dotenv()
@@ -96,6 +105,11 @@ setup_comprehensive_logging_suppression()
 main_agent = None
 mcp_servers = []
 server_names = []
+send_queue = None
+admission = AdmissionController()
+tool_router = ToolRouter()
+supervisor = None
+config_reloader = None
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """봇 시작 명령어 핸들러"""
@@ -104,49 +118,104 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 무엇이든 물어보세요. 최신 뉴스가 궁금하면 검색을 요청할 수도 있습니다.
 예: "오늘의 주요 뉴스 알려줘"
 """
-    await update.message.reply_text(welcome_message)
+    await send_queue.send_message(update.effective_chat.id, welcome_message)
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """사용자 메시지를 AI 에이전트로 처리하는 핸들러"""
     user_message = update.message.text
+    chat_id = update.effective_chat.id
+    # 사용자별 한도는 채팅이 아닌 보낸 사람 기준 (그룹 채팅 참여자가 한도를 나눠 쓰지 않도록)
+    user_id = update.effective_user.id if update.effective_user else chat_id
     logging.info(f"사용자로부터 메시지 받음: {user_message}")
 
     if not main_agent:
-        await update.message.reply_text("죄송합니다. 에이전트가 아직 준비되지 않았습니다.")
+        await send_queue.send_message(chat_id, "죄송합니다. 에이전트가 아직 준비되지 않았습니다.")
         return
 
-    processing_message = await update.message.reply_text("🔄 생각 중...")
+    processing_message = None
+    # LLM/도구 호출, 대기열, 텔레그램 전송 시간과 토큰 사용량을 실행 기록(logs/runs.jsonl)에 남김
+    with run_scope("telegram", chat_id=chat_id) as run:
+        try:
+            admit_start = time.perf_counter()
+            async with admission.admit(user_id):
+                run.add_phase('admission_wait', time.perf_counter() - admit_start)
+                with run.phase('telegram_io'):
+                    processing_message = await send_queue.send_message(chat_id, "🔄 생각 중...")
 
-    try:
-        # 에이전트 실행 직전에 로깅 필터 재적용
-        setup_comprehensive_logging_suppression()
-        
-        start_time = time.perf_counter()
-        result = await Runner.run(main_agent, input=user_message)
-        duration_ms = (time.perf_counter() - start_time) * 1000.0
-        response_text = str(result.final_output)
+                # 에이전트 실행 직전에 로깅 필터 재적용
+                setup_comprehensive_logging_suppression()
 
-        logging.info(
-            "QnA 처리 완료: duration_ms=%.1f, user='%s', response='%s'",
-            duration_ms,
-            truncate_for_log(user_message),
-            truncate_for_log(response_text)
-        )
+                start_time = time.perf_counter()
+                with deadline_scope(REQUEST_DEADLINE_SECONDS), run.phase('agent'):
+                    # 메시지와 관련 있는 도구만 노출
+                    agent = await tool_router.route(main_agent, user_message)
+                    result = await Runner.run(agent, input=user_message)
+                duration_ms = (time.perf_counter() - start_time) * 1000.0
+            response_text = str(result.final_output)
 
-        await processing_message.delete()
-        await update.message.reply_text(response_text)
+            summary = run.summary()
+            logging.info(
+                "QnA 처리 완료: duration_ms=%.1f, turns=%d, llm_ms=%.1f, tool_ms=%.1f, tokens=%d/%d, cached=%d, user='%s', response='%s'",
+                duration_ms,
+                summary['turns'],
+                summary['llm_ms'],
+                summary['tool_ms'],
+                summary['input_tokens'],
+                summary['output_tokens'],
+                summary['cached_tokens'],
+                truncate_for_log(user_message),
+                truncate_for_log(response_text)
+            )
 
-    except Exception as e:
-        logging.error(f"메시지 처리 중 오류 발생: {e}", exc_info=True)
-        await processing_message.delete()
-        await update.message.reply_text(f"❌ 처리 중 오류가 발생했습니다: {str(e)}")
+            # 삭제와 응답 전송을 함께 큐에 넣어 순서대로 파이프라인 전송
+            with run.phase('telegram_io'):
+                await asyncio.gather(
+                    send_queue.delete_message(chat_id, processing_message.message_id),
+                    send_queue.send_text(chat_id, response_text)
+                )
+
+        except AdmissionRejected as rejected:
+            # 과부하 시 대기시키지 않고 즉시 안내
+            run.fail(rejected)
+            await send_queue.send_message(chat_id, BUSY_MESSAGE)
+
+        except Exception as e:
+            run.fail(e)
+            logging.error(f"메시지 처리 중 오류 발생: {e}", exc_info=True)
+            cleanup = [send_queue.send_text(chat_id, f"❌ 처리 중 오류가 발생했습니다: {str(e)}")]
+            if processing_message:
+                cleanup.insert(0, send_queue.delete_message(chat_id, processing_message.message_id))
+            await asyncio.gather(*cleanup, return_exceptions=True)
+
+async def start_background_services(app):
+    """애플리케이션 시작 시 텔레그램 전송 큐, MCP 연결 감시, Ollama 모델 상주, 설정 파일 감시를 시작합니다."""
+    global send_queue, supervisor, config_reloader
+    send_queue = TelegramSendQueue(app.bot)
+    send_queue.start()
+    supervisor = MCPSupervisor(mcp_servers)
+    supervisor.start()
+    # 첫 메시지가 Ollama 모델 로드를 기다리지 않도록 폴링 시작 전에 미리 불러옴
+    await warm_ollama_servers()
+    if CONFIG_RELOAD_ENABLED:
+        # 설정 파일이 바뀌면 바뀐 서버/모델만 교체 (mcp_servers는 에이전트와 같은 목록이라 함께 갱신됨)
+        config_reloader = ConfigReloader(main_agent, supervisor)
+        config_reloader.start()
 
 async def shutdown_servers(app):
-    """애플리케이션 종료 시 MCP 서버 연결을 종료합니다."""
+    """애플리케이션 종료 시 전송 큐, 연결/설정 감시, MCP 서버와 LLM 클라이언트 연결을 종료합니다."""
+    if send_queue:
+        await send_queue.stop()
+    if config_reloader:
+        await config_reloader.stop()
+    if supervisor:
+        await supervisor.stop()
     logging.info("MCP 서버 연결을 종료합니다.")
     for server in mcp_servers:
-        await server.disconnect()
+        await server.cleanup()
     logging.info("MCP 서버 연결이 모두 종료되었습니다.")
+    stop_ollama_servers()
+    await get_run_recorder().flush()
+    await get_llm_client_registry().aclose()
 
 def main() -> None:
     """봇 실행 메인 함수"""
@@ -163,21 +232,24 @@ def main() -> None:
         logging.error(f"초기 설정 실패: {e}", exc_info=True)
         return
 
-    # ✅ MCP 서버 tools 목록 출력
+    # ✅ MCP 서버 tools 목록 출력 (연결 시 캐시된 목록을 한 번에 조회)
     try:
         # tools 목록 가져오기 전에 로깅 억제 재적용
         setup_comprehensive_logging_suppression()
         
-        for i, server in enumerate(mcp_servers):
-            tools = loop.run_until_complete(server.list_tools())  # List[Tool]
-            
+        all_tools = loop.run_until_complete(
+            asyncio.gather(*(server.list_tools() for server in mcp_servers))
+        )  # List[List[Tool]]
+
+        for i, (server, tools) in enumerate(zip(mcp_servers, all_tools)):
             # mcp_config.json에서 정의한 서버 이름 사용
             if i < len(server_names):
                 server_name = server_names[i]
             else:
                 server_name = f"MCP Server #{i+1}"
                 
-            print(f"\n🔧 {server_name} Tools:")
+            source = ", cached schema" if server.schema_from_cache else ""
+            print(f"\n🔧 {server_name} Tools (startup {server.startup_ms:.0f}ms{source}):")
             for tool in tools:
                 # print(f"  - {tool.name} : {getattr(tool, 'description', '')}")
                 print(f" - {tool.name}")
@@ -186,7 +258,14 @@ def main() -> None:
                 
 
     print("\n✅ 서버가 성공적으로 실행되었습니다. 텔레그램 봇이 메시지를 기다리고 있습니다...")
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_shutdown(shutdown_servers).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)  # 동시 처리량은 AdmissionController가 제한
+        .post_init(start_background_services)
+        .post_shutdown(shutdown_servers)
+        .build()
+    )
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
@@ -0,0 +1,188 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Hashable, Optional
+
+from .deadline import current_deadline
+from .config import (
+    AGENT_MAX_IN_FLIGHT,
+    AGENT_MAX_QUEUE,
+    AGENT_PER_USER_LIMIT,
+    AGENT_SLO_SECONDS,
+    AGENT_LATENCY_WINDOW,
+)
+
+BUSY_MESSAGE = "⏳ 지금은 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+
+
+class AdmissionRejected(Exception):
+    """에이전트 실행이 승인되지 않았을 때 발생하는 예외."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """에이전트 실행에 대한 승인 제어(Admission control) 및 부하 차단(Load shedding).
+
+    - 동시에 실행되는 에이전트 수를 max_in_flight로 제한합니다.
+    - 초과 요청은 최대 max_queue개까지 도착 순서대로 대기합니다.
+    - 사용자별 실행+대기 요청 수를 per_user_limit로 제한합니다.
+    - 최근 실행 시간으로 예상 완료 시간을 추정해 SLO를 넘길 요청은 즉시 거절합니다.
+      실행 중인 요청이 없으면 추정과 관계없이 승인해 실행 시간 기록이 계속 갱신되게 합니다.
+
+    하나의 이벤트 루프 안에서만 사용해야 합니다.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = AGENT_MAX_IN_FLIGHT,
+        max_queue: int = AGENT_MAX_QUEUE,
+        per_user_limit: int = AGENT_PER_USER_LIMIT,
+        slo_seconds: float = AGENT_SLO_SECONDS,
+        latency_window: int = AGENT_LATENCY_WINDOW,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.per_user_limit = per_user_limit
+        self.slo_seconds = slo_seconds
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._per_user: Dict[Hashable, int] = {}
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self.admitted_count = 0
+        self.rejected_count = 0
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def recent_latency(self, quantile: float = 0.5) -> Optional[float]:
+        """최근 실행 시간의 분위수(초)를 반환합니다. 기록이 없으면 None."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
+
+    def estimated_completion(self) -> float:
+        """지금 도착한 요청이 끝날 때까지 걸릴 것으로 예상되는 시간(초)."""
+        latency = self.recent_latency(0.5)
+        if latency is None:
+            return 0.0
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            return latency
+        # 앞선 대기열이 max_in_flight개씩 처리된다고 보고 대기 라운드를 계산
+        rounds_ahead = len(self._waiters) // self.max_in_flight + 1
+        return latency * (rounds_ahead + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 상태와 누적 지표를 반환합니다."""
+        return {
+            'in_flight': self._in_flight,
+            'queued': len(self._waiters),
+            'admitted': self.admitted_count,
+            'rejected': self.rejected_count,
+            'latency_p50': self.recent_latency(0.5),
+            'latency_p90': self.recent_latency(0.9),
+        }
+
+    # ------------------------------------------------------------------
+    # 승인 제어
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def admit(self, user_id: Hashable):
+        """승인된 경우에만 블록을 실행합니다. 거절되면 AdmissionRejected를 발생시킵니다.
+
+        Example:
+            ```python
+            try:
+                async with admission.admit(user_id):
+                    result = await Runner.run(agent, input=message)
+            except AdmissionRejected:
+                await reply(BUSY_MESSAGE)
+            ```
+        """
+        await self._acquire(user_id)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._latencies.append(time.perf_counter() - start_time)
+            self._release(user_id)
+
+    def _reject(self, user_id: Hashable, reason: str) -> AdmissionRejected:
+        self.rejected_count += 1
+        logging.warning(f"에이전트 실행 거절: user={user_id}, reason={reason}, stats={self.stats()}")
+        return AdmissionRejected(reason)
+
+    async def _acquire(self, user_id: Hashable) -> None:
+        if self._per_user.get(user_id, 0) >= self.per_user_limit:
+            raise self._reject(user_id, "사용자별 동시 요청 한도 초과")
+
+        # 유휴 상태에서는 항상 승인: 느린 실행 기록만 남아 모든 요청을 거절하면
+        # 새 기록이 쌓이지 않아 백엔드가 회복돼도 거절이 풀리지 않으므로 한 건씩 확인 요청으로 보냄
+        idle = self._in_flight == 0 and not self._waiters
+        if not idle and self.estimated_completion() > self.slo_seconds:
+            raise self._reject(user_id, "예상 응답 시간이 SLO 초과")
+
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+        elif len(self._waiters) >= self.max_queue:
+            raise self._reject(user_id, "대기열 가득 참")
+        else:
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+            try:
+                await self._wait_for_slot()
+            except asyncio.TimeoutError:
+                self._discard_user(user_id)
+                raise self._reject(user_id, "대기 시간 초과")
+            except BaseException:
+                self._discard_user(user_id)
+                raise
+            self._discard_user(user_id)
+
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        self.admitted_count += 1
+
+    async def _wait_for_slot(self) -> None:
+        """대기열에 들어가 슬롯을 넘겨받을 때까지 기다립니다 (SLO와 요청 Deadline 중 짧은 시간까지)."""
+        timeout = self.slo_seconds
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.timeout(timeout)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # 포기 직전에 슬롯을 넘겨받았다면 다음 대기자에게 돌려줍니다.
+                self._in_flight -= 1
+                self._wake_next()
+            else:
+                waiter.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise
+
+    def _discard_user(self, user_id: Hashable) -> None:
+        self._per_user[user_id] -= 1
+        if self._per_user[user_id] <= 0:
+            del self._per_user[user_id]
+
+    def _release(self, user_id: Hashable) -> None:
+        self._discard_user(user_id)
+        self._in_flight -= 1
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        """대기 중인 다음 요청에게 실행 슬롯을 넘깁니다."""
+        while self._waiters and self._in_flight < self.max_in_flight:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
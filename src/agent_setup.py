@@ -1,113 +1,284 @@
 import logging
 import os
-from agents.mcp import MCPServerStreamableHttp, MCPServerStdio
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from agents.mcp import MCPServer, MCPServerStreamableHttp, MCPServerStdio
 from agents.agent import Agent
 from .llm_factory import LLMFactory
 from .utils import load_prompt
+from .deadline import DeadlineAwareModel
+from .run_metrics import MeteredModel
+from .prompt_assembly import StablePromptModel
+from .managed_server import ManagedMCPServer, MCPReplicaPool
+from .inprocess_server import InProcessMCPServer
+from .tool_schema_cache import ToolSchemaCache, get_tool_schema_cache
 from .config import (
     PROJECT_ROOT,
     PROMPT_DIR,
+    MCP_CONNECT_TIMEOUT,
+    MCP_SESSION_TIMEOUT,
+    MCP_SETUP_TIMEOUT,
+    MCP_LAZY_IDLE_TIMEOUT,
     load_llm_config,
     load_mcp_config
 )
 
+# 백그라운드 스키마 검증 태스크 (가비지 컬렉션 방지용 참조)
+_background_tasks: Set[asyncio.Task] = set()
+
+def create_mcp_server(server_config: Dict[str, Any]) -> ManagedMCPServer:
+    """서버 설정으로 (연결되지 않은) MCP 서버 인스턴스를 만듭니다.
+
+    stdio 서버 설정에 "replicas": N (N > 1)이 있으면 같은 서버 프로세스를 N개 띄우는
+    MCPReplicaPool을 반환합니다. HTTP 서버는 원격에서 부하를 분산하므로 복제하지 않습니다.
+    "in_process": true인 로컬 Python 서버는 서브프로세스 없이 봇 프로세스 안에서 실행됩니다.
+    "lazy": true인 서버는 첫 도구 호출 때 시작되고 "idle_timeout"초(기본 MCP_LAZY_IDLE_TIMEOUT)
+    동안 호출이 없으면 종료됩니다. "tool_cache"에 지정한 도구는 결과를 TTL 동안 캐시합니다.
+    """
+    server_name = server_config['name']
+    replicas = int(server_config.get('replicas', 1))
+    if replicas > 1 and "url" not in server_config and not server_config.get('in_process'):
+        logging.info(f"MCP 복제본 풀 준비: name={server_name}, replicas={replicas}")
+        server = MCPReplicaPool(
+            [_create_managed_server(server_config, f"{server_name}#{i}") for i in range(replicas)],
+            server_name,
+            server_config,
+        )
+    else:
+        server = _create_managed_server(server_config, server_name)
+    if server_config.get('lazy'):
+        server.enable_lazy(float(server_config.get('idle_timeout', MCP_LAZY_IDLE_TIMEOUT)), MCP_SETUP_TIMEOUT)
+    # 같은 인자로 다시 호출해도 결과가 같은 도구만 결과 캐시 사용 (예: {"search_news": {"ttl": 300}})
+    server.tool_cache_ttls = {
+        tool_name: float(options.get('ttl', 0))
+        for tool_name, options in server_config.get('tool_cache', {}).items()
+    }
+    return server
+
+def _create_managed_server(server_config: Dict[str, Any], name: str) -> ManagedMCPServer:
+    # 도구 호출 타임아웃을 요청 Deadline에 맞추고 재연결을 지원하는 래퍼로 감싸기
+    return ManagedMCPServer(lambda: _create_transport(server_config), name, server_config)
+
+def _create_transport(server_config: Dict[str, Any]) -> MCPServer:
+    """설정에 맞는 MCPServerStreamableHttp, MCPServerStdio 또는 InProcessMCPServer 인스턴스를 만듭니다."""
+    server_name = server_config['name']
+    if server_config.get('in_process'):
+        # 신뢰할 수 있는 로컬 FastMCP 서버: args의 스크립트를 이 프로세스에 직접 탑재
+        script = _resolve_project_path(server_config.get('args', [''])[0])
+        logging.info(f"MCP 서버 준비 (in-process): name={server_name}, script={script}")
+        return InProcessMCPServer(script, server_name, server_config.get('attr', 'mcp'))
+    if "url" in server_config:
+        logging.info(f"MCP 서버 준비: name={server_name}, url={server_config['url']}")
+        
+        # 헤더 설정 (인증 등)
+        params = {
+            "url": server_config["url"],
+            "timeout": MCP_CONNECT_TIMEOUT,  # 연결 타임아웃
+        }
+        if "headers" in server_config:
+            params["headers"] = server_config["headers"]
+        
+        server = MCPServerStreamableHttp(
+            params=params,
+            cache_tools_list=True,
+            client_session_timeout_seconds=MCP_SESSION_TIMEOUT
+        )
+    else:
+        logging.info(f"MCP 서버 준비: name={server_name}, command={server_config.get('command')}, args={server_config.get('args', [])}")
+        
+        # args에 포함된 스크립트 경로를 프로젝트 루트 기준으로 변환 (원본 설정은 변경하지 않음)
+        args = [_resolve_project_path(arg) for arg in server_config.get("args", [])]
+
+        server = MCPServerStdio(
+            params={
+                "command": server_config.get("command"),
+                "args": args,
+                "cwd": PROJECT_ROOT, # 작업 디렉토리를 프로젝트 루트로 설정
+                "env": os.environ, # 현재 환경 변수를 자식 프로세스에 전달
+                "shell": True, # 셸을 통해 명령 실행
+            },
+            cache_tools_list=True,
+            client_session_timeout_seconds=MCP_SESSION_TIMEOUT
+        )
+    return server
+
+def _resolve_project_path(arg: str) -> str:
+    # 'src/'로 시작하는 경로를 프로젝트 루트 기준으로 변경
+    if arg.startswith('src/'):
+        return os.path.join(PROJECT_ROOT, arg)
+    return arg
+
+async def connect_server(server: ManagedMCPServer, timeout: float = MCP_SETUP_TIMEOUT,
+                         use_schema_cache: bool = True) -> ManagedMCPServer:
+    """서버에 연결하고 도구 목록까지 불러옵니다. 소요 시간은 server.startup_ms에 기록됩니다.
+
+    도구 스키마 캐시에 현재 설정과 일치하는 항목이 있으면 연결을 기다리지 않고 바로 반환합니다.
+    이 경우 캐시된 스키마로 도구를 제공하고, 연결과 스키마 검증은 백그라운드에서 진행합니다.
+    """
+    start_time = time.perf_counter()
+    schema_cache = get_tool_schema_cache() if use_schema_cache else None
+    cached_tools = schema_cache.get(server.config) if schema_cache else None
+    if cached_tools is not None:
+        warm_start_server(server, cached_tools, schema_cache, timeout)
+        server.startup_ms = (time.perf_counter() - start_time) * 1000.0
+        return server
+    # 캐시가 없는 지연 시작 서버도 스키마를 얻기 위해 한 번은 연결 (이후 유휴 시간이 지나면 종료)
+
+    async def _connect_and_list():
+        await server.connect()
+        return await server.list_tools()
+
+    try:
+        tools = await asyncio.wait_for(_connect_and_list(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await server.cleanup()
+        raise TimeoutError(f"{timeout:.0f}초 안에 연결되지 않았습니다.")
+    except Exception:
+        # 연결 후 도구 목록 조회에서 실패한 경우에도 프로세스/세션을 정리
+        await server.cleanup()
+        raise
+    finally:
+        server.startup_ms = (time.perf_counter() - start_time) * 1000.0
+    server.tool_count = len(tools)
+    if schema_cache:
+        schema_cache.store(server.config, server.server_version, tools)
+    return server
+
+def warm_start_server(server: ManagedMCPServer, cached_tools: List[Any],
+                      schema_cache: ToolSchemaCache, timeout: float = MCP_SETUP_TIMEOUT) -> None:
+    """캐시된 도구 스키마로 서버를 바로 사용할 수 있게 하고 연결은 백그라운드에서 시작합니다.
+
+    지연 시작 서버는 연결하지 않고, 첫 도구 호출로 시작될 때 스키마를 검증합니다.
+    """
+    server.use_cached_tools(cached_tools)
+
+    def _validate(connecting: asyncio.Task):
+        task = asyncio.create_task(_validate_cached_schema(server, connecting, schema_cache))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    if server.lazy:
+        server.on_spawn = _validate
+        return
+    _validate(server.start_connect(timeout))
+
+async def _validate_cached_schema(server: ManagedMCPServer, connecting: asyncio.Task,
+                                  schema_cache: ToolSchemaCache) -> None:
+    """연결이 끝나면 실제 서버 버전/도구 목록과 캐시를 비교하고, 다르면 캐시를 교체합니다."""
+    try:
+        await connecting
+        tools = await server.list_tools()
+    except Exception:
+        # 연결 실패는 서버 쪽에서 기록되고 MCPSupervisor가 재연결하므로 캐시는 그대로 둠
+        return
+    if schema_cache.matches(server.config, server.server_version, tools):
+        logging.info(f"도구 스키마 캐시 검증 완료: name={server.name}, version={server.server_version}")
+        return
+    logging.warning(
+        f"도구 스키마 캐시 불일치로 갱신합니다: name={server.name}, version={server.server_version}, tools={len(tools)}"
+    )
+    schema_cache.store(server.config, server.server_version, tools)
+    server.use_cached_tools(tools, from_cache=False)
+
+async def connect_servers(servers: List[ManagedMCPServer],
+                          timeout: float = MCP_SETUP_TIMEOUT) -> List[Optional[BaseException]]:
+    """여러 서버를 동시에 연결합니다. 서버 순서대로 실패 시 예외, 성공 시 None을 반환합니다."""
+    results = await asyncio.gather(
+        *(connect_server(server, timeout) for server in servers), return_exceptions=True
+    )
+    return [r if isinstance(r, BaseException) else None for r in results]
+
+def create_agent_model(llm_config: Dict[str, Any]):
+    """llm_config.json 설정으로 에이전트가 사용할 모델을 만듭니다.
+
+    요청 Deadline에 맞춰 LLM 호출 타임아웃을 조정하고, 호출마다 토큰/지연을 실행 기록에 남기고,
+    프롬프트 캐시가 적중하도록 도구 순서/스키마를 고정하는 래퍼로 감쌉니다.
+    """
+    llm_factory = LLMFactory(llm_config)
+    return DeadlineAwareModel(MeteredModel(StablePromptModel(llm_factory.get_model())))
+
 async def setup_agent_and_servers(available_servers=None):
     """MCP 서버와 AI 에이전트를 설정합니다.
     
+    모든 MCP 서버는 동시에 연결되며, 각 서버는 연결과 도구 목록 조회를
+    MCP_SETUP_TIMEOUT 안에 마쳐야 합니다. 실패한 서버는 제외하고 계속 진행합니다.
+    도구 스키마 캐시가 있는 서버는 연결을 기다리지 않고 캐시된 스키마로 시작합니다.
+    
     Args:
         available_servers (List[Dict]): 연결 확인된 서버들의 설정 리스트.
+                                       check_and_get_servers(keep_connections=True)의 결과처럼
+                                       'server'에 연결된 서버가 있으면 재연결하지 않고 사용합니다.
                                        None인 경우 설정 파일에서 모든 서버를 로드합니다.
     """
     mcp_servers = []
     server_names = []  # 서버 이름 저장용
     
-    # LLM 설정 로드
-    llm_config = load_llm_config()
-    if not llm_config:
-        return None, [], []
-
-    # LLMFactory 인스턴스 생성
-    llm_factory = LLMFactory(llm_config)
-    
-    # 사용할 서버 설정 결정
+    # 사용할 서버 설정 결정 (상태 확인 단계에서 이미 연결된 서버 핸들은 그대로 사용)
     if available_servers is not None:
         # 연결 확인된 서버들만 사용
-        server_configs = [s['config'] for s in available_servers]
-        print(f"🔍 연결 확인된 {len(server_configs)}개 서버로 초기화합니다.")
+        server_entries = [(s['config'], s.get('server')) for s in available_servers]
+        print(f"🔍 연결 확인된 {len(server_entries)}개 서버로 초기화합니다.")
     else:
         # 기본 동작: 설정 파일에서 모든 서버를 로드
         config = load_mcp_config()
-        server_configs = config.get('mcpServers', [])
-        print(f"🔍 설정 파일의 {len(server_configs)}개 서버로 초기화합니다.")
+        server_entries = [(c, None) for c in config.get('mcpServers', [])]
+        print(f"🔍 설정 파일의 {len(server_entries)}개 서버로 초기화합니다.")
 
-    for server_config in server_configs:
-        server_name = server_config.get('name')
-        if not server_name:
+    # LLM 설정 로드
+    llm_config = load_llm_config()
+    if not llm_config:
+        # 넘겨받은 연결이 남지 않도록 정리
+        await asyncio.gather(*(server.cleanup() for _, server in server_entries if server))
+        return None, [], []
+
+    # LLM 모델 생성 (잘못된 설정이면 서버를 연결하기 전에 실패)
+    model = create_agent_model(llm_config)
+
+    candidates = []
+    for server_config, connected_server in server_entries:
+        if not server_config.get('name'):
             logging.warning("MCP 서버 설정에 'name' 필드가 없습니다. 건너뜁니다.")
             continue
-            
-        if "url" in server_config:
-            logging.info(f"MCP 서버 준비: name={server_name}, url={server_config['url']}")
-            
-            # 헤더 설정 (인증 등)
-            params = {
-                "url": server_config["url"],
-                "timeout": 30.0,  # 연결 타임아웃을 30초로 설정
-                "request_timeout": 120.0 # 요청 타임아웃을 120초로 설정
-            }
-            if "headers" in server_config:
-                params["headers"] = server_config["headers"]
-            
-            server = MCPServerStreamableHttp(
-                params=params,
-                cache_tools_list=True,
-                client_session_timeout_seconds=60.0
-            )
-        else:
-            logging.info(f"MCP 서버 준비: name={server_name}, command={server_config.get('command')}, args={server_config.get('args', [])}")
-            
-            # args에 포함된 스크립트 경로를 프로젝트 루트 기준으로 변환
-            args = server_config.get("args", [])
-            for i, arg in enumerate(args):
-                # 'src/'로 시작하는 경로를 프로젝트 루트 기준으로 변경
-                if arg.startswith('src/'):
-                    args[i] = os.path.join(PROJECT_ROOT, arg)
-
-            server = MCPServerStdio(
-                params={
-                    "command": server_config.get("command"),
-                    "args": args,
-                    "cwd": PROJECT_ROOT, # 작업 디렉토리를 프로젝트 루트로 설정
-                    "env": os.environ, # 현재 환경 변수를 자식 프로세스에 전달
-                    "shell": True, # 셸을 통해 명령 실행
-                    "request_timeout": 60.0 # 요청 타임아웃을 120초로 설정
-                },
-                cache_tools_list=True,
-                client_session_timeout_seconds=60.0
-            )
-        
-        try:
-            # 서버 연결 시도
-            await server.connect()
+        candidates.append(connected_server or create_mcp_server(server_config))
+
+    # 연결되지 않은 서버만 병렬로 연결
+    setup_start = time.perf_counter()
+    # 상태 확인 단계에서 연결됐거나 캐시된 스키마로 시작한 서버는 건너뜀
+    pending = [server for server in candidates
+               if not (server.connection_started or server.cached_tools is not None)]
+    pending_errors = dict(zip(map(id, pending), await connect_servers(pending)))
+    errors = [pending_errors.get(id(server)) for server in candidates]
+    setup_ms = (time.perf_counter() - setup_start) * 1000.0
+    if len(pending) < len(candidates):
+        logging.info(f"상태 확인 시 연결된 MCP 서버 {len(candidates) - len(pending)}개를 재사용합니다.")
+
+    for server, error in zip(candidates, errors):
+        server_name = server.name
+        if error is None:
+            source = "cache" if server.schema_from_cache else "server"
             if available_servers is not None:
-                print(f"✅ MCP 서버 연결 성공 (사전 확인됨): name={server_name}")
+                print(f"✅ MCP 서버 연결 성공 (사전 확인됨): name={server_name}, tools={server.tool_count}, schema={source}, startup_ms={server.startup_ms:.1f}")
             else:
-                logging.info(f"MCP 서버 연결 성공: name={server_name}")
+                logging.info(f"MCP 서버 연결 성공: name={server_name}, tools={server.tool_count}, schema={source}, startup_ms={server.startup_ms:.1f}")
+            server.touch()  # 지연 시작 서버는 여기서부터 유휴 시간 측정
             mcp_servers.append(server)
             server_names.append(server_name)  # 서버 이름도 함께 저장
-        except Exception as e:
+        else:
             # 이미 연결 확인된 서버들의 경우 연결 실패를 더 심각하게 처리
             if available_servers is not None:
-                print(f"⚠️ 사전 확인된 MCP 서버 연결 실패: name={server_name}, error={str(e)}")
+                print(f"⚠️ 사전 확인된 MCP 서버 연결 실패: name={server_name}, error={str(error)}")
                 print(f"   서버 상태가 변경되었을 수 있습니다.")
             else:
                 # Streamable HTTP 에러는 warning 레벨로 낮춤
-                if "Streamable HTTP" in str(e) or "Transport" in str(e):
-                    logging.warning(f"MCP 서버 연결 실패 (일시적): name={server_name}, error={str(e)}")
+                if "Streamable HTTP" in str(error) or "Transport" in str(error):
+                    logging.warning(f"MCP 서버 연결 실패 (일시적): name={server_name}, error={str(error)}")
                 else:
-                    logging.error(f"MCP 서버 연결 실패: name={server_name}, error={str(e)}")
+                    logging.error(f"MCP 서버 연결 실패: name={server_name}, error={str(error)}, startup_ms={server.startup_ms:.1f}")
             logging.info(f"MCP 서버 '{server_name}' 없이 계속 진행합니다.")
 
+    logging.info(f"MCP 서버 병렬 연결 완료: {len(mcp_servers)}/{len(candidates)}개 성공, total_ms={setup_ms:.1f}")
+
     # Load the universal prompt from file
     INSTRUCTIONS = load_prompt("prompt.txt", PROMPT_DIR)
 
@@ -115,7 +286,7 @@ async def setup_agent_and_servers(available_servers=None):
     main_agent = Agent(
         name="Main Agent",
         instructions=INSTRUCTIONS,
-        model=llm_factory.get_model(),  # LLMFactory를 통해 모델 인스턴스 가져오기
+        model=model,
         mcp_servers=mcp_servers  # Attach all MCP servers to this single agent
     )
 
@@ -0,0 +1,147 @@
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .admission import AdmissionRejected
+from .config import CHAT_JOB_TTL_SECONDS, CHAT_JOB_MAX_ENTRIES
+
+
+class ChatJob:
+    """제출된 채팅 메시지 하나의 실행 상태와 결과."""
+
+    def __init__(self, client_id: Hashable, idempotency_key: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex
+        self.client_id = client_id
+        self.idempotency_key = idempotency_key
+        self.status = "queued"  # queued -> running -> done | error | rejected
+        self.response: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.expires_at: Optional[float] = None  # 완료 시점부터 TTL 적용 (단조 시계)
+        self.task: Optional[asyncio.Task] = None
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    async def wait(self, timeout: float) -> bool:
+        """작업이 끝날 때까지 최대 timeout초 기다립니다. 끝났으면 True."""
+        if timeout > 0 and not self.finished:
+            try:
+                await asyncio.wait_for(self._done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.finished
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'response': self.response,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class ChatJobStore:
+    """채팅 작업을 HTTP 연결과 분리해 실행하고 결과를 TTL 동안 보관하는 크기 제한 저장소.
+
+    제출 즉시 작업 ID를 돌려주고 에이전트는 별도 태스크에서 실행되므로 클라이언트 연결이
+    끊겨도 결과가 남습니다. 같은 클라이언트가 같은 멱등 키(idempotency key)로 다시 제출하면
+    새로 실행하지 않고 기존 작업을 돌려줍니다. 완료된 작업은 TTL이 지나거나 max_entries를
+    넘으면 오래된 것부터 제거하고, 실행 중인 작업은 제거하지 않습니다.
+
+    하나의 이벤트 루프 안에서만 사용해야 합니다.
+    """
+
+    def __init__(self, ttl: float = CHAT_JOB_TTL_SECONDS, max_entries: int = CHAT_JOB_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._jobs: "OrderedDict[str, ChatJob]" = OrderedDict()
+        self._keys: Dict[tuple, str] = {}  # (client_id, idempotency_key) -> job_id
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                       'evicted': 0}
+
+    def submit(self, client_id: Hashable, run: Callable[[], Awaitable[str]],
+               idempotency_key: Optional[str] = None) -> tuple:
+        """작업을 등록하고 실행을 시작합니다. (ChatJob, 새로 만들었는지 여부)를 반환합니다.
+
+        Args:
+            run: 최종 응답 텍스트를 돌려주는 코루틴 함수 (에이전트 실행)
+        """
+        self._evict()
+        if idempotency_key:
+            job = self.get(self._keys.get((client_id, idempotency_key), ""))
+            if job is not None:
+                self._stats['deduplicated'] += 1
+                return job, False
+
+        job = ChatJob(client_id, idempotency_key)
+        self._jobs[job.job_id] = job
+        if idempotency_key:
+            self._keys[(client_id, idempotency_key)] = job.job_id
+        self._stats['submitted'] += 1
+        # 요청 핸들러와 분리된 태스크로 실행해 연결이 끊겨도 취소되지 않게 함
+        job.task = asyncio.create_task(self._run(job, run))
+        return job, True
+
+    def get(self, job_id: str) -> Optional[ChatJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.expires_at is not None and job.expires_at <= time.monotonic():
+            self._remove(job_id)
+            return None
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        running = sum(1 for job in self._jobs.values() if not job.finished)
+        return {'jobs': len(self._jobs), 'running': running, **self._stats}
+
+    async def cancel_all(self) -> None:
+        """실행 중인 작업을 모두 취소합니다 (종료 시)."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: ChatJob, run: Callable[[], Awaitable[str]]) -> None:
+        job.status = "running"
+        try:
+            job.response = await run()
+            job.status = "done"
+            self._stats['completed'] += 1
+        except AdmissionRejected as e:
+            job.status = "rejected"
+            job.error = e.reason
+            self._stats['rejected'] += 1
+        except Exception as e:
+            logging.error(f"채팅 작업 실패: job_id={job.job_id}, error={e}", exc_info=True)
+            job.status = "error"
+            job.error = f"{type(e).__name__}: {e}"
+            self._stats['failed'] += 1
+        finally:
+            job.finished_at = time.time()
+            job.expires_at = time.monotonic() + self.ttl
+            job._done.set()
+            self._evict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for job_id in [j.job_id for j in self._jobs.values() if j.expires_at is not None and j.expires_at <= now]:
+            self._remove(job_id)
+        # 개수 한도를 넘으면 완료된 작업 중 가장 오래된 것부터 제거
+        excess = len(self._jobs) - self.max_entries
+        if excess > 0:
+            for job_id in [j.job_id for j in self._jobs.values() if j.finished][:excess]:
+                self._remove(job_id)
+                self._stats['evicted'] += 1
+
+    def _remove(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id, None)
+        if job is not None and job.idempotency_key:
+            self._keys.pop((job.client_id, job.idempotency_key), None)
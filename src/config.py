@@ -11,11 +11,14 @@ load_dotenv()
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 SRC_DIR = os.path.dirname(__file__)
 LOGS_DIR = os.path.join(PROJECT_ROOT, 'logs')
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'cache')
 PROMPT_DIR = os.path.join(SRC_DIR, 'prompt')
 
 # 설정 파일 경로
 LLM_CONFIG_PATH = os.path.join(PROJECT_ROOT, 'llm_config.json')
 MCP_CONFIG_PATH = os.path.join(PROJECT_ROOT, 'mcp_config.json')
+TOOL_SCHEMA_CACHE_PATH = os.path.join(CACHE_DIR, 'tool_schemas.json')
+RUN_METRICS_PATH = os.path.join(LOGS_DIR, 'runs.jsonl')  # 에이전트 실행별 토큰/지연 기록 (JSON lines)
 
 # =============================================================================
 # 필수 환경 변수
@@ -26,10 +29,10 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 # =============================================================================
 # 추가 환경 변수
 # =============================================================================
-# NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
-# NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
-# NAVER_NEWS_API_URL = "https://openapi.naver.com/v1/search/news.json"
-# NAVER_NEWS_DEFAULT_COUNT = 5
+NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
+NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
+NAVER_NEWS_API_URL = "https://openapi.naver.com/v1/search/news.json"
+NAVER_NEWS_DEFAULT_COUNT = 5
 
 
 # =============================================================================
@@ -39,6 +42,120 @@ DEFAULT_TIMEOUT = 15
 ARTICLE_FETCH_TIMEOUT = 10
 DEFAULT_USER_AGENT = 'Mozilla/5.0'
 
+# =============================================================================
+# 텔레그램 전송 설정 (Flood control 한도)
+# =============================================================================
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096  # 메시지 1개당 최대 글자 수
+TELEGRAM_GLOBAL_RATE = 30.0  # 봇 전체 초당 전송 수
+TELEGRAM_PRIVATE_CHAT_RATE = 1.0  # 개인 채팅당 초당 전송 수
+TELEGRAM_GROUP_CHAT_RATE = 20.0 / 60.0  # 그룹 채팅당 초당 전송 수 (분당 20개)
+TELEGRAM_MAX_CONCURRENT_SENDS = 32  # 동시에 진행할 수 있는 Bot API 호출 수
+TELEGRAM_MAX_RETRIES = 3  # RetryAfter 발생 시 최대 재시도 횟수
+TELEGRAM_CHAT_IDLE_SECONDS = 300.0  # 전송이 없는 채팅의 전송 한도 상태를 정리하기까지의 시간(초)
+
+# =============================================================================
+# 에이전트 실행 승인 제어 (Admission control)
+# =============================================================================
+AGENT_MAX_IN_FLIGHT = int(os.getenv("AGENT_MAX_IN_FLIGHT", "8"))  # 동시에 실행할 에이전트 수
+AGENT_MAX_QUEUE = int(os.getenv("AGENT_MAX_QUEUE", "32"))  # 대기열 최대 길이
+AGENT_PER_USER_LIMIT = int(os.getenv("AGENT_PER_USER_LIMIT", "2"))  # 사용자별 동시 요청 수
+AGENT_SLO_SECONDS = float(os.getenv("AGENT_SLO_SECONDS", "90"))  # 응답 시간 목표(초)
+AGENT_LATENCY_WINDOW = 50  # 예상 응답 시간 계산에 사용할 최근 실행 수
+
+# =============================================================================
+# 요청 시간 예산 (Deadline) 및 MCP 타임아웃
+# =============================================================================
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "170"))  # 요청 하나의 전체 시간 예산
+DEADLINE_WRAP_UP_SECONDS = 20.0  # 남은 시간이 이보다 적으면 에이전트에게 답변 마무리를 지시
+DEADLINE_FINAL_ANSWER_RESERVE_SECONDS = 15.0  # 도구 호출 시 최종 답변용으로 남겨둘 시간
+MCP_CONNECT_TIMEOUT = 30.0  # MCP HTTP 연결 타임아웃
+MCP_SESSION_TIMEOUT = 60.0  # MCP ClientSession 읽기 타임아웃
+MCP_SETUP_TIMEOUT = 60.0  # 에이전트 설정 시 서버별 연결 + 도구 목록 조회 타임아웃
+MCP_TOOL_CALL_TIMEOUT = 60.0  # 도구 호출 1회의 기본 타임아웃 (Deadline에 맞춰 줄어듦)
+MCP_HEALTH_CHECK_INTERVAL = 15.0  # 연결 감시 ping 주기(초)
+MCP_PING_TIMEOUT = 5.0  # ping 응답 대기 시간(초)
+SERVER_STATUS_MAX_AGE = float(os.getenv("SERVER_STATUS_MAX_AGE", "30"))  # 웹 서버 상태 캐시 최대 나이(초), 이 주기로 백그라운드 갱신
+MCP_RECONNECT_BASE_DELAY = 1.0  # 재연결 백오프 시작 값(초)
+MCP_RECONNECT_MAX_DELAY = 30.0  # 재연결 백오프 최대 값(초)
+MCP_TOOL_CALL_MIN_TIMEOUT = 5.0  # 관측 지연으로 줄인 도구 호출 타임아웃의 하한(초)
+MCP_LATENCY_WINDOW = 200  # 서버별 타임아웃 계산에 사용할 최근 도구 호출 수
+MCP_LATENCY_MIN_SAMPLES = 20  # 관측 지연을 타임아웃/헤징에 쓰기 시작할 최소 표본 수
+MCP_TIMEOUT_QUANTILE = 0.99  # 타임아웃 계산에 사용할 분위수
+MCP_TIMEOUT_MULTIPLIER = 3.0  # 타임아웃 = 분위수 지연 x 배수 (MCP_TOOL_CALL_TIMEOUT 이하)
+MCP_HEDGE_QUANTILE = 0.95  # 이 분위수 지연이 지나도 응답이 없으면 다른 복제본에 한 번 더 요청
+MCP_HEDGE_MAX_RATIO = 0.1  # 헤징으로 추가 요청을 보내는 최대 비율 (부하 증가 제한)
+MCP_PROBE_CONNECT_TIMEOUT = 30.0  # 서버 상태 확인 시 연결 타임아웃
+MCP_PROBE_LIST_TOOLS_TIMEOUT = 10.0  # 서버 상태 확인 시 도구 목록 타임아웃
+TOOL_RESULT_CACHE_MAX_ENTRIES = 512  # 도구 결과 캐시 최대 항목 수
+TOOL_RESULT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # 도구 결과 캐시 최대 크기(바이트)
+MCP_LAZY_IDLE_TIMEOUT = 300.0  # 지연 시작 서버의 기본 유휴 종료 시간(초), 서버별 "idle_timeout"으로 변경
+TOOL_SCHEMA_CACHE_ENABLED = os.getenv("TOOL_SCHEMA_CACHE_ENABLED", "true").lower() == "true"  # 도구 스키마 디스크 캐시 사용 여부
+
+# =============================================================================
+# LLM HTTP 클라이언트 (프로세스 공용 연결 풀)
+# =============================================================================
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))  # 제공자/URL별 최대 동시 연결 수
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))  # 유지할 유휴(keep-alive) 연결 수
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))  # 유휴 연결 유지 시간(초)
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"  # HTTP/2 사용 여부 (h2 패키지가 있을 때만)
+LLM_CONNECT_TIMEOUT = 10.0  # LLM API 연결 타임아웃(초)
+LLM_READ_TIMEOUT = 120.0  # LLM 응답 읽기 타임아웃(초), 요청 Deadline이 더 짧으면 그쪽을 따름
+LLM_POOL_TIMEOUT = 10.0  # 연결 풀에서 빈 연결을 기다리는 시간(초)
+
+# =============================================================================
+# LLM 제공자 라우팅 (llm_config.json의 "providers" 목록 사용 시)
+# =============================================================================
+LLM_LATENCY_WINDOW = 100  # 제공자별 TTFT 분위수 계산에 사용할 최근 호출 수
+LLM_LATENCY_MIN_SAMPLES = 10  # TTFT 분위수를 라우팅/헤징에 쓰기 시작할 최소 표본 수
+LLM_ERROR_WINDOW = 50  # 제공자별 오류율 계산에 사용할 최근 호출 수
+LLM_DEFAULT_TTFT = 1.0  # TTFT 표본이 부족한 제공자의 예상 TTFT(초)
+LLM_COOLDOWN_BASE = 5.0  # 호출이 실패한 제공자를 배정에서 제외하는 시간(초), 연속 실패마다 2배
+LLM_COOLDOWN_MAX = 120.0  # 제외 시간 최대 값(초)
+LLM_HEDGE_QUANTILE = 0.95  # 이 분위수 TTFT가 지나도 응답이 없으면 다음 제공자에 한 번 더 요청
+LLM_HEDGE_MAX_RATIO = 0.1  # 헤징으로 추가 요청을 보내는 최대 비율
+
+# =============================================================================
+# Ollama (로컬 추론 서버)
+# =============================================================================
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # 모델을 메모리에 유지할 시간 (Ollama keep_alive 형식)
+OLLAMA_KEEPALIVE_INTERVAL = 120.0  # 모델 유지 ping 주기(초), 일반 요청이 keep_alive를 기본값(5분)으로 되돌리므로 그보다 짧게
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "1"))  # Ollama 서버의 동시 처리 수와 맞출 것
+OLLAMA_WARM_TIMEOUT = 300.0  # 모델 로드(warm-up) 요청 타임아웃(초)
+
+# =============================================================================
+# 모델 캐스케이드 (llm_config.json의 "cascade" 사용 시)
+# =============================================================================
+CASCADE_COMPLEXITY_THRESHOLD = 0.5  # 복잡도 점수가 이 값 이상이면 큰 모델 사용
+CASCADE_ESCALATE_MARKER = "[ESCALATE]"  # confidence 모드에서 작은 모델이 확신이 없을 때 출력하는 표시
+
+# =============================================================================
+# 실행 기록 (에이전트 실행별 토큰/지연)
+# =============================================================================
+RUN_METRICS_ENABLED = os.getenv("RUN_METRICS_ENABLED", "true").lower() == "true"  # runs.jsonl 기록 여부
+RUN_METRICS_WINDOW = 200  # 분위수 계산에 사용할 최근 실행 수
+PROMPT_STABLE_ORDER = os.getenv("PROMPT_STABLE_ORDER", "true").lower() == "true"  # 프롬프트 캐시를 위해 도구 순서/스키마 고정
+
+# =============================================================================
+# 웹 채팅 작업 (Job API)
+# =============================================================================
+CHAT_JOB_TTL_SECONDS = float(os.getenv("CHAT_JOB_TTL_SECONDS", "600"))  # 완료된 작업 결과 보관 시간(초)
+CHAT_JOB_MAX_ENTRIES = int(os.getenv("CHAT_JOB_MAX_ENTRIES", "256"))  # 보관할 최대 작업 수
+CHAT_JOB_MAX_WAIT_SECONDS = 30.0  # 작업 조회 시 완료를 기다리는 최대 시간(long polling)
+
+# =============================================================================
+# 설정 파일 자동 반영 (mcp_config.json / llm_config.json)
+# =============================================================================
+CONFIG_RELOAD_ENABLED = os.getenv("CONFIG_RELOAD_ENABLED", "true").lower() == "true"  # 설정 파일 변경 감시 여부
+CONFIG_RELOAD_INTERVAL = 2.0  # 설정 파일 변경 확인 주기(초)
+CONFIG_RELOAD_DRAIN_SECONDS = 60.0  # 제거/교체된 서버의 진행 중 도구 호출을 기다리는 최대 시간(초)
+
+# =============================================================================
+# 도구 라우팅 (메시지별 도구 선택)
+# =============================================================================
+TOOL_ROUTER_ENABLED = os.getenv("TOOL_ROUTER_ENABLED", "true").lower() == "true"  # 도구 라우팅 사용 여부
+TOOL_ROUTER_TOP_K = int(os.getenv("TOOL_ROUTER_TOP_K", "8"))  # 메시지마다 노출할 최대 도구 수
+TOOL_ROUTER_MIN_TOOLS = 12  # 전체 도구가 이 개수 이하면 라우팅하지 않음
+
 # =============================================================================
 # 로깅 설정
 # =============================================================================
@@ -95,7 +212,11 @@ def load_mcp_config():
 
 # LLM 설정 로드
 llm_config = load_llm_config()
-LLM_PROVIDER = llm_config.get("llm_provider", "openai")  # 기본값으로 openai 사용
+# "providers" 목록이 있으면 각 항목이 제공자 설정, 없으면 최상위 설정이 단일 제공자 (LLMFactory와 동일)
+LLM_PROVIDER_CONFIGS = llm_config.get("providers") or [llm_config]
+if llm_config.get("cascade", {}).get("small"):
+    LLM_PROVIDER_CONFIGS = LLM_PROVIDER_CONFIGS + [llm_config["cascade"]["small"]]
+LLM_PROVIDER = LLM_PROVIDER_CONFIGS[0].get("llm_provider", "openai")  # 대표(첫 번째) 제공자, 기본값 openai
 SUPPORTED_LLM_PROVIDERS = ["openai", "ollama"]
 
 # =============================================================================
@@ -106,27 +227,37 @@ def validate_config():
     if not TELEGRAM_BOT_TOKEN:
         raise ValueError("TELEGRAM_BOT_TOKEN 환경변수를 설정해주세요.")
 
-    if LLM_PROVIDER not in SUPPORTED_LLM_PROVIDERS:
+    for entry in LLM_PROVIDER_CONFIGS:
+        validate_llm_provider(entry)
+
+
+def validate_llm_provider(entry: dict):
+    """제공자 설정 하나의 제공자 이름과 API 키 환경변수를 확인합니다."""
+    provider = entry.get("llm_provider", "openai").lower()
+    if provider not in SUPPORTED_LLM_PROVIDERS:
         raise ValueError(
-            f"지원하지 않는 LLM_PROVIDER입니다: {LLM_PROVIDER}. "
+            f"지원하지 않는 LLM_PROVIDER입니다: {provider}. "
             f"지원하는 제공자: {', '.join(SUPPORTED_LLM_PROVIDERS)}"
         )
 
-    if LLM_PROVIDER == "openai":
-        if not OPENAI_API_KEY:
-            raise ValueError("LLM_PROVIDER가 'openai'일 경우 OPENAI_API_KEY를 환경 변수로 설정해야 합니다.")
+    if provider == "openai":
+        # api_key_env를 주면 그 환경변수의 키를 사용 (OpenAI 호환 엔드포인트)
+        key_env = entry.get("api_key_env") or "OPENAI_API_KEY"
+        if not os.getenv(key_env):
+            raise ValueError(f"LLM_PROVIDER가 'openai'일 경우 {key_env}를 환경 변수로 설정해야 합니다.")
 
 
-# def validate_naver_config():
-#     """Naver API 설정을 검증합니다."""
-#     if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-#         raise ValueError("환경변수 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET가 설정되지 않았습니다.")
+def validate_naver_config():
+    """Naver API 설정을 검증합니다."""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        raise ValueError("환경변수 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET가 설정되지 않았습니다.")
 
 # =============================================================================
 # 초기화
 # =============================================================================
 # 로그 디렉토리 생성
 os.makedirs(LOGS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
 
 # 기본 설정 검증
 validate_config()
@@ -0,0 +1,214 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .agent_setup import create_agent_model, create_mcp_server, connect_server
+from .tool_result_cache import get_tool_result_cache
+from .config import (
+    MCP_CONFIG_PATH,
+    LLM_CONFIG_PATH,
+    CONFIG_RELOAD_INTERVAL,
+    CONFIG_RELOAD_DRAIN_SECONDS,
+)
+
+
+def _canonical(config: Any) -> str:
+    return json.dumps(config, sort_keys=True, ensure_ascii=False)
+
+
+def diff_server_configs(old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]):
+    """서버 이름 기준으로 (추가된 이름, 설정이 바뀐 이름, 제거된 이름) 목록을 반환합니다."""
+    added = [name for name in new if name not in old]
+    changed = [name for name in new if name in old and _canonical(old[name]) != _canonical(new[name])]
+    removed = [name for name in old if name not in new]
+    return added, changed, removed
+
+
+def _servers_by_name(mcp_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {c['name']: c for c in mcp_config.get('mcpServers', []) if c.get('name')}
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    """설정 파일을 읽습니다. 없으면 {}; 저장 도중이라 JSON이 깨져 있으면 None (다음 확인 때 다시 읽음)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        logging.warning(f"설정 파일을 읽지 못해 다음 확인 때 다시 시도합니다: path={path}, error={e}")
+        return None
+
+
+class ConfigReloader:
+    """mcp_config.json과 llm_config.json의 변경을 감지해 바뀐 부분만 실행 중인 에이전트에 반영합니다.
+
+    파일 수정 시각을 주기적으로 확인하고, 바뀌면 이전 설정과 서버 이름 기준으로 비교합니다.
+    - 추가/변경된 서버: 새로 연결한 뒤 agent.mcp_servers에 넣거나 기존 서버와 교체
+    - 제거된 서버: 목록에서 빼고 진행 중인 도구 호출이 끝나면 연결 종료
+    - 변경되지 않은 서버: 연결, 도구 스키마, 도구 결과 캐시를 그대로 유지
+    - llm_config.json: 새 모델을 만들어 agent.model만 교체
+    agent.mcp_servers 목록은 제자리에서 수정하므로 같은 목록을 참조하는 쪽(main.py의 mcp_servers 등)에도
+    그대로 반영됩니다. 변경된 서버의 연결에 실패하면 기존 서버를 계속 사용합니다.
+    """
+
+    def __init__(self, agent, supervisor=None, on_reload: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 interval: float = CONFIG_RELOAD_INTERVAL, mcp_config_path: str = MCP_CONFIG_PATH,
+                 llm_config_path: str = LLM_CONFIG_PATH):
+        """
+        Args:
+            on_reload: 반영이 끝날 때마다 변경 요약(dict)을 받아 호출되는 함수 (상태 캐시 갱신 등)
+        """
+        self.interval = interval
+        self.mcp_config_path = mcp_config_path
+        self.llm_config_path = llm_config_path
+        self.on_reload = on_reload
+        self.reload_count = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._retiring: Set[asyncio.Task] = set()
+        self.attach(agent, supervisor)
+
+    def attach(self, agent, supervisor=None) -> None:
+        """반영 대상을 바꿉니다 (웹 프론트엔드가 에이전트를 새로 만든 경우). 현재 파일 내용을 기준으로 삼습니다."""
+        self.agent = agent
+        self.supervisor = supervisor
+        self._mcp_configs = _servers_by_name(_read_json(self.mcp_config_path) or {})
+        self._llm_config = _read_json(self.llm_config_path) or {}
+        self._mtimes = self._stat()
+
+    def start(self) -> None:
+        """파일 감시 태스크를 시작합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+            logging.info(f"설정 파일 감시 시작: interval={self.interval:.0f}s")
+
+    async def stop(self) -> None:
+        """감시를 멈추고, 종료를 기다리는 이전 서버 연결을 바로 닫습니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    async def reload(self) -> Dict[str, Any]:
+        """설정 파일을 다시 읽어 바뀐 부분을 반영하고 변경 요약을 반환합니다. 동시에 호출되면 순서대로 처리합니다."""
+        async with self._lock:
+            self._mtimes = self._stat()
+            summary: Dict[str, Any] = {'added': [], 'changed': [], 'removed': [], 'failed': {}, 'llm': False}
+            if self.agent is None:
+                # 에이전트 초기화 전: 초기화가 끝나면 attach()에서 그때의 파일 내용을 기준으로 삼음
+                return summary
+            mcp_config = _read_json(self.mcp_config_path)
+            if mcp_config is not None:
+                await self._reload_servers(_servers_by_name(mcp_config), summary)
+            llm_config = _read_json(self.llm_config_path)
+            if llm_config and _canonical(llm_config) != _canonical(self._llm_config):
+                self._reload_model(llm_config, summary)
+            if any(summary[key] for key in ('added', 'changed', 'removed', 'failed', 'llm')):
+                self.reload_count += 1
+                logging.info(
+                    f"설정 변경 반영: added={summary['added']}, changed={summary['changed']}, "
+                    f"removed={summary['removed']}, failed={list(summary['failed'])}, llm={summary['llm']}"
+                )
+                if self.on_reload:
+                    self.on_reload(summary)
+            return summary
+
+    def _stat(self) -> List[Optional[float]]:
+        mtimes = []
+        for path in (self.mcp_config_path, self.llm_config_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._stat() == self._mtimes:
+                continue
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"설정 변경 반영 실패: {e}", exc_info=True)
+
+    async def _reload_servers(self, new_configs: Dict[str, Dict[str, Any]], summary: Dict[str, Any]) -> None:
+        added, changed, removed = diff_server_configs(self._mcp_configs, new_configs)
+        if not (added or changed or removed):
+            return
+        servers = self.agent.mcp_servers
+        current = {server.name: server for server in servers}
+
+        # 추가/변경된 서버는 병렬로 연결 (도구 스키마 캐시는 설정이 같을 때만 적중)
+        names = added + changed
+        candidates = [create_mcp_server(new_configs[name]) for name in names]
+        results = await asyncio.gather(*(connect_server(server) for server in candidates), return_exceptions=True)
+
+        for name, server, result in zip(names, candidates, results):
+            if isinstance(result, BaseException):
+                logging.error(f"설정 변경 후 MCP 서버 연결 실패, 기존 상태 유지: name={name}, error={result}")
+                summary['failed'][name] = str(result) or type(result).__name__
+                # 실패한 서버는 다음 변경 때 다시 시도하도록 이전 설정을 기준으로 남김
+                if name in self._mcp_configs:
+                    new_configs[name] = self._mcp_configs[name]
+                else:
+                    new_configs.pop(name, None)
+                continue
+            server.touch()
+            old = current.get(name)
+            if old is not None:
+                servers[servers.index(old)] = server
+                self._retire(old)
+                get_tool_result_cache().invalidate_server(name)
+                summary['changed'].append(name)
+            else:
+                servers.append(server)
+                summary['added'].append(name)
+            if self.supervisor:
+                self.supervisor.add(server)
+
+        for name in removed:
+            old = current.get(name)
+            if old is not None:
+                servers.remove(old)
+                self._retire(old)
+            summary['removed'].append(name)
+
+        self._mcp_configs = new_configs
+
+    def _reload_model(self, llm_config: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        try:
+            model = create_agent_model(llm_config)
+        except Exception as e:
+            logging.error(f"새 LLM 설정으로 모델을 만들지 못해 기존 모델을 유지합니다: {e}")
+            summary['failed']['llm'] = str(e)
+            return
+        # 진행 중인 실행은 다음 LLM 호출부터 새 모델을 사용
+        self.agent.model = model
+        self._llm_config = llm_config
+        summary['llm'] = True
+
+    def _retire(self, server) -> None:
+        """목록에서 뺀 서버의 감시를 멈추고, 진행 중인 도구 호출이 끝난 뒤 연결을 닫습니다."""
+        async def _close():
+            if self.supervisor:
+                await self.supervisor.remove(server)
+            waited = 0.0
+            while server.outstanding > 0 and waited < CONFIG_RELOAD_DRAIN_SECONDS:
+                await asyncio.sleep(0.5)
+                waited += 0.5
+            try:
+                await server.cleanup()
+            except Exception as e:
+                logging.warning(f"이전 MCP 서버 종료 중 오류: name={server.name}, error={e}")
+            logging.info(f"설정에서 제거/교체된 MCP 서버 연결을 종료했습니다: name={server.name}")
+
+        task = asyncio.create_task(_close())
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
@@ -0,0 +1,156 @@
+import time
+import asyncio
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Optional
+
+from agents.models.interface import Model
+
+from .config import DEADLINE_WRAP_UP_SECONDS
+
+WRAP_UP_INSTRUCTION = (
+    "\n\n[시간 제한] 응답 시간이 거의 소진되었습니다. 더 이상 도구를 호출하지 말고, "
+    "지금까지 얻은 정보만으로 최선의 답변을 바로 작성하세요."
+)
+
+_current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """요청의 시간 예산이 모두 소진되었을 때 발생하는 예외."""
+
+
+class Deadline:
+    """요청 하나에 주어진 시간 예산 (단조 시계 기준)."""
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    def remaining(self) -> float:
+        """남은 시간(초). 만료되었으면 0."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    @property
+    def wrapping_up(self) -> bool:
+        """남은 시간이 적어 에이전트가 답변을 마무리해야 하는지 여부."""
+        return self.remaining() <= DEADLINE_WRAP_UP_SECONDS
+
+    def timeout(self, default: float, reserve: float = 0.0) -> float:
+        """단계별 타임아웃을 남은 예산에 맞게 줄입니다.
+
+        Args:
+            default: 단계 자체의 기본 타임아웃(초)
+            reserve: 이후 단계를 위해 남겨둘 시간(초)
+        """
+        return max(0.0, min(default, self.remaining() - reserve))
+
+
+def current_deadline() -> Optional[Deadline]:
+    """현재 실행 컨텍스트의 Deadline을 반환합니다. 없으면 None."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget_seconds: float):
+    """블록 안에서 실행되는 LLM/MCP 호출에 Deadline을 전파합니다.
+
+    contextvars를 사용하므로 블록 안에서 생성된 태스크(도구 병렬 호출 등)에도 전달됩니다.
+    """
+    deadline = Deadline(budget_seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class DeadlineAwareModel(Model):
+    """현재 Deadline에 맞춰 LLM 호출 타임아웃을 줄이는 Model 래퍼.
+
+    남은 시간이 DEADLINE_WRAP_UP_SECONDS 이하이면 시스템 프롬프트에 마무리 지시를 덧붙이고
+    도구 목록을 비워 모델이 곧바로 최종 답변을 작성하도록 합니다.
+    """
+
+    def __init__(self, model: Model):
+        self.model = model
+
+    def _prepare(self, system_instructions: Optional[str], tools: list):
+        deadline = current_deadline()
+        if deadline is None:
+            return None, system_instructions, tools
+        if deadline.expired:
+            raise DeadlineExceeded(f"요청 시간 예산({deadline.budget_seconds:.0f}초)을 모두 사용했습니다.")
+        if deadline.wrapping_up:
+            logging.info(f"시간 예산 부족으로 답변 마무리 모드 진입: remaining={deadline.remaining():.1f}s")
+            return deadline, (system_instructions or "") + WRAP_UP_INSTRUCTION, []
+        return deadline, system_instructions, tools
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        deadline, system_instructions, tools = self._prepare(system_instructions, tools)
+        call = self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        )
+        if deadline is None:
+            return await call
+        try:
+            return await asyncio.wait_for(call, timeout=deadline.remaining())
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded("LLM 응답을 기다리는 중 시간 예산을 초과했습니다.") from e
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        deadline, system_instructions, tools = self._prepare(system_instructions, tools)
+        stream = self.model.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        ).__aiter__()
+        while True:
+            try:
+                if deadline is None:
+                    event = await stream.__anext__()
+                else:
+                    event = await _next_within(stream, deadline.remaining())
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError as e:
+                raise DeadlineExceeded("LLM 스트림을 기다리는 중 시간 예산을 초과했습니다.") from e
+            yield event
+
+
+async def _next_within(stream, timeout: float):
+    """스트림의 다음 이벤트를 timeout 안에 받습니다. 시간이 지나면 asyncio.TimeoutError.
+
+    wait_for는 __anext__를 별도 태스크(다른 Context)에서 실행해, 스트림 안에서 contextvars를
+    설정/해제하는 코드(Agents SDK의 tracing span 등)가 "created in a different Context" 오류를 냅니다.
+    그래서 현재 태스크에서 그대로 기다리고 시간이 되면 현재 태스크를 취소합니다.
+    """
+    task = asyncio.current_task()
+    timed_out = False
+
+    def _expire():
+        nonlocal timed_out
+        timed_out = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(timeout, _expire)
+    try:
+        return await stream.__anext__()
+    except asyncio.CancelledError:
+        if not timed_out:
+            raise
+        if hasattr(task, "uncancel"):
+            task.uncancel()
+        raise asyncio.TimeoutError()
+    finally:
+        handle.cancel()
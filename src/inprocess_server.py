@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import asyncio
+import importlib.util
+import logging
+import inspect
+from typing import Any, Callable, Dict, List, Optional
+
+from agents.mcp import MCPServer
+from mcp.server.fastmcp import FastMCP
+from mcp.types import (
+    LATEST_PROTOCOL_VERSION,
+    CallToolResult,
+    EmptyResult,
+    Implementation,
+    InitializeResult,
+    ServerCapabilities,
+    TextContent,
+    Tool as MCPTool,
+)
+
+
+class _InProcessSession:
+    """ManagedMCPServer의 상태 확인(ping)에 응답하는 세션 자리표시자."""
+
+    async def send_ping(self) -> EmptyResult:
+        return EmptyResult()
+
+
+class InProcessMCPServer(MCPServer):
+    """같은 프로세스 안의 FastMCP 서버 도구를 직접 호출하는 MCP 서버.
+
+    신뢰할 수 있는 로컬 Python MCP 서버(예: src/naver_mcp_server.py)를 모듈로 불러와
+    FastMCP 인스턴스의 list_tools/call_tool을 바로 호출합니다. 서브프로세스 실행,
+    JSON-RPC 직렬화, 파이프 왕복이 없어지는 대신 격리가 없습니다: 도구의 예외, 메모리 사용,
+    전역 상태가 봇 프로세스와 공유되고 타임아웃이 나도 실행 중인 도구를 강제로 멈출 수 없습니다.
+    동기 도구는 이벤트 루프를 막지 않도록 모듈의 함수를 기본 스레드 풀에서 직접 실행합니다.
+    """
+
+    def __init__(self, script_path: str, name: str, attr: str = "mcp"):
+        self.script_path = script_path
+        self._name = name
+        self.attr = attr
+        self.app: Optional[FastMCP] = None
+        self._sync_tools: Dict[str, Callable[..., Any]] = {}
+        self.session: Optional[_InProcessSession] = None
+        self.server_initialize_result: Optional[InitializeResult] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        module = await asyncio.to_thread(_load_module, self.script_path)
+        app = getattr(module, self.attr, None)
+        if not isinstance(app, FastMCP):
+            raise TypeError(f"{self.script_path}에 FastMCP 인스턴스 '{self.attr}'가 없습니다.")
+        self.app = app
+        # @mcp.tool()은 원래 함수를 그대로 돌려주므로 모듈에서 같은 이름의 동기 함수를 찾아 둠
+        self._sync_tools = {}
+        for tool in await app.list_tools():
+            fn = getattr(module, tool.name, None)
+            if callable(fn) and getattr(fn, '__name__', None) == tool.name and not inspect.iscoroutinefunction(fn):
+                self._sync_tools[tool.name] = fn
+        self.server_initialize_result = InitializeResult(
+            protocolVersion=LATEST_PROTOCOL_VERSION,
+            capabilities=ServerCapabilities(),
+            serverInfo=Implementation(name=app.name, version=str(getattr(module, "__version__", "inprocess"))),
+        )
+        self.session = _InProcessSession()
+        logging.info(f"MCP 서버를 프로세스 안에 탑재했습니다: name={self.name}, script={self.script_path}")
+
+    async def cleanup(self):
+        # 불러온 모듈은 그대로 두고 연결 상태만 해제
+        self.session = None
+
+    async def list_tools(self) -> List[MCPTool]:
+        if self.app is None:
+            raise ConnectionError("서버가 연결되어 있지 않습니다.")
+        return await self.app.list_tools()
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        if self.app is None or self.session is None:
+            raise ConnectionError("서버가 연결되어 있지 않습니다.")
+        fn = self._sync_tools.get(tool_name)
+        try:
+            if fn is not None:
+                # 동기 도구는 루프를 새로 만들지 않고 함수만 스레드에서 실행
+                return _sync_result_to_call_tool_result(await asyncio.to_thread(fn, **(arguments or {})))
+            results = await self.app.call_tool(tool_name, arguments or {})
+        except Exception as e:
+            # stdio 서버가 도구 예외를 오류 결과로 돌려주는 것과 같게 처리
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+        return _to_call_tool_result(results)
+
+
+def _load_module(script_path: str):
+    """스크립트 경로로 모듈을 불러옵니다. 이미 불러온 경우 그대로 재사용합니다."""
+    module_name = f"_inprocess_{os.path.splitext(os.path.basename(script_path))[0]}"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"모듈을 불러올 수 없습니다: {script_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _to_call_tool_result(results) -> CallToolResult:
+    """FastMCP.call_tool 반환값을 lowlevel 서버와 같은 규칙으로 CallToolResult로 변환합니다."""
+    if isinstance(results, CallToolResult):
+        return results
+    if isinstance(results, tuple) and len(results) == 2:
+        content, structured = results
+        return CallToolResult(content=list(content), structuredContent=structured)
+    if isinstance(results, dict):
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(results, indent=2))],
+            structuredContent=results,
+        )
+    return CallToolResult(content=list(results))
+
+
+def _sync_result_to_call_tool_result(value) -> CallToolResult:
+    """동기 도구 함수의 반환값을 CallToolResult로 변환합니다 (문자열은 그대로, 나머지는 JSON 텍스트)."""
+    if isinstance(value, CallToolResult):
+        return value
+    if isinstance(value, str):
+        return CallToolResult(content=[TextContent(type="text", text=value)])
+    text = json.dumps(value, ensure_ascii=False, indent=2, default=str)
+    structured = value if isinstance(value, dict) else None
+    return CallToolResult(content=[TextContent(type="text", text=text)], structuredContent=structured)
@@ -0,0 +1,53 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .config import (
+    MCP_LATENCY_WINDOW,
+    MCP_LATENCY_MIN_SAMPLES,
+    MCP_TIMEOUT_QUANTILE,
+    MCP_TIMEOUT_MULTIPLIER,
+    MCP_TOOL_CALL_MIN_TIMEOUT,
+)
+
+
+class LatencyTracker:
+    """최근 호출 시간(초)을 모아 분위수와 그에 맞춘 타임아웃을 계산합니다."""
+
+    def __init__(self, window: int = MCP_LATENCY_WINDOW, min_samples: int = MCP_LATENCY_MIN_SAMPLES):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """최근 호출 시간의 분위수(초). 표본이 min_samples보다 적으면 None."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def timeout(self, default: float, quantile: float = MCP_TIMEOUT_QUANTILE,
+                multiplier: float = MCP_TIMEOUT_MULTIPLIER,
+                min_timeout: float = MCP_TOOL_CALL_MIN_TIMEOUT) -> float:
+        """관측된 분위수 x multiplier를 타임아웃으로 씁니다. 표본이 부족하면 default.
+
+        결과는 [min_timeout, default] 범위로 제한되어 기본 타임아웃보다 길어지지 않습니다.
+        타임아웃된 호출은 타임아웃 값으로 기록되므로, 서버가 느려지면 다음 타임아웃이 multiplier배로 늘어납니다.
+        """
+        observed = self.quantile(quantile)
+        if observed is None:
+            return default
+        return max(min_timeout, min(default, observed * multiplier))
+
+    def stats(self) -> Dict[str, Any]:
+        def _ms(q):
+            value = self.quantile(q)
+            return round(value * 1000.0, 1) if value is not None else None
+
+        return {'samples': self.count, 'p50_ms': _ms(0.5), 'p95_ms': _ms(0.95), 'p99_ms': _ms(0.99)}
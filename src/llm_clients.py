@@ -0,0 +1,100 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from .config import (
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP2,
+    LLM_CONNECT_TIMEOUT,
+    LLM_READ_TIMEOUT,
+    LLM_POOL_TIMEOUT,
+)
+
+try:
+    import h2  # noqa: F401 - httpx의 HTTP/2 지원에 필요
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class LLMClientRegistry:
+    """(제공자, base URL)마다 AsyncOpenAI 클라이언트를 하나만 만들어 프로세스 전체에서 공유합니다.
+
+    에이전트를 다시 구성해도(웹 앱의 /api/init 등) 같은 클라이언트와 keep-alive 연결을
+    그대로 쓰므로 재초기화 직후 첫 LLM 호출에서 TCP/TLS 연결을 다시 맺지 않습니다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], AsyncOpenAI] = {}
+        self._http_clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+
+    def get(self, provider: str, base_url: Optional[str], api_key: str) -> AsyncOpenAI:
+        key = (provider, base_url or "")
+        client = self._clients.get(key)
+        if client is not None and client.api_key == api_key:
+            return client
+        if client is not None:
+            # API 키가 바뀐 경우: 이전 클라이언트는 진행 중인 요청이 끝나면 GC가 정리
+            logging.info(f"LLM 클라이언트의 API 키가 바뀌어 새로 만듭니다: provider={provider}")
+        http_client = self._http_clients.get(key) or _create_http_client()
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=_timeout(),
+            http_client=http_client,
+        )
+        self._clients[key] = client
+        self._http_clients[key] = http_client
+        logging.info(
+            f"LLM 클라이언트 생성: provider={provider}, base_url={client.base_url}, "
+            f"http2={LLM_HTTP2 and _HTTP2_AVAILABLE}, max_connections={LLM_HTTP_MAX_CONNECTIONS}"
+        )
+        return client
+
+    def http_client(self, provider: str, base_url: Optional[str]) -> httpx.AsyncClient:
+        """같은 제공자/URL의 LLM 클라이언트와 연결 풀을 공유하는 httpx 클라이언트 (Ollama 전용 API 호출 등)."""
+        key = (provider, base_url or "")
+        if key not in self._http_clients:
+            self._http_clients[key] = _create_http_client()
+        return self._http_clients[key]
+
+    async def aclose(self) -> None:
+        """프로그램 종료 시 모든 연결을 닫습니다."""
+        http_clients = list(self._http_clients.values())
+        self._clients.clear()
+        self._http_clients.clear()
+        for http_client in http_clients:
+            await http_client.aclose()
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_POOL_TIMEOUT)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    if LLM_HTTP2 and not _HTTP2_AVAILABLE:
+        logging.info("h2 패키지가 없어 LLM 클라이언트는 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+    return DefaultAsyncHttpxClient(
+        timeout=_timeout(),
+        http2=LLM_HTTP2 and _HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+_llm_client_registry: Optional[LLMClientRegistry] = None
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """프로세스 공용 LLM 클라이언트 레지스트리."""
+    global _llm_client_registry
+    if _llm_client_registry is None:
+        _llm_client_registry = LLMClientRegistry()
+    return _llm_client_registry
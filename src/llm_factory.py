@@ -1,39 +1,118 @@
+import os
+from typing import Any, Dict, Optional
+
+from agents.models.interface import Model
 from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-from openai import AsyncOpenAI
-from .config import OPENAI_API_KEY
+from .config import OPENAI_API_KEY, CASCADE_COMPLEXITY_THRESHOLD
+from .llm_clients import get_llm_client_registry
+from .llm_router import ModelBackend, RoutedModel
+from .model_cascade import CascadeModel, ModelTier
+from .ollama import OllamaQueuedModel, get_ollama_server
 
 def get_main_model():
     from . import get_llm_factory
     factory = get_llm_factory()
     return factory.get_main_model()
 
+def model_stats(model: Model) -> Optional[Dict[str, Any]]:
+    """DeadlineAwareModel 등 래퍼를 따라가며 라우팅 지표(stats)를 제공하는 모델의 지표를 반환합니다."""
+    while model is not None:
+        if hasattr(model, 'stats'):
+            return model.stats()
+        model = getattr(model, 'model', None)
+    return None
+
+def _costs(entry: dict):
+    """모델 설정의 100만 토큰당 입력/출력 비용(USD). 없으면 0으로 보고 토큰 수만 집계합니다."""
+    return float(entry.get("input_cost_per_1m", 0.0)), float(entry.get("output_cost_per_1m", 0.0))
+
+OLLAMA_DEFAULT_BASE_URL = "http://localhost:11434/v1"
+
 class LLMFactory:
     def __init__(self, config_data: dict):
-        # config_data에서 우선 가져오고, 없으면 openai로 설정
-        self.provider = config_data.get("llm_provider", "openai").lower()
-        
-        self.model_name = config_data.get("model_name", "")
+        # "providers" 목록이 있으면 여러 제공자/모델로 라우팅, 없으면 최상위 설정의 단일 제공자 사용
+        # 예: {"providers": [{"llm_provider": "openai", "model_name": "gpt-4o-mini"},
+        #                    {"llm_provider": "ollama", "model_name": "qwen3:8b", "weight": 0.5}],
+        #      "routing": "ordered", "hedge": false}
+        entries = config_data.get("providers") or [config_data]
 
-        if not self.model_name:
-            raise ValueError("model_name is required")
+        # 여러 제공자를 쓰면 같은 제공자에 재시도하지 않고 바로 다음 제공자로 넘김
+        max_retries = 0 if len(entries) > 1 else None
+        self.backends = [self._create_backend(entry, max_retries) for entry in entries]
+
+        # 단일 제공자 설정과의 호환을 위해 첫 번째 제공자를 대표로 노출
+        first = entries[0]
+        self.provider, self.client = self._create_client(first)
+        self.model_name = first.get("model_name", "")
 
-        # Ollama base URL 설정
-        ollama_base_url = config_data.get("ollama_base_url", "http://localhost:11434/v1")
-
-        if self.provider == "openai":
-            if not OPENAI_API_KEY:
-                raise ValueError("LLM_PROVIDER가 'openai'일 경우 OPENAI_API_KEY를 설정해야 합니다.")
-            self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        elif self.provider == "ollama":
-            self.client = AsyncOpenAI(
-                base_url=ollama_base_url,
-                api_key="ollama"
+        self.routed_model: Optional[RoutedModel] = None
+        if len(self.backends) > 1:
+            self.routed_model = RoutedModel(
+                self.backends,
+                strategy=config_data.get("routing", "ordered"),
+                hedge=bool(config_data.get("hedge", False)),
             )
+
+        # "cascade"가 있으면 간단한 요청은 작은 모델, 복잡한 요청은 위 설정의 모델(큰 모델)로 보냄
+        # 예: {"cascade": {"small": {"llm_provider": "openai", "model_name": "gpt-4.1-nano",
+        #                            "input_cost_per_1m": 0.1, "output_cost_per_1m": 0.4},
+        #                  "mode": "classifier", "threshold": 0.5},
+        #      "input_cost_per_1m": 2.0, "output_cost_per_1m": 8.0}
+        self.cascade_model: Optional[CascadeModel] = None
+        cascade = config_data.get("cascade")
+        if cascade:
+            small = self._create_backend(cascade["small"])
+            large_model = self.routed_model or self.backends[0].model
+            self.cascade_model = CascadeModel(
+                ModelTier("small", small.model, *_costs(cascade["small"])),
+                ModelTier("large", large_model, *_costs(config_data)),
+                mode=cascade.get("mode", "classifier"),
+                threshold=float(cascade.get("threshold", CASCADE_COMPLEXITY_THRESHOLD)),
+            )
+
+    def _create_client(self, entry: dict):
+        # config_data에서 우선 가져오고, 없으면 openai로 설정
+        provider = entry.get("llm_provider", "openai").lower()
+
+        # 클라이언트(연결 풀)는 프로세스 공용 레지스트리에서 가져와 재구성 시에도 재사용
+        registry = get_llm_client_registry()
+        if provider == "openai":
+            # base_url/api_key_env를 주면 OpenAI 호환 엔드포인트(vLLM, 다른 클라우드 등)에 연결
+            key_env = entry.get("api_key_env")
+            api_key = os.getenv(key_env, "") if key_env else OPENAI_API_KEY
+            if not api_key:
+                raise ValueError(f"LLM_PROVIDER가 'openai'일 경우 {key_env or 'OPENAI_API_KEY'}를 설정해야 합니다.")
+            return provider, registry.get("openai", entry.get("base_url"), api_key)
+        elif provider == "ollama":
+            # Ollama base URL 설정
+            ollama_base_url = entry.get("ollama_base_url", OLLAMA_DEFAULT_BASE_URL)
+            return provider, registry.get("ollama", ollama_base_url, "ollama")
         else:
-            raise ValueError(f"지원하지 않는 LLM_PROVIDER입니다: {self.provider}")
+            raise ValueError(f"지원하지 않는 LLM_PROVIDER입니다: {provider}")
+
+    def _create_backend(self, entry: dict, max_retries: Optional[int] = None) -> ModelBackend:
+        model_name = entry.get("model_name", "")
+        if not model_name:
+            raise ValueError("model_name is required")
+        provider, client = self._create_client(entry)
+        if max_retries is not None:
+            # with_options는 같은 HTTP 연결 풀을 공유하는 복사본을 만듦
+            client = client.with_options(max_retries=max_retries)
+        name = entry.get("name") or f"{provider}/{model_name}"
+        model = self._create_model_instance(model_name, client)
+        if provider == "ollama":
+            # 로컬 서버의 병렬 처리 수에 맞춘 대기열을 거치고, 모델을 메모리에 상주시킴
+            server = get_ollama_server(entry.get("ollama_base_url", OLLAMA_DEFAULT_BASE_URL),
+                                       entry.get("ollama_num_parallel"))
+            model = OllamaQueuedModel(model, server, model_name, bool(entry.get("ollama_keep_warm", True)))
+        return ModelBackend(name, model, float(entry.get("weight", 1.0)))
 
-    def _create_model_instance(self, model_name):
-        return OpenAIChatCompletionsModel(model=model_name, openai_client=self.client)
+    def _create_model_instance(self, model_name, client=None):
+        return OpenAIChatCompletionsModel(model=model_name, openai_client=client or self.client)
 
     def get_model(self):
-        return self._create_model_instance(self.model_name)
+        if self.cascade_model is not None:
+            return self.cascade_model
+        if self.routed_model is not None:
+            return self.routed_model
+        return self.backends[0].model
@@ -0,0 +1,249 @@
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import openai
+from agents.models.interface import Model
+
+from .latency_tracker import LatencyTracker
+from .config import (
+    LLM_LATENCY_WINDOW,
+    LLM_LATENCY_MIN_SAMPLES,
+    LLM_ERROR_WINDOW,
+    LLM_DEFAULT_TTFT,
+    LLM_COOLDOWN_BASE,
+    LLM_COOLDOWN_MAX,
+    LLM_HEDGE_QUANTILE,
+    LLM_HEDGE_MAX_RATIO,
+)
+
+ROUTING_STRATEGIES = ("ordered", "weighted")
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """다른 제공자로 다시 시도할 만한 오류인지 판단합니다.
+
+    연결 오류, 타임아웃, 요청 한도 초과, 5xx, 모델 없음(404)은 제공자 쪽 문제로 보고 넘깁니다.
+    400 등 요청 자체의 문제는 다른 제공자에서도 실패하므로 그대로 전달합니다.
+    """
+    if isinstance(error, (openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (404, 408, 409, 429) or error.status_code >= 500
+    return False
+
+
+class ModelBackend:
+    """라우팅 대상 제공자/모델 하나와 그 상태(TTFT, 오류율, 제외 시간)."""
+
+    def __init__(self, name: str, model: Model, weight: float = 1.0):
+        self.name = name
+        self.model = model
+        self.weight = weight
+        self.ttft = LatencyTracker(LLM_LATENCY_WINDOW, LLM_LATENCY_MIN_SAMPLES)
+        self._outcomes: Deque[bool] = deque(maxlen=LLM_ERROR_WINDOW)  # True = 실패
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def score(self) -> float:
+        """높을수록 좋은 제공자: 가중치 x 성공률 / 예상 TTFT."""
+        ttft = self.ttft.quantile(0.5) or LLM_DEFAULT_TTFT
+        return self.weight * (1.0 - self.error_rate) / max(ttft, 1e-3)
+
+    def record_success(self, ttft: float) -> None:
+        self.ttft.record(ttft)
+        self._outcomes.append(False)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record_failure(self, error: BaseException) -> None:
+        self._outcomes.append(True)
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        cooldown = min(LLM_COOLDOWN_MAX, LLM_COOLDOWN_BASE * 2 ** (self.consecutive_failures - 1))
+        self.cooldown_until = time.monotonic() + cooldown
+        logging.warning(f"LLM 제공자 호출 실패, {cooldown:.0f}초 동안 배정 제외: {self.name} ({self.last_error})")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'requests': self.requests,
+            'weight': self.weight,
+            'error_rate': round(self.error_rate, 3),
+            'available': self.available,
+            'ttft': self.ttft.stats(),
+            'last_error': self.last_error,
+        }
+        if hasattr(self.model, 'stats'):
+            # 로컬 추론 서버 대기열 등 모델 래퍼의 지표
+            stats['model'] = self.model.stats()
+        return stats
+
+
+class RoutedModel(Model):
+    """여러 LLM 제공자/모델 중 상태가 좋은 쪽으로 요청을 보내는 Model.
+
+    - ordered: 설정 순서대로 우선하며 실패해 제외된 제공자는 건너뜀
+    - weighted: 가중치 x 성공률 / TTFT 중앙값에 비례해 무작위로 배정
+
+    제공자 쪽 오류(is_failover_error)가 나면 다음 후보로 다시 요청합니다. 스트리밍은 첫 이벤트를
+    받기 전까지만 넘길 수 있습니다. hedge가 켜져 있으면 비스트리밍 호출이 첫 후보의 p95 TTFT 안에
+    끝나지 않을 때 두 번째 후보에도 요청하고 먼저 온 응답을 씁니다 (전체의 LLM_HEDGE_MAX_RATIO 이하).
+    """
+
+    def __init__(self, backends: List[ModelBackend], strategy: str = "ordered", hedge: bool = False):
+        if not backends:
+            raise ValueError("providers 목록이 비어 있습니다.")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"지원하지 않는 routing 방식입니다: {strategy} (가능: {', '.join(ROUTING_STRATEGIES)})")
+        self.backends = backends
+        self.strategy = strategy
+        self.hedge = hedge
+        self.failover_count = 0
+        self.hedge_eligible_count = 0
+        self.hedged_count = 0
+        self.hedge_wins = 0
+
+    def candidates(self) -> List[ModelBackend]:
+        """이번 요청에 시도할 제공자 순서. 제외 중인 제공자는 마지막 수단으로 맨 뒤에 둡니다."""
+        available = [b for b in self.backends if b.available]
+        cooling = sorted((b for b in self.backends if not b.available), key=lambda b: b.cooldown_until)
+        if self.strategy == "weighted" and len(available) > 1:
+            scores = [b.score() for b in available]
+            first = random.choices(available, weights=scores)[0] if sum(scores) > 0 else available[0]
+            rest = sorted((b for b in available if b is not first), key=lambda b: b.score(), reverse=True)
+            available = [first] + rest
+        return available + cooling
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'strategy': self.strategy,
+            'failovers': self.failover_count,
+            'hedged': self.hedged_count,
+            'hedge_wins': self.hedge_wins,
+            'providers': {b.name: b.stats() for b in self.backends},
+        }
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        def _call(backend: ModelBackend):
+            return backend.model.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            )
+
+        candidates = self.candidates()
+        error: Optional[BaseException] = None
+        i = 0
+        while i < len(candidates):
+            if i > 0:
+                self.failover_count += 1
+                logging.info(f"LLM 제공자 전환: {candidates[i - 1].name} -> {candidates[i].name}")
+            try:
+                if self.hedge and i == 0 and len(candidates) > 1:
+                    return await self._hedged_response(candidates[0], candidates[1], _call)
+                return await self._timed(candidates[i], _call(candidates[i]))
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                error = e
+            # 헤징에서 두 번째 후보까지 시도했다면 세 번째부터 이어서 시도
+            i += 2 if self.hedge and i == 0 and len(candidates) > 1 else 1
+        raise error
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        candidates = self.candidates()
+        for i, backend in enumerate(candidates):
+            if i > 0:
+                self.failover_count += 1
+                logging.info(f"LLM 제공자 전환(스트림): {candidates[i - 1].name} -> {backend.name}")
+            backend.requests += 1
+            start_time = time.perf_counter()
+            stream = backend.model.stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            ).__aiter__()
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                backend.record_success(time.perf_counter() - start_time)
+                return
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                backend.record_failure(e)
+                if i == len(candidates) - 1:
+                    raise
+                continue
+            backend.record_success(time.perf_counter() - start_time)
+            yield first
+            # 첫 이벤트 이후의 오류는 이미 일부를 전달했으므로 넘기지 않고 그대로 전달
+            async for event in stream:
+                yield event
+            return
+
+    async def _timed(self, backend: ModelBackend, call):
+        backend.requests += 1
+        start_time = time.perf_counter()
+        try:
+            response = await call
+        except Exception as e:
+            if is_failover_error(e):
+                backend.record_failure(e)
+            raise
+        # 비스트리밍 응답은 첫 토큰 시간을 알 수 없으므로 전체 응답 시간을 TTFT로 기록
+        backend.record_success(time.perf_counter() - start_time)
+        return response
+
+    async def _hedged_response(self, primary: ModelBackend, backup: ModelBackend, call):
+        self.hedge_eligible_count += 1
+        start_time = time.perf_counter()
+        first = asyncio.create_task(self._timed(primary, call(primary)))
+        tasks = {first: primary}
+        try:
+            hedge_delay = primary.ttft.quantile(LLM_HEDGE_QUANTILE)
+            if hedge_delay is not None and self.hedged_count < self.hedge_eligible_count * LLM_HEDGE_MAX_RATIO:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done and backup.available:
+                    self.hedged_count += 1
+                    tasks[asyncio.create_task(self._timed(backup, call(backup)))] = backup
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        if not is_failover_error(error):
+                            raise error
+                        continue
+                    if task is not first:
+                        self.hedge_wins += 1
+                    return task.result()
+            if len(tasks) == 1:
+                # 헤징하지 않았으면 두 번째 후보로 일반 전환
+                self.failover_count += 1
+                return await self._timed(backup, call(backup))
+            raise error
+        finally:
+            if not first.done():
+                # 취소된 느린 요청도 최소 이만큼 걸렸다고 기록해야 분위수가 낮아지지 않음
+                primary.ttft.record(time.perf_counter() - start_time)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,571 @@
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+from agents.mcp import MCPServer
+from mcp.types import CallToolResult, TextContent, Tool as MCPTool
+
+from .deadline import current_deadline
+from .tool_result_cache import get_tool_result_cache
+from .run_metrics import current_run
+from .latency_tracker import LatencyTracker
+from .config import (
+    MCP_TOOL_CALL_TIMEOUT,
+    MCP_HEDGE_QUANTILE,
+    MCP_HEDGE_MAX_RATIO,
+    DEADLINE_FINAL_ANSWER_RESERVE_SECONDS,
+)
+
+
+def tool_error_result(message: str) -> CallToolResult:
+    """에이전트에게 돌려줄 도구 오류 결과를 만듭니다."""
+    return CallToolResult(content=[TextContent(type="text", text=message)], isError=True)
+
+
+class ToolCallNotSent(ConnectionError):
+    """도구 호출 요청을 서버에 보내기 전에 연결 오류가 난 경우.
+
+    요청이 서버에 도달하지 않았으므로 다른 연결(복제본)로 다시 보내도 도구가 두 번 실행되지 않습니다.
+    """
+
+
+class _LifecycleMixin:
+    """연결 시점과 호출 경로를 조절하는 공통 기능 (캐시된 스키마로 바로 시작, 지연 시작,
+    유휴 종료, 도구 결과 캐시).
+
+    use_cached_tools()로 도구 목록을 넣어두면 연결 전에도 list_tools()가 캐시를 돌려주고,
+    start_connect()로 시작한 연결은 도구 호출 시점에 기다립니다.
+    enable_lazy()를 호출한 서버는 첫 도구 호출 때 연결(프로세스 실행)하고, idle_timeout 동안
+    호출이 없으면 연결을 닫습니다. 유휴 상태로 닫힌 서버는 MCPSupervisor의 감시 대상에서 빠집니다.
+    tool_cache_ttls에 있는 도구는 공용 ToolResultCache를 거쳐 호출됩니다.
+    """
+
+    cached_tools: Optional[List[MCPTool]] = None
+    schema_from_cache = False  # 디스크 캐시의 스키마로 시작했는지 여부
+    _connecting: Optional[asyncio.Task] = None
+    # 지연 시작 (lazy) 설정 및 지표
+    lazy = False
+    idle_timeout = 0.0
+    spawn_timeout = 0.0
+    spawn_count = 0
+    last_spawn_ms: Optional[float] = None
+    last_used = 0.0
+    on_spawn: Optional[Callable[[asyncio.Task], None]] = None  # 지연 시작 연결 태스크를 받는 콜백
+    _sleeping = False
+    records_run_metrics = True  # 실행 기록에 도구 호출을 남길지 여부 (복제본은 풀에서 한 번만 기록)
+    _idle_task: Optional[asyncio.Task] = None
+    _lifecycle_lock: Optional[asyncio.Lock] = None
+    # 결과를 캐시할 도구 이름 -> TTL(초)
+    tool_cache_ttls: Dict[str, float] = {}
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        record = current_run() if self.records_run_metrics else None
+        start_time = time.perf_counter()
+        result = None
+        try:
+            ttl = self.tool_cache_ttls.get(tool_name)
+            if ttl:
+                result = await get_tool_result_cache().get_or_call(
+                    self.name, tool_name, arguments, ttl, lambda: self._call_tool(tool_name, arguments)
+                )
+            else:
+                result = await self._call_tool(tool_name, arguments)
+            return result
+        finally:
+            if record is not None:
+                output_bytes = len(result.model_dump_json()) if result is not None else 0
+                record.record_tool_call(self.name, tool_name, time.perf_counter() - start_time,
+                                        output_bytes, result is None or result.isError)
+
+    def use_cached_tools(self, tools: List[MCPTool], from_cache: bool = True):
+        self.cached_tools = list(tools)
+        self.tool_count = len(tools)
+        self.schema_from_cache = from_cache
+
+    @property
+    def connection_started(self) -> bool:
+        """연결되었거나 백그라운드 연결이 시작된 상태인지 여부."""
+        return self.server_connected or (self._connecting is not None and not self._connecting.done())
+
+    def start_connect(self, timeout: float) -> asyncio.Task:
+        """연결을 백그라운드에서 시작합니다. 실패하면 비정상으로 표시되어 MCPSupervisor가 재연결합니다."""
+        if self._connecting is None or self._connecting.done():
+            self._connecting = asyncio.create_task(asyncio.wait_for(self.connect(), timeout=timeout))
+            self._connecting.add_done_callback(self._on_connect_done)
+        return self._connecting
+
+    def _on_connect_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logging.warning(f"MCP 서버 백그라운드 연결 실패: name={self.name}, error={str(error) or type(error).__name__}")
+        for member in self.members():
+            member.healthy = False
+            member.last_error = member.last_error or str(error) or type(error).__name__
+
+    async def wait_connected(self):
+        """백그라운드 연결이 진행 중이면 끝날 때까지 기다립니다."""
+        if self._connecting is not None and not self._connecting.done():
+            await asyncio.shield(self._connecting)
+
+    async def _cancel_connecting(self):
+        if self._connecting is not None and not self._connecting.done():
+            self._connecting.cancel()
+            await asyncio.gather(self._connecting, return_exceptions=True)
+
+    def _serve_cached_tools(self) -> bool:
+        return self.cached_tools is not None and not self.server_connected
+
+    def enable_lazy(self, idle_timeout: float, spawn_timeout: float):
+        self.lazy = True
+        self.idle_timeout = idle_timeout
+        self.spawn_timeout = spawn_timeout
+        self._lifecycle_lock = asyncio.Lock()
+
+    @property
+    def dormant(self) -> bool:
+        """지연 시작 서버가 아직 시작되지 않았거나 유휴 상태로 종료된 상태인지 여부."""
+        return self.lazy and (self._sleeping or not self.connection_started)
+
+    def lazy_stats(self) -> Dict[str, Any]:
+        if not self.lazy:
+            return {}
+        return {
+            'lazy': True,
+            'dormant': self.dormant,
+            'spawn_count': self.spawn_count,
+            'last_spawn_ms': round(self.last_spawn_ms, 1) if self.last_spawn_ms is not None else None,
+        }
+
+    async def ensure_connected(self):
+        """도구 호출 전에 연결을 준비합니다. 지연 시작 서버는 여기서 연결(프로세스 실행)합니다."""
+        if not self.lazy:
+            await self.wait_connected()
+            return
+        self.last_used = time.monotonic()
+        async with self._lifecycle_lock:
+            # 유휴 종료와 겹치지 않도록 잠금 안에서 시작 여부 결정
+            spawning = not self.connection_started
+            if spawning:
+                start_time = time.perf_counter()
+                self._sleeping = False
+                connecting = self.start_connect(self.spawn_timeout)
+                if self.on_spawn:
+                    self.on_spawn(connecting)
+        await self.wait_connected()
+        if spawning:
+            self.spawn_count += 1
+            self.last_spawn_ms = (time.perf_counter() - start_time) * 1000.0
+            logging.info(f"지연 시작 MCP 서버 실행: name={self.name}, spawn_ms={self.last_spawn_ms:.1f}, count={self.spawn_count}")
+        self.touch()
+
+    def touch(self):
+        """마지막 사용 시각을 갱신하고, 지연 시작 서버면 유휴 종료 감시를 시작합니다."""
+        self.last_used = time.monotonic()
+        if self.lazy and self.server_connected and (self._idle_task is None or self._idle_task.done()):
+            self._idle_task = asyncio.create_task(self._shutdown_when_idle())
+
+    async def _shutdown_when_idle(self):
+        while True:
+            idle_for = time.monotonic() - self.last_used
+            if idle_for < self.idle_timeout or self.outstanding > 0:
+                await asyncio.sleep(max(self.idle_timeout - idle_for, 1.0))
+                continue
+            async with self._lifecycle_lock:
+                # 잠금을 기다리는 동안 새 호출이 들어왔으면 다시 대기
+                if time.monotonic() - self.last_used < self.idle_timeout or self.outstanding > 0:
+                    continue
+                logging.info(f"유휴 MCP 서버 종료: name={self.name}, idle={idle_for:.0f}s")
+                self._sleeping = True
+                self._idle_task = None
+                await self.cleanup()
+                return
+
+    async def _cancel_idle_task(self):
+        task = self._idle_task
+        if task is not None and task is not asyncio.current_task():
+            self._idle_task = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class ManagedMCPServer(_LifecycleMixin, MCPServer):
+    """MCPServerStdio/MCPServerStreamableHttp를 감싸 호출 정책을 적용하는 래퍼.
+
+    Agent는 이 래퍼를 일반 MCP 서버처럼 사용하고, 실제 연결은 내부 server가 담당합니다.
+    내부 server는 server_factory로 다시 만들 수 있어 재연결 시 Agent를 건드리지 않고 교체됩니다.
+    도구 호출 타임아웃은 서버의 관측 지연(LatencyTracker)에서 정하고, 현재 요청의 Deadline에
+    맞춰 다시 줄어듭니다. 최종 답변을 작성할
+    시간(DEADLINE_FINAL_ANSWER_RESERVE_SECONDS)은 남겨두고, 예산이 부족하면 도구를 실행하지
+    않고 오류 결과를 돌려주어 에이전트가 가진 정보로 답변을 마무리하도록 합니다.
+    """
+
+    def __init__(self, server_factory: Callable[[], MCPServer], name: str,
+                 config: Optional[Dict[str, Any]] = None,
+                 tool_call_timeout: float = MCP_TOOL_CALL_TIMEOUT):
+        self.server_factory = server_factory
+        self.server = server_factory()
+        self._name = name
+        self.config = config or {}
+        self.tool_call_timeout = tool_call_timeout
+        self.startup_ms: Optional[float] = None  # 연결 + 도구 목록 조회 소요 시간
+        self.tool_count = 0
+        self._owner: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        # 연결 상태 지표 (MCPSupervisor가 사용)
+        self.connected_at: Optional[float] = None
+        self.reconnect_count = 0
+        self.last_error: Optional[str] = None
+        self.failure_event = asyncio.Event()
+        self.healthy = True
+        self.outstanding = 0  # 진행 중인 도구 호출 수
+        self.latency = LatencyTracker()  # 도구 호출 시간 (복제본 풀에서는 풀 전체가 공유)
+        self._server_used = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        """연결을 전담하는 소유 태스크를 띄우고 연결이 끝날 때까지 기다립니다.
+
+        MCP 클라이언트는 anyio 취소 범위를 사용하므로 연결과 정리가 같은 태스크에서
+        일어나야 합니다. 소유 태스크가 연결부터 정리까지 맡기 때문에 여러 서버를
+        asyncio.gather로 병렬 연결한 뒤 다른 태스크에서 cleanup()을 호출해도 안전합니다.
+        """
+        if self._server_used:
+            # 닫힌 내부 서버는 다시 쓰지 않고 새로 만듦 (유휴 종료 후 재시작 등)
+            self.server = self.server_factory()
+        self._server_used = True
+        self._owner, self._stop = await self._open(self.server)
+        self._mark_connected()
+
+    async def reconnect(self):
+        """새 내부 서버를 연결한 뒤 기존 연결과 교체합니다.
+
+        Agent는 이 래퍼를 그대로 참조하므로 Agent를 다시 만들 필요가 없습니다.
+        새 연결에 실패하면 예외를 발생시키고 기존 연결은 그대로 둡니다.
+        """
+        new_server = self.server_factory()
+        owner, stop = await self._open(new_server)
+        old_owner, old_stop = self._owner, self._stop
+        self.server, self._owner, self._stop = new_server, owner, stop
+        self.reconnect_count += 1
+        self._mark_connected()
+        if old_owner is not None:
+            await self._close(old_owner, old_stop, connected=True)
+
+    def _mark_connected(self):
+        self.connected_at = time.monotonic()
+        self.last_error = None
+        self.healthy = True
+        self.failure_event.clear()
+
+    async def _open(self, server: MCPServer):
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+        owner = asyncio.create_task(self._own_connection(server, ready, stop))
+        try:
+            await asyncio.shield(ready)
+        except asyncio.CancelledError:
+            await self._close(owner, stop, connected=False)
+            raise
+        return owner, stop
+
+    @staticmethod
+    async def _own_connection(server: MCPServer, ready: asyncio.Future, stop: asyncio.Event):
+        try:
+            await server.connect()
+        except BaseException as e:
+            await server.cleanup()
+            if not ready.done():
+                if isinstance(e, Exception):
+                    ready.set_exception(e)
+                else:
+                    ready.cancel()
+            return
+        ready.set_result(None)
+        try:
+            await stop.wait()
+        finally:
+            await server.cleanup()
+
+    @staticmethod
+    async def _close(owner: asyncio.Task, stop: asyncio.Event, connected: bool):
+        stop.set()
+        if not owner.done() and not connected:
+            # 아직 연결 중이면 연결 시도를 취소
+            owner.cancel()
+        try:
+            await owner
+        except BaseException:
+            pass
+
+    async def cleanup(self):
+        await self._cancel_idle_task()
+        await self._cancel_connecting()
+        owner = self._owner
+        if owner is None:
+            return
+        self._owner = None
+        self.connected_at = None
+        await self._close(owner, self._stop, connected=self.server_connected)
+
+    @property
+    def server_connected(self) -> bool:
+        """내부 서버 세션이 열려 있는지 여부."""
+        return getattr(self.server, 'session', None) is not None
+
+    @property
+    def uptime(self) -> float:
+        """현재 연결이 유지된 시간(초). 연결되지 않았으면 0."""
+        return time.monotonic() - self.connected_at if self.connected_at else 0.0
+
+    def health_stats(self) -> Dict[str, Any]:
+        """연결 상태 지표 (uptime, 재연결 횟수 등)."""
+        return {
+            'healthy': self.healthy,
+            'uptime_seconds': round(self.uptime, 1),
+            'reconnect_count': self.reconnect_count,
+            'outstanding': self.outstanding,
+            'last_error': self.last_error,
+            'latency': self.latency.stats(),
+            'tool_call_timeout': round(self.latency.timeout(self.tool_call_timeout), 1),
+            **self.lazy_stats(),
+        }
+
+    def members(self) -> List["ManagedMCPServer"]:
+        """감시 대상이 되는 개별 연결 목록."""
+        return [self]
+
+    async def ping(self, timeout: float):
+        """서버 세션에 ping을 보내 살아 있는지 확인합니다. 실패하면 예외가 발생합니다."""
+        session = getattr(self.server, 'session', None)
+        if session is None:
+            raise ConnectionError("서버가 연결되어 있지 않습니다.")
+        await asyncio.wait_for(session.send_ping(), timeout=timeout)
+
+    @property
+    def server_version(self) -> Optional[str]:
+        result = getattr(self.server, 'server_initialize_result', None)
+        return result.serverInfo.version if result else None
+
+    async def list_tools(self) -> List[MCPTool]:
+        if self._serve_cached_tools():
+            return list(self.cached_tools)
+        return await self.server.list_tools()
+
+    async def _call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        # 이 서버의 관측 지연(p99 x 배수)에 맞춘 타임아웃, 표본이 부족하면 기본값
+        timeout = self.latency.timeout(self.tool_call_timeout)
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.timeout(timeout, reserve=DEADLINE_FINAL_ANSWER_RESERVE_SECONDS)
+            if timeout <= 0:
+                logging.warning(f"시간 예산 부족으로 도구 호출 생략: server={self.name}, tool={tool_name}")
+                return tool_error_result("시간 예산이 부족해 도구를 호출하지 않았습니다. 지금까지의 정보로 답변하세요.")
+
+        start_time = None
+
+        async def _call():
+            nonlocal start_time
+            try:
+                await self.ensure_connected()
+            except Exception as e:
+                raise ToolCallNotSent(f"서버에 연결하지 못했습니다: {e}") from e
+            if not self.server_connected:
+                raise ToolCallNotSent("서버가 연결되어 있지 않습니다.")
+            # 지연 시작 서버의 기동 시간은 도구 지연에 넣지 않음
+            start_time = time.perf_counter()
+            try:
+                return await self.server.call_tool(tool_name, arguments)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError) as e:
+                # 요청을 쓰려는 전송 스트림이 이미 닫혀 있음: 요청이 서버에 가지 않음
+                raise ToolCallNotSent(f"전송 스트림이 닫혀 있습니다: {type(e).__name__}") from e
+
+        self.outstanding += 1
+        try:
+            result = await asyncio.wait_for(_call(), timeout=timeout)
+            self.latency.record(time.perf_counter() - start_time)
+            return result
+        except asyncio.TimeoutError:
+            if start_time is not None:
+                # 타임아웃도 표본으로 남겨야 서버가 느려졌을 때 타임아웃이 다시 늘어남
+                self.latency.record(timeout)
+            logging.warning(f"도구 호출 타임아웃: server={self.name}, tool={tool_name}, timeout={timeout:.1f}s")
+            return tool_error_result(f"도구 호출이 {timeout:.0f}초 안에 끝나지 않았습니다. 지금까지의 정보로 답변하세요.")
+        except Exception as e:
+            # 연결이 끊겼을 수 있으므로 감독자가 바로 상태를 확인하도록 알림
+            self.last_error = str(e)
+            self.failure_event.set()
+            raise
+        finally:
+            self.outstanding -= 1
+            self.last_used = time.monotonic()
+
+
+class MCPReplicaPool(_LifecycleMixin, MCPServer):
+    """같은 MCP 서버를 여러 개 띄워 도구 호출을 분산하는 복제본 풀.
+
+    stdio 서버는 하나의 프로세스와 파이프로 모든 호출을 처리하므로, 동시에 실행되는
+    에이전트들의 도구 호출이 한 프로세스에 몰립니다. 풀은 호출마다 진행 중인 호출이 가장
+    적은(least outstanding requests) 정상 복제본을 고르고, 비정상 복제본은 MCPSupervisor가
+    재연결할 때까지 배정 대상에서 제외합니다.
+    hedge_tools에 있는 (멱등) 도구는 p95 지연이 지나도 응답이 없으면 다른 복제본에 같은 요청을
+    한 번 더 보내고 먼저 끝난 결과를 씁니다.
+    """
+
+    def __init__(self, replicas: List[ManagedMCPServer], name: str,
+                 config: Optional[Dict[str, Any]] = None):
+        self.replicas = replicas
+        self._name = name
+        self.config = config or {}
+        self.startup_ms: Optional[float] = None
+        self.tool_count = 0
+        self.hedge_tools = set(self.config.get('hedge_tools', []))
+        self.hedge_eligible_count = 0
+        self.hedged_count = 0
+        self.hedge_wins = 0  # 나중에 보낸 요청이 먼저 끝난 횟수
+        # 복제본은 같은 서버이므로 지연 기록을 공유
+        self.latency = LatencyTracker()
+        for replica in replicas:
+            replica.latency = self.latency
+            replica.records_run_metrics = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def server_connected(self) -> bool:
+        return any(replica.server_connected for replica in self.replicas)
+
+    def members(self) -> List[ManagedMCPServer]:
+        return list(self.replicas)
+
+    @property
+    def outstanding(self) -> int:
+        return sum(replica.outstanding for replica in self.replicas)
+
+    def health_stats(self) -> Dict[str, Any]:
+        replica_stats = [replica.health_stats() for replica in self.replicas]
+        return {
+            'healthy': any(r['healthy'] for r in replica_stats),
+            'uptime_seconds': max((r['uptime_seconds'] for r in replica_stats), default=0.0),
+            'reconnect_count': sum(r['reconnect_count'] for r in replica_stats),
+            'outstanding': sum(r['outstanding'] for r in replica_stats),
+            'last_error': next((r['last_error'] for r in replica_stats if r['last_error']), None),
+            'replicas': len(self.replicas),
+            'healthy_replicas': sum(1 for r in replica_stats if r['healthy']),
+            'latency': self.latency.stats(),
+            'tool_call_timeout': replica_stats[0]['tool_call_timeout'] if replica_stats else None,
+            'hedged_count': self.hedged_count,
+            'hedge_wins': self.hedge_wins,
+            **self.lazy_stats(),
+        }
+
+    async def connect(self):
+        """모든 복제본을 병렬로 연결합니다. 하나라도 연결되면 성공으로 봅니다.
+
+        연결에 실패한 복제본은 비정상으로 표시되어 MCPSupervisor가 재연결을 시도합니다.
+        """
+        results = await asyncio.gather(
+            *(replica.connect() for replica in self.replicas), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for replica, result in zip(self.replicas, results):
+            if isinstance(result, BaseException):
+                replica.healthy = False
+                replica.last_error = str(result) or type(result).__name__
+        if len(errors) == len(self.replicas):
+            raise errors[0]
+        if errors:
+            logging.warning(f"MCP 복제본 일부 연결 실패: name={self.name}, {len(errors)}/{len(self.replicas)}개 실패")
+
+    async def cleanup(self):
+        await self._cancel_idle_task()
+        await self._cancel_connecting()
+        await asyncio.gather(*(replica.cleanup() for replica in self.replicas))
+
+    async def ping(self, timeout: float):
+        await self._pick().ping(timeout)
+
+    @property
+    def server_version(self) -> Optional[str]:
+        return next((r.server_version for r in self.replicas if r.server_connected), None)
+
+    async def list_tools(self) -> List[MCPTool]:
+        if self._serve_cached_tools():
+            return list(self.cached_tools)
+        return await self._pick().list_tools()
+
+    def _pick(self, exclude: Optional[ManagedMCPServer] = None) -> ManagedMCPServer:
+        """진행 중인 호출이 가장 적은 정상 복제본을 고릅니다."""
+        candidates = [r for r in self.replicas if r is not exclude and r.healthy and r.server_connected]
+        if not candidates:
+            # 정상 복제본이 없으면 연결된 아무 복제본이라도 사용
+            candidates = [r for r in self.replicas if r is not exclude and r.server_connected] or self.replicas
+        return min(candidates, key=lambda r: r.outstanding)
+
+    async def _call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        await self.ensure_connected()
+        replica = self._pick()
+        if tool_name in self.hedge_tools:
+            return await self._hedged_call(replica, tool_name, arguments)
+        try:
+            return await replica.call_tool(tool_name, arguments)
+        except ToolCallNotSent:
+            # 요청을 보내기 전에 연결 오류가 난 복제본은 배정에서 제외하고 다른 복제본으로 한 번 재시도.
+            # 보낸 뒤의 오류(McpError, 도구 실패 등)는 도구가 이미 실행됐을 수 있으므로 다시 보내지 않고 전달
+            replica.healthy = False
+            if len(self.replicas) < 2:
+                raise
+            return await self._pick(exclude=replica).call_tool(tool_name, arguments)
+
+    async def _hedged_call(self, replica: ManagedMCPServer, tool_name: str,
+                           arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        """p95 지연 안에 끝나지 않으면 다른 복제본에 같은 요청을 보내고 먼저 성공한 결과를 씁니다.
+
+        추가 요청은 전체 호출의 MCP_HEDGE_MAX_RATIO 이하로 제한합니다.
+        """
+        self.hedge_eligible_count += 1
+        start_time = time.perf_counter()
+        primary = asyncio.create_task(replica.call_tool(tool_name, arguments))
+        tasks = {primary: replica}
+        try:
+            hedge_delay = self.latency.quantile(MCP_HEDGE_QUANTILE)
+            if hedge_delay is not None and self.hedged_count < self.hedge_eligible_count * MCP_HEDGE_MAX_RATIO:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                backup = self._pick(exclude=replica)
+                if not done and backup is not replica and backup.healthy and backup.server_connected:
+                    self.hedged_count += 1
+                    tasks[asyncio.create_task(backup.call_tool(tool_name, arguments))] = backup
+
+            pending = set(tasks)
+            result, error = None, None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        if isinstance(error, ToolCallNotSent):
+                            tasks[task].healthy = False
+                        continue
+                    result = task.result()
+                    if not result.isError:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return result
+            # 모두 실패: 오류 결과(타임아웃 등)가 있으면 그것을, 없으면 예외를 전달
+            if result is not None:
+                return result
+            raise error
+        finally:
+            if not primary.done():
+                # 취소된 느린 요청도 최소 이만큼 걸렸다고 기록해야 분위수가 낮아지지 않음
+                self.latency.record(time.perf_counter() - start_time)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
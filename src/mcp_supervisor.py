@@ -0,0 +1,144 @@
+import random
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from .managed_server import ManagedMCPServer
+from .config import (
+    MCP_HEALTH_CHECK_INTERVAL,
+    MCP_PING_TIMEOUT,
+    MCP_RECONNECT_BASE_DELAY,
+    MCP_RECONNECT_MAX_DELAY,
+    MCP_SETUP_TIMEOUT,
+)
+
+
+class MCPSupervisor:
+    """MCP 서버 연결을 감시하고 끊어진 연결을 자동으로 복구합니다.
+
+    서버(복제본 풀은 복제본)마다 감시 태스크를 하나씩 띄워 주기적으로 ping을 보냅니다. ping이 실패하거나
+    도구 호출 중 오류가 나면(failure_event) 지터가 섞인 지수 백오프로 재연결을 시도하고,
+    성공하면 ManagedMCPServer.reconnect()로 실행 중인 Agent 밑의 세션을 교체합니다.
+    """
+
+    def __init__(
+        self,
+        servers: List[ManagedMCPServer],
+        interval: float = MCP_HEALTH_CHECK_INTERVAL,
+        ping_timeout: float = MCP_PING_TIMEOUT,
+        base_delay: float = MCP_RECONNECT_BASE_DELAY,
+        max_delay: float = MCP_RECONNECT_MAX_DELAY,
+        reconnect_timeout: float = MCP_SETUP_TIMEOUT,
+    ):
+        self.servers = list(servers)
+        self.interval = interval
+        self.ping_timeout = ping_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reconnect_timeout = reconnect_timeout
+        self._tasks: Optional[Dict[int, List[asyncio.Task]]] = None  # id(server) -> 감시 태스크, 시작 전 None
+        self._stopping: Set[asyncio.Task] = set()  # 종료를 요청한 감시 태스크
+
+    def start(self) -> None:
+        """서버별 감시 태스크를 시작합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다."""
+        if self._tasks is not None:
+            return
+        self._tasks = {}
+        for server in self.servers:
+            self._start_watching(server)
+        logging.info(f"MCP 연결 감시 시작: {len(self.servers)}개 서버, interval={self.interval:.0f}s")
+
+    async def stop(self) -> None:
+        """감시 태스크를 모두 종료합니다. 서버 연결 자체는 닫지 않습니다."""
+        tasks = [task for server_tasks in (self._tasks or {}).values() for task in server_tasks]
+        await self._cancel(tasks)
+        self._tasks = None
+
+    def add(self, server: ManagedMCPServer) -> None:
+        """실행 중에 추가된 서버를 감시 대상에 넣습니다 (설정 다시 불러오기)."""
+        self.servers.append(server)
+        if self._tasks is not None:
+            self._start_watching(server)
+
+    async def remove(self, server: ManagedMCPServer) -> None:
+        """서버를 감시 대상에서 빼고 감시 태스크를 종료합니다. 서버 연결 자체는 닫지 않습니다."""
+        if server in self.servers:
+            self.servers.remove(server)
+        await self._cancel((self._tasks or {}).pop(id(server), []))
+
+    async def _cancel(self, tasks: List[asyncio.Task]) -> None:
+        # wait_for는 안쪽 대기가 끝난 순간에 온 취소를 삼키고 결과를 돌려줄 수 있으므로(Python 3.11 이하)
+        # 취소와 함께 종료 표시를 남겨 감시 루프가 다음 반복에서 스스로 끝나게 함
+        self._stopping.update(tasks)
+        for task in tasks:
+            task.cancel()
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._stopping.difference_update(tasks)
+
+    def _start_watching(self, server: ManagedMCPServer) -> None:
+        # 복제본 풀은 복제본마다 따로 감시
+        self._tasks[id(server)] = [
+            asyncio.create_task(self._watch(member, parent=server)) for member in server.members()
+        ]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """서버 이름별 연결 상태 지표를 반환합니다."""
+        return {server.name: server.health_stats() for server in self.servers}
+
+    async def _watch(self, server: ManagedMCPServer, parent: ManagedMCPServer) -> None:
+        while asyncio.current_task() not in self._stopping:
+            # 주기가 되었거나 도구 호출 실패 알림이 오면 상태 확인
+            try:
+                await asyncio.wait_for(server.failure_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            if parent.dormant:
+                # 유휴 상태로 종료된 지연 시작 서버는 다음 도구 호출 때 다시 시작되므로 감시하지 않음
+                server.failure_event.clear()
+                continue
+
+            try:
+                # 캐시된 스키마로 시작했거나 지연 시작 중인 서버는 연결이 끝난 뒤에 확인
+                await parent.wait_connected()
+                await server.ping(self.ping_timeout)
+                server.failure_event.clear()
+                server.healthy = True
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                server.last_error = str(e) or type(e).__name__
+                server.healthy = False
+                logging.warning(f"MCP 서버 상태 확인 실패: name={server.name}, error={server.last_error}")
+
+            await self._reconnect_with_backoff(server)
+
+    async def _reconnect_with_backoff(self, server: ManagedMCPServer) -> None:
+        attempt = 0
+        while asyncio.current_task() not in self._stopping:
+            try:
+                await asyncio.wait_for(server.reconnect(), timeout=self.reconnect_timeout)
+                logging.warning(
+                    f"MCP 서버 재연결 성공: name={server.name}, attempts={attempt + 1}, "
+                    f"reconnect_count={server.reconnect_count}"
+                )
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                server.last_error = str(e) or type(e).__name__
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                logging.warning(
+                    f"MCP 서버 재연결 실패: name={server.name}, attempt={attempt}, "
+                    f"error={server.last_error}, {delay:.1f}초 후 재시도"
+                )
+                await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """지수 백오프에 full jitter를 적용한 대기 시간(초)."""
+        return random.uniform(self.base_delay, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
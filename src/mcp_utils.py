@@ -1,16 +1,18 @@
 import logging
-import os
 import asyncio
 import signal
 import sys
+import time
 from typing import List, Dict, Optional, Any, Tuple
 from functools import partial
 
-try:
-    from agents.mcp import MCPServerStreamableHttp, MCPServerStdio
-except ImportError:
-    from mcp.server import MCPServerStreamableHttp, MCPServerStdio
-from .config import PROJECT_ROOT, load_mcp_config
+from .agent_setup import create_mcp_server, warm_start_server
+from .tool_schema_cache import get_tool_schema_cache
+from .config import (
+    MCP_PROBE_CONNECT_TIMEOUT,
+    MCP_PROBE_LIST_TOOLS_TIMEOUT,
+    load_mcp_config
+)
 
 # 종료 핸들러 설정
 def _cleanup_resources():
@@ -28,7 +30,20 @@ def _signal_handler(sig, frame):
 signal.signal(signal.SIGINT, _signal_handler)
 signal.signal(signal.SIGTERM, _signal_handler)
 
-async def check_server_connection(server_config: Dict) -> Dict[str, Any]:
+def _tools_to_dicts(tools) -> List[Dict[str, Any]]:
+    """도구 객체를 사전으로 변환합니다."""
+    tools_list = []
+    for tool in tools:
+        # 객체 속성에 안전하게 접근
+        tool_dict = {
+            "name": getattr(tool, 'name', 'Unknown'),
+            "description": getattr(tool, 'description', ''),
+            "parameters": getattr(tool, 'parameters', {})
+        }
+        tools_list.append(tool_dict)
+    return tools_list
+
+async def check_server_connection(server_config: Dict, keep_connection: bool = False) -> Dict[str, Any]:
     """
     단일 MCP 서버의 연결을 확인하고 도구 목록을 가져옵니다.
     
@@ -38,6 +53,9 @@ async def check_server_connection(server_config: Dict) -> Dict[str, Any]:
     
     Args:
         server_config: 서버 설정 딕셔너리 (name, url 또는 command/args 필요)
+        keep_connection: True이면 연결에 성공한 서버를 닫지 않고 결과의 'server'로 반환합니다.
+                         도구 스키마 캐시가 있으면 연결을 기다리지 않고 캐시된 도구 목록으로 바로 반환합니다.
+                         False이면 실제로 연결해 확인하고, 확인이 끝난 연결은 바로 정리합니다.
         
     Returns:
         Dict: 서버의 연결 상태와 도구 목록을 포함한 딕셔너리
@@ -46,7 +64,9 @@ async def check_server_connection(server_config: Dict) -> Dict[str, Any]:
             'config': {...},  # 원본 설정
             'connected': True/False,
             'error': '에러 메시지',  # 실패 시
-            'tools': [...]  # 성공 시 도구 목록
+            'tools': [...],  # 성공 시 도구 목록
+            'server': ManagedMCPServer,  # keep_connection=True이고 성공한 경우, 연결된 서버
+            'schema_from_cache': True  # 캐시된 도구 스키마로 반환한 경우
         }
     """
     server_name = server_config.get('name')
@@ -64,72 +84,46 @@ async def check_server_connection(server_config: Dict) -> Dict[str, Any]:
         'config': server_config,
         'connected': False
     }
+    start_time = time.perf_counter()
+    schema_cache = get_tool_schema_cache()
+
+    # 연결을 넘겨받을 경우, 캐시된 도구 스키마가 있으면 연결을 기다리지 않고 바로 반환
+    # (연결과 스키마 검증은 백그라운드에서 진행)
+    cached_tools = schema_cache.get(server_config) if schema_cache and keep_connection else None
+    if cached_tools is not None:
+        server = create_mcp_server(server_config)
+        warm_start_server(server, cached_tools, schema_cache, MCP_PROBE_CONNECT_TIMEOUT)
+        server.startup_ms = (time.perf_counter() - start_time) * 1000.0
+        logging.info(f"✅ MCP 서버 '{server_name}'의 도구 목록을 캐시에서 불러왔습니다 ({len(cached_tools)} 도구)")
+        result.update(connected=True, tools=_tools_to_dicts(cached_tools), server=server, schema_from_cache=True)
+        return result
     
     server = None
     try:
-        # 서버 유형에 따라 인스턴스 생성
+        # 에이전트가 그대로 넘겨받아 쓸 수 있도록 에이전트와 같은 설정으로 서버 생성
         if "url" in server_config:
             logging.info(f"MCP HTTP 서버 연결 시도: name={server_name}, url={server_config['url']}")
-            
-            params = {
-                "url": server_config["url"],
-                "timeout": 10.0,  # 타임아웃 시간 감소
-                "request_timeout": 30.0  # 요청 타임아웃 시간 감소
-            }
-            if "headers" in server_config:
-                params["headers"] = server_config["headers"]
-            
-            server = MCPServerStreamableHttp(
-                params=params,
-                cache_tools_list=True,
-                client_session_timeout_seconds=30.0
-            )
         else:
             logging.info(f"MCP CLI 서버 연결 시도: name={server_name}, command={server_config.get('command')}")
-            
-            # args에 포함된 스크립트 경로를 프로젝트 루트 기준으로 변환
-            args = server_config.get("args", [])
-            for i, arg in enumerate(args):
-                if arg.startswith('src/'):
-                    args[i] = os.path.join(PROJECT_ROOT, arg)
-            
-            server = MCPServerStdio(
-                params={
-                    "command": server_config.get("command"),
-                    "args": args,
-                    "cwd": PROJECT_ROOT,
-                    "env": os.environ,
-                    "shell": True,
-                    "request_timeout": 30.0  # 타임아웃 시간 감소
-                },
-                cache_tools_list=True,
-                client_session_timeout_seconds=30.0
-            )
+        server = create_mcp_server(server_config)
         
         # 타임아웃과 함께 서버 연결 시도
         try:
-            # 30초 타임아웃으로 연결 시도
-            await asyncio.wait_for(server.connect(), timeout=30.0)
+            await asyncio.wait_for(server.connect(), timeout=MCP_PROBE_CONNECT_TIMEOUT)
             result['connected'] = True
             
-            # 도구 목록 가져오기 (10초 타임아웃)
+            # 도구 목록 가져오기
             try:
-                tools = await asyncio.wait_for(server.list_tools(), timeout=10.0)
-                # 도구 객체를 사전으로 변환
-                tools_list = []
-                for tool in tools:
-                    # 객체 속성에 안전하게 접근
-                    tool_dict = {
-                        "name": getattr(tool, 'name', 'Unknown'),
-                        "description": getattr(tool, 'description', ''),
-                        "parameters": getattr(tool, 'parameters', {})
-                    }
-                    tools_list.append(tool_dict)
+                tools = await asyncio.wait_for(server.list_tools(), timeout=MCP_PROBE_LIST_TOOLS_TIMEOUT)
+                server.tool_count = len(tools)
+                if schema_cache:
+                    schema_cache.store(server_config, server.server_version, tools)
+                tools_list = _tools_to_dicts(tools)
                 
                 result['tools'] = tools_list
                 logging.info(f"✅ MCP 서버 '{server_name}'의 도구 목록 불러오기 성공 ({len(tools_list)} 도구)")
             except asyncio.TimeoutError:
-                logging.error(f"⏱️ MCP 서버 '{server_name}'의 도구 목록 불러오기 타임아웃 (10초)")
+                logging.error(f"⏱️ MCP 서버 '{server_name}'의 도구 목록 불러오기 타임아웃 ({MCP_PROBE_LIST_TOOLS_TIMEOUT:.0f}초)")
                 result['connected'] = False
                 result['error'] = "도구 목록 불러오기 타임아웃"
             except Exception as e:
@@ -138,17 +132,25 @@ async def check_server_connection(server_config: Dict) -> Dict[str, Any]:
                 result['error'] = f"도구 목록 불러오기 오류: {str(e)}"
                 
         except asyncio.TimeoutError:
-            logging.error(f"⏱️ MCP 서버 '{server_name}' 연결 타임아웃 (30초)")
+            logging.error(f"⏱️ MCP 서버 '{server_name}' 연결 타임아웃 ({MCP_PROBE_CONNECT_TIMEOUT:.0f}초)")
             result['error'] = "연결 타임아웃"
             
     except Exception as e:
         error_msg = str(e)
         logging.error(f"❌ MCP 서버 '{server_name}' 연결 실패: {error_msg}")
         result['error'] = error_msg
+    finally:
+        if server is not None:
+            server.startup_ms = (time.perf_counter() - start_time) * 1000.0
+            if result['connected'] and keep_connection:
+                # 연결된 서버 핸들을 그대로 넘겨 에이전트가 재연결 없이 사용
+                result['server'] = server
+            else:
+                await server.cleanup()
     
     return result
 
-async def check_server_connections() -> List[Dict[str, Any]]:
+async def check_server_connections(keep_connections: bool = False) -> List[Dict[str, Any]]:
     """
     모든 MCP 서버들의 연결을 병렬로 확인하고 각 서버의 도구 목록을 가져옵니다.
     
@@ -156,6 +158,10 @@ async def check_server_connections() -> List[Dict[str, Any]]:
     각 서버에 대해 병렬로 연결을 시도합니다. 모든 서버 연결 시도는 
     동시에 처리되어 전체 대기 시간이 크게 줄어듭니다.
     
+    Args:
+        keep_connections: True이면 연결된 서버 핸들을 각 결과의 'server'에 담아 반환합니다.
+                          반환된 서버는 호출한 쪽에서 사용하거나 cleanup()해야 합니다.
+    
     Returns:
         List[Dict]: 각 서버의 연결 상태와 도구 목록을 포함한 딕셔너리 리스트
         [
@@ -185,7 +191,7 @@ async def check_server_connections() -> List[Dict[str, Any]]:
     server_configs = config.get('mcpServers', [])
     
     # 모든 서버를 병렬로 처리
-    tasks = [check_server_connection(server_config) for server_config in server_configs]
+    tasks = [check_server_connection(server_config, keep_connections) for server_config in server_configs]
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
     # 예외 처리
@@ -253,11 +259,15 @@ async def get_available_tools() -> Dict[str, List]:
     
     return available_tools
 
-async def check_and_get_servers() -> Tuple[List[Dict[str, Any]], Dict[str, List]]:
+async def check_and_get_servers(keep_connections: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, List]]:
     """
     서버 연결을 확인하고 사용 가능한 도구 목록을 동시에 반환합니다.
     check_server_connections()와 get_available_tools()를 효율적으로 결합한 버전입니다.
     
+    Args:
+        keep_connections: True이면 연결된 서버 핸들을 결과의 'server'에 담아 반환합니다.
+                          setup_agent_and_servers()에 그대로 넘기면 재연결 없이 사용됩니다.
+    
     Returns:
         Tuple[List[Dict], Dict[str, List]]: 
             - 서버 연결 결과 목록
@@ -281,7 +291,7 @@ async def check_and_get_servers() -> Tuple[List[Dict[str, Any]], Dict[str, List]
     """
     try:
         # 모든 서버 연결 확인
-        server_results = await check_server_connections()
+        server_results = await check_server_connections(keep_connections)
         available_tools = {}
         
         # 사용 가능한 도구 추출
@@ -0,0 +1,220 @@
+import re
+import time
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agents.items import ItemHelpers
+from agents.models.interface import Model
+
+from .latency_tracker import LatencyTracker
+from .config import LLM_LATENCY_WINDOW, CASCADE_COMPLEXITY_THRESHOLD, CASCADE_ESCALATE_MARKER
+
+CASCADE_MODES = ("classifier", "confidence")
+
+ESCALATE_INSTRUCTION = (
+    f"\n\n[모델 단계] 질문이 여러 단계의 추론, 분석, 긴 글 작성이 필요하거나 답변에 확신이 없으면 "
+    f"다른 말 없이 {CASCADE_ESCALATE_MARKER} 만 출력하세요."
+)
+
+_COMPLEX_KEYWORDS = re.compile(
+    r"분석|비교|설명해|이유|왜|요약|정리해|작성|코드|계획|추천|장단점|전략|검토|"
+    r"analy[sz]e|compare|explain|why|summar|write|code|plan|recommend|pros|cons|review",
+    re.IGNORECASE,
+)
+# "안녕하세요"처럼 한글은 어미가 붙어 한 단어가 되므로 \b 대신, 인사말 뒤에 공백/구두점/끝이 오거나
+# 짧은 어미("하세요", "합니다", "요")만 붙고 메시지가 끝나는 경우를 허용
+_SIMPLE_PATTERNS = re.compile(
+    r"^\s*(안녕|ㅎㅇ|고마워|감사|ㄱㅅ|네|응|좋아|ok|okay|hi|hello|hey|thanks|thank you)"
+    r"(?=[\s,!?.~]|$|[가-힣]{0,4}[\s!?.~]*$)",
+    re.IGNORECASE,
+)
+
+
+def latest_user_message(input) -> str:
+    """LLM 입력에서 마지막 사용자 메시지의 텍스트를 꺼냅니다."""
+    if isinstance(input, str):
+        return input
+    for item in reversed(input):
+        if isinstance(item, dict) and item.get('role') == 'user':
+            content = item.get('content')
+            if isinstance(content, str):
+                return content
+            if isinstance(content, list):
+                return ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return ''
+
+
+def classify_complexity(input) -> float:
+    """마지막 사용자 메시지가 큰 모델이 필요할 만큼 복잡한지 0~1 점수로 추정합니다 (규칙 기반, 추가 LLM 호출 없음)."""
+    text = latest_user_message(input)
+    score = 0.0
+    if len(text) > 200:
+        score += 0.4
+    elif len(text) > 80:
+        score += 0.2
+    score += min(0.6, 0.3 * len(_COMPLEX_KEYWORDS.findall(text)))
+    if text.count('?') + text.count('？') >= 2:
+        score += 0.2
+    if _SIMPLE_PATTERNS.match(text):
+        score -= 0.3
+    # 마지막 사용자 메시지만 보므로 같은 턴의 도구 호출이 늘어나도 점수(선택된 모델)가 바뀌지 않음
+    return max(0.0, min(1.0, score))
+
+
+class ModelTier:
+    """캐스케이드의 단계 하나(작은/큰 모델)와 그 지연/토큰/비용 지표."""
+
+    def __init__(self, name: str, model: Model, input_cost_per_1m: float = 0.0, output_cost_per_1m: float = 0.0):
+        self.name = name
+        self.model = model
+        self.input_cost_per_1m = input_cost_per_1m
+        self.output_cost_per_1m = output_cost_per_1m
+        self.latency = LatencyTracker(LLM_LATENCY_WINDOW, min_samples=1)
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    @property
+    def cost_usd(self) -> float:
+        return (self.input_tokens * self.input_cost_per_1m + self.output_tokens * self.output_cost_per_1m) / 1_000_000
+
+    def record(self, seconds: float, usage=None) -> None:
+        """usage: ModelResponse.usage(Usage) 또는 스트림 완료 이벤트의 ResponseUsage."""
+        self.calls += 1
+        self.latency.record(seconds)
+        if usage is not None:
+            self.input_tokens += usage.input_tokens
+            self.output_tokens += usage.output_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'calls': self.calls,
+            'latency': self.latency.stats(),
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'cost_usd': round(self.cost_usd, 6),
+        }
+        if hasattr(self.model, 'stats'):
+            # 제공자 라우팅, 로컬 추론 서버 대기열 등 모델 래퍼의 지표
+            stats['model'] = self.model.stats()
+        return stats
+
+
+class CascadeModel(Model):
+    """간단한 요청은 작은 모델, 복잡한 요청은 큰 모델로 보내는 Model.
+
+    - classifier: 마지막 사용자 메시지의 복잡도 점수(classify_complexity)가 threshold 이상이면 큰 모델
+    - confidence: classifier로 작은 모델에 보낸 요청 중 작은 모델이 확신이 없다고
+      표시(CASCADE_ESCALATE_MARKER)한 최종 답변은 같은 입력으로 큰 모델에 다시 요청
+
+    같은 턴의 LLM 호출은 같은 사용자 메시지를 보므로 도구 호출 중간에 모델이 바뀌지 않습니다.
+    """
+
+    def __init__(self, small: ModelTier, large: ModelTier, mode: str = "classifier",
+                 threshold: float = CASCADE_COMPLEXITY_THRESHOLD):
+        if mode not in CASCADE_MODES:
+            raise ValueError(f"지원하지 않는 cascade 모드입니다: {mode} (가능: {', '.join(CASCADE_MODES)})")
+        self.small = small
+        self.large = large
+        self.mode = mode
+        self.threshold = threshold
+        self.classifier_escalations = 0
+        self.confidence_escalations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        # 큰 모델로 바로 보낸 요청 + 작은 모델로 보낸 요청 (confidence 재요청은 같은 요청)
+        total = self.classifier_escalations + self.small.calls
+        escalations = self.classifier_escalations + self.confidence_escalations
+        return {
+            'mode': self.mode,
+            'requests': total,
+            'escalations': {'classifier': self.classifier_escalations, 'confidence': self.confidence_escalations},
+            'escalation_rate': round(escalations / total, 3) if total else 0.0,
+            'cost_usd': round(self.small.cost_usd + self.large.cost_usd, 6),
+            'tiers': {tier.name: tier.stats() for tier in (self.small, self.large)},
+        }
+
+    def _needs_large(self, input) -> bool:
+        return classify_complexity(input) >= self.threshold
+
+    def _small_instructions(self, system_instructions: Optional[str]) -> Optional[str]:
+        if self.mode != "confidence":
+            return system_instructions
+        return (system_instructions or "") + ESCALATE_INSTRUCTION
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        async def _call(tier: ModelTier, instructions):
+            start_time = time.perf_counter()
+            response = await tier.model.get_response(
+                instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            )
+            tier.record(time.perf_counter() - start_time, response.usage)
+            return response
+
+        if self._needs_large(input):
+            self.classifier_escalations += 1
+            return await _call(self.large, system_instructions)
+
+        response = await _call(self.small, self._small_instructions(system_instructions))
+        if self.mode == "confidence" and _asks_escalation(response.output):
+            self.confidence_escalations += 1
+            logging.info("작은 모델이 확신이 없다고 답해 큰 모델로 다시 요청합니다.")
+            return await _call(self.large, system_instructions)
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        def _stream(tier: ModelTier, instructions):
+            return tier.model.stream_response(
+                instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            )
+
+        async def _relay(tier: ModelTier, instructions):
+            start_time = time.perf_counter()
+            usage = None
+            async for event in _stream(tier, instructions):
+                if getattr(event, 'type', None) == 'response.completed':
+                    usage = event.response.usage
+                yield event
+            tier.record(time.perf_counter() - start_time, usage)
+
+        if self._needs_large(input):
+            self.classifier_escalations += 1
+            async for event in _relay(self.large, system_instructions):
+                yield event
+            return
+
+        if self.mode != "confidence":
+            async for event in _relay(self.small, system_instructions):
+                yield event
+            return
+
+        # confidence 모드: 작은 모델의 답변이 끝나야 확신 여부를 알 수 있으므로 모아 두었다가 전달
+        events: List[Any] = []
+        escalate = False
+        async for event in _relay(self.small, self._small_instructions(system_instructions)):
+            events.append(event)
+            if getattr(event, 'type', None) == 'response.completed':
+                escalate = _asks_escalation(event.response.output)
+        if escalate:
+            self.confidence_escalations += 1
+            logging.info("작은 모델이 확신이 없다고 답해 큰 모델로 다시 요청합니다.")
+            async for event in _relay(self.large, system_instructions):
+                yield event
+            return
+        for event in events:
+            yield event
+
+
+def _asks_escalation(output) -> bool:
+    """모델 출력이 도구 호출 없이 에스컬레이션 표시만 담은 최종 답변인지 확인합니다."""
+    for item in output:
+        if getattr(item, 'type', None) == 'message':
+            text = ItemHelpers.extract_last_text(item)
+            if text and CASCADE_ESCALATE_MARKER in text:
+                return True
+    return False
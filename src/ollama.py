@@ -0,0 +1,186 @@
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from agents.models.interface import Model
+
+from .latency_tracker import LatencyTracker
+from .llm_clients import get_llm_client_registry
+from .config import (
+    LLM_LATENCY_WINDOW,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_KEEPALIVE_INTERVAL,
+    OLLAMA_NUM_PARALLEL,
+    OLLAMA_WARM_TIMEOUT,
+)
+
+
+class OllamaServer:
+    """Ollama 서버 하나(base URL)의 모델 상주 유지와 요청 대기열.
+
+    - 사용하는 모델을 시작 시 미리 불러오고(warm-up) OLLAMA_KEEPALIVE_INTERVAL마다
+      keep_alive를 갱신해 유휴 후 첫 요청이 모델 로드 시간을 기다리지 않게 합니다.
+    - 동시에 보내는 요청을 서버의 병렬 처리 수(num_parallel)로 제한하고, 초과한 요청은
+      여기서 순서대로 기다리게 해 대기 시간을 측정합니다. 같은 서버의 모든 모델과
+      에이전트 재구성 사이에서 공유됩니다.
+    """
+
+    def __init__(self, base_url: str, num_parallel: int = OLLAMA_NUM_PARALLEL):
+        self.base_url = base_url
+        # OpenAI 호환 엔드포인트(.../v1)에서 Ollama 전용 API 주소를 계산
+        self.api_url = base_url.rstrip('/').removesuffix('/v1')
+        self.num_parallel = max(1, num_parallel)
+        self.models: Set[str] = set()
+        self.queue_wait = LatencyTracker(LLM_LATENCY_WINDOW, min_samples=1)
+        self.waiting = 0
+        self.in_flight = 0
+        self.last_load_ms: Dict[str, float] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    def keep_warm(self, model_name: str) -> None:
+        """모델을 상주 대상에 추가하고, 실행 중인 이벤트 루프가 있으면 유지 태스크를 시작합니다."""
+        added = model_name not in self.models
+        self.models.add(model_name)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 이벤트 루프 밖(모듈 import 시점 등): 첫 요청 때 시작
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = loop.create_task(self._keep_alive_loop())
+        elif added:
+            loop.create_task(self._warm(model_name))
+
+    async def warm_all(self) -> None:
+        """상주 대상 모델을 모두 불러올 때까지 기다린 뒤 keep_alive 갱신 태스크를 시작합니다.
+
+        LLMFactory는 이벤트 루프 밖(모듈 import 시점)에서도 만들어지므로, 시작 시 이 함수를 기다려야
+        첫 요청이 모델 로드와 겹치지 않습니다.
+        """
+        await asyncio.gather(*(self._warm(model) for model in list(self.models)))
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keep_alive_loop(warm_first=False))
+
+    @asynccontextmanager
+    async def slot(self):
+        """서버 병렬 처리 수만큼만 동시에 들어갈 수 있는 구간. 대기 시간을 기록합니다."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.num_parallel)
+        self.waiting += 1
+        start_time = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.queue_wait.record(time.perf_counter() - start_time)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stop(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        wait = self.queue_wait.stats()
+        return {
+            'num_parallel': self.num_parallel,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'queue_wait': wait,
+            'warm_models': sorted(self.models),
+            'last_load_ms': self.last_load_ms,
+        }
+
+    async def _keep_alive_loop(self, warm_first: bool = True) -> None:
+        if not warm_first:
+            await asyncio.sleep(OLLAMA_KEEPALIVE_INTERVAL)
+        while True:
+            await asyncio.gather(*(self._warm(model) for model in list(self.models)))
+            await asyncio.sleep(OLLAMA_KEEPALIVE_INTERVAL)
+
+    async def _warm(self, model_name: str) -> None:
+        # 프롬프트 없는 generate 요청은 모델을 불러오고 keep_alive만 갱신함 (추론하지 않음)
+        http_client = get_llm_client_registry().http_client("ollama", self.base_url)
+        start_time = time.perf_counter()
+        try:
+            response = await http_client.post(
+                f"{self.api_url}/api/generate",
+                json={"model": model_name, "keep_alive": OLLAMA_KEEP_ALIVE},
+                timeout=OLLAMA_WARM_TIMEOUT,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logging.warning(f"Ollama 모델 유지 요청 실패: model={model_name}, url={self.api_url}, error={e}")
+            return
+        elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+        load_ms = response.json().get('load_duration', 0) / 1_000_000
+        self.last_load_ms[model_name] = round(load_ms, 1)
+        if load_ms > 100:
+            logging.info(f"Ollama 모델을 메모리에 불러왔습니다: model={model_name}, load_ms={load_ms:.0f}, total_ms={elapsed_ms:.0f}")
+
+
+class OllamaQueuedModel(Model):
+    """Ollama 모델 호출을 서버 대기열(OllamaServer.slot)을 거쳐 보내는 Model 래퍼."""
+
+    def __init__(self, model: Model, server: OllamaServer, model_name: str, keep_warm: bool = True):
+        self.model = model
+        self.server = server
+        self.model_name = model_name
+        self.keep_warm = keep_warm
+        if keep_warm:
+            server.keep_warm(model_name)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.server.stats()
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        if self.keep_warm:
+            self.server.keep_warm(self.model_name)
+        async with self.server.slot():
+            return await self.model.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            )
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        if self.keep_warm:
+            self.server.keep_warm(self.model_name)
+        async with self.server.slot():
+            async for event in self.model.stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id,
+            ):
+                yield event
+
+
+_ollama_servers: Dict[str, OllamaServer] = {}
+
+
+def get_ollama_server(base_url: str, num_parallel: Optional[int] = None) -> OllamaServer:
+    """base URL별 프로세스 공용 OllamaServer. num_parallel은 처음 만들 때만 적용됩니다."""
+    server = _ollama_servers.get(base_url)
+    if server is None:
+        server = OllamaServer(base_url, num_parallel or OLLAMA_NUM_PARALLEL)
+        _ollama_servers[base_url] = server
+    return server
+
+
+async def warm_ollama_servers() -> None:
+    """프로그램 시작 시 모든 Ollama 서버의 상주 대상 모델을 미리 불러옵니다."""
+    await asyncio.gather(*(server.warm_all() for server in _ollama_servers.values()))
+
+
+def stop_ollama_servers() -> None:
+    """프로그램 종료 시 모델 유지 태스크를 멈춥니다."""
+    for server in _ollama_servers.values():
+        server.stop()
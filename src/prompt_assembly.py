@@ -0,0 +1,59 @@
+import dataclasses
+from typing import Any, AsyncIterator, List
+
+from agents.models.interface import Model
+from agents.tool import FunctionTool, Tool
+
+from .config import PROMPT_STABLE_ORDER
+
+
+def canonical_schema(value: Any) -> Any:
+    """JSON 스키마의 dict 키를 재귀적으로 정렬해 직렬화 결과가 항상 같도록 만듭니다."""
+    if isinstance(value, dict):
+        return {key: canonical_schema(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [canonical_schema(item) for item in value]
+    return value
+
+
+def stable_tools(tools: List[Tool]) -> List[Tool]:
+    """도구를 이름순으로 정렬하고 스키마 키 순서를 고정한 목록을 반환합니다."""
+    ordered = sorted(tools, key=lambda tool: tool.name)
+    return [
+        dataclasses.replace(tool, params_json_schema=canonical_schema(tool.params_json_schema))
+        if isinstance(tool, FunctionTool) else tool
+        for tool in ordered
+    ]
+
+
+class StablePromptModel(Model):
+    """LLM 요청의 앞부분(도구 스키마 + 시스템 프롬프트)이 실행마다 같도록 맞추는 Model 래퍼.
+
+    제공자 쪽 프롬프트 캐시(prefix caching)는 요청 앞부분이 바이트 단위로 같아야 적중합니다.
+    MCP 서버 연결 순서나 서버가 돌려준 도구/스키마 키 순서가 달라지면 캐시가 깨지므로
+    도구는 이름순, 스키마 키는 정렬된 순서로 보냅니다. 시스템 프롬프트는 고정된 prompt.txt를
+    앞에 두고, 실행마다 달라지는 내용(시간 예산 마무리 지시 등)은 뒤에 덧붙입니다.
+    """
+
+    def __init__(self, model: Model, enabled: bool = PROMPT_STABLE_ORDER):
+        self.model = model
+        self.enabled = enabled
+
+    def _tools(self, tools: List[Tool]) -> List[Tool]:
+        return stable_tools(tools) if self.enabled else tools
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        return await self.model.get_response(
+            system_instructions, input, model_settings, self._tools(tools), output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        )
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        async for event in self.model.stream_response(
+            system_instructions, input, model_settings, self._tools(tools), output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        ):
+            yield event
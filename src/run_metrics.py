@@ -0,0 +1,261 @@
+import json
+import time
+import asyncio
+import uuid
+import logging
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from agents.models.interface import Model
+
+from .admission import AdmissionRejected
+from .config import RUN_METRICS_PATH, RUN_METRICS_ENABLED, RUN_METRICS_WINDOW
+
+_current_run: contextvars.ContextVar[Optional["RunRecord"]] = contextvars.ContextVar(
+    "current_run", default=None
+)
+
+
+def current_run() -> Optional["RunRecord"]:
+    """현재 실행 컨텍스트의 RunRecord를 반환합니다. 없으면 None."""
+    return _current_run.get()
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 1)
+
+
+class RunRecord:
+    """에이전트 실행 한 번의 LLM 호출, 도구 호출, 단계별 시간 기록."""
+
+    def __init__(self, source: str, **fields: Any):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.source = source
+        self.fields = fields
+        self.started_at = time.time()
+        self.start_time = time.perf_counter()
+        self.llm_calls: List[Dict[str, Any]] = []
+        self.tool_calls: List[Dict[str, Any]] = []
+        self.phases: Dict[str, float] = {}  # 단계 이름 -> 누적 ms (텔레그램 전송, 대기열 등)
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.total_ms: Optional[float] = None
+
+    def record_llm_call(self, ttft: Optional[float], total: float, usage=None, streamed: bool = False) -> None:
+        """usage: ModelResponse.usage(Usage) 또는 스트림 완료 이벤트의 ResponseUsage.
+
+        ttft: 첫 이벤트까지 걸린 시간. 비스트리밍 호출은 알 수 없으므로 None (ttft_ms: null로 기록).
+        """
+        call = {'ttft_ms': _ms(ttft) if ttft is not None else None, 'total_ms': _ms(total), 'streamed': streamed,
+                'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0}
+        if usage is not None:
+            details = getattr(usage, 'input_tokens_details', None)
+            call.update(
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                cached_tokens=getattr(details, 'cached_tokens', 0) or 0,
+            )
+        self.llm_calls.append(call)
+
+    def record_tool_call(self, server: str, tool: str, seconds: float, output_bytes: int, is_error: bool) -> None:
+        self.tool_calls.append({'server': server, 'tool': tool, 'ms': _ms(seconds),
+                                'output_bytes': output_bytes, 'error': is_error})
+
+    def fail(self, error: BaseException) -> None:
+        """실행 실패를 기록합니다. 과부하로 거절된 요청은 집계에서 제외되도록 따로 표시합니다."""
+        self.status = "rejected" if isinstance(error, AdmissionRejected) else "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = round(self.phases.get(name, 0.0) + seconds * 1000.0, 1)
+
+    @contextmanager
+    def phase(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start_time)
+
+    def summary(self) -> Dict[str, Any]:
+        input_tokens = sum(c['input_tokens'] for c in self.llm_calls)
+        cached_tokens = sum(c['cached_tokens'] for c in self.llm_calls)
+        return {
+            'turns': len(self.llm_calls),
+            'llm_ms': round(sum(c['total_ms'] for c in self.llm_calls), 1),
+            'tool_ms': round(sum(c['ms'] for c in self.tool_calls), 1),
+            'input_tokens': input_tokens,
+            'output_tokens': sum(c['output_tokens'] for c in self.llm_calls),
+            'cached_tokens': cached_tokens,
+            # 제공자 프롬프트 캐시에서 읽은 입력 토큰 비율
+            'cached_ratio': round(cached_tokens / input_tokens, 3) if input_tokens else None,
+            'tool_call_count': len(self.tool_calls),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'run_id': self.run_id,
+            'source': self.source,
+            'started_at': self.started_at,
+            'status': self.status,
+            'error': self.error,
+            'total_ms': self.total_ms,
+            **self.fields,
+            **self.summary(),
+            'phases': self.phases,
+            'llm_calls': self.llm_calls,
+            'tool_calls': self.tool_calls,
+        }
+
+
+class RunRecorder:
+    """실행 기록을 JSON lines 파일에 쓰고 최근 실행의 분위수를 집계합니다.
+
+    이벤트 루프 안에서는 기록을 모아 두었다가 스레드에서 한 번에 써서 루프를 막지 않습니다.
+    """
+
+    SUMMARY_KEYS = ('total_ms', 'llm_ms', 'tool_ms', 'turns', 'input_tokens', 'output_tokens', 'cached_tokens',
+                    'cached_ratio')
+
+    def __init__(self, path: str = RUN_METRICS_PATH, enabled: bool = RUN_METRICS_ENABLED,
+                 window: int = RUN_METRICS_WINDOW):
+        self.path = path
+        self.enabled = enabled
+        self.runs = 0
+        self.errors = 0
+        self.rejected = 0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self._ttfts: Deque[float] = deque(maxlen=window * 4)
+        self._tool_ms: Deque[float] = deque(maxlen=window * 4)
+        self._pending: List[str] = []
+        self._flushing: Optional[asyncio.Task] = None
+
+    def finish(self, record: RunRecord) -> None:
+        record.total_ms = _ms(time.perf_counter() - record.start_time)
+        data = record.to_dict()
+        if record.status == "rejected":
+            # 에이전트가 실행되지 않은 요청은 분위수에 넣지 않음
+            self.rejected += 1
+        else:
+            self.runs += 1
+            if record.status != "ok":
+                self.errors += 1
+            self._recent.append({key: data[key] for key in self.SUMMARY_KEYS})
+            # 비스트리밍 호출(ttft_ms가 None)은 TTFT 분위수에서 제외
+            self._ttfts.extend(call['ttft_ms'] for call in record.llm_calls if call['ttft_ms'] is not None)
+            self._tool_ms.extend(call['ms'] for call in record.tool_calls)
+        if not self.enabled:
+            return
+        self._pending.append(json.dumps(data, ensure_ascii=False) + '\n')
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._take_pending())  # 이벤트 루프 밖: 바로 기록
+            return
+        if self._flushing is None or self._flushing.done():
+            self._flushing = loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """모아 둔 기록을 스레드에서 파일에 씁니다. 종료 시 남은 기록을 쓰기 위해서도 호출합니다."""
+        while self._pending:
+            await asyncio.to_thread(self._write, self._take_pending())
+
+    def _take_pending(self) -> List[str]:
+        lines, self._pending = self._pending, []
+        return lines
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        except OSError as e:
+            logging.warning(f"실행 기록을 쓰지 못했습니다: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """최근 실행의 항목별 p50/p95/p99."""
+        stats: Dict[str, Any] = {'runs': self.runs, 'errors': self.errors, 'rejected': self.rejected,
+                                 'window': len(self._recent)}
+        for key in self.SUMMARY_KEYS:
+            stats[key] = _percentiles([run[key] for run in self._recent])
+        stats['llm_ttft_ms'] = _percentiles(self._ttfts)
+        stats['tool_call_ms'] = _percentiles(self._tool_ms)
+        return stats
+
+
+def _percentiles(values) -> Dict[str, Optional[float]]:
+    ordered = sorted(v for v in values if v is not None)
+    if not ordered:
+        return {'p50': None, 'p95': None, 'p99': None}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {'p50': pick(0.5), 'p95': pick(0.95), 'p99': pick(0.99)}
+
+
+_run_recorder: Optional[RunRecorder] = None
+
+
+def get_run_recorder() -> RunRecorder:
+    """프로세스 공용 실행 기록기."""
+    global _run_recorder
+    if _run_recorder is None:
+        _run_recorder = RunRecorder()
+    return _run_recorder
+
+
+@contextmanager
+def run_scope(source: str, **fields: Any):
+    """블록 안의 LLM/도구 호출을 RunRecord 하나에 모으고, 끝나면 기록합니다.
+
+    contextvars를 사용하므로 블록 안에서 생성된 태스크(도구 병렬 호출 등)의 호출도 함께 기록됩니다.
+    """
+    record = RunRecord(source, **fields)
+    token = _current_run.set(record)
+    try:
+        yield record
+    except BaseException as e:
+        record.fail(e)
+        raise
+    finally:
+        _current_run.reset(token)
+        get_run_recorder().finish(record)
+
+
+class MeteredModel(Model):
+    """LLM 호출마다 TTFT, 전체 시간, 토큰 사용량을 현재 RunRecord에 기록하는 Model 래퍼."""
+
+    def __init__(self, model: Model):
+        self.model = model
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        start_time = time.perf_counter()
+        response = await self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        )
+        record = current_run()
+        if record is not None:
+            # 비스트리밍 응답은 첫 토큰 시간을 알 수 없으므로 TTFT는 기록하지 않음
+            record.record_llm_call(None, time.perf_counter() - start_time, response.usage)
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *,
+                              previous_response_id=None) -> AsyncIterator[Any]:
+        start_time = time.perf_counter()
+        ttft = None
+        usage = None
+        async for event in self.model.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id,
+        ):
+            if ttft is None:
+                ttft = time.perf_counter() - start_time
+            if getattr(event, 'type', None) == 'response.completed':
+                usage = event.response.usage
+            yield event
+        record = current_run()
+        if record is not None:
+            elapsed = time.perf_counter() - start_time
+            record.record_llm_call(ttft if ttft is not None else elapsed, elapsed, usage, streamed=True)
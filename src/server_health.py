@@ -0,0 +1,144 @@
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import SERVER_STATUS_MAX_AGE, MCP_PING_TIMEOUT
+
+
+class ServerHealthMonitor:
+    """에이전트가 실제로 사용하는 MCP 서버 연결에 ping을 보내 상태를 캐시합니다.
+
+    상태 확인마다 서버를 새로 띄우거나 HTTP 세션을 새로 여는 check_and_get_servers()와 달리,
+    이미 열린 세션에 ping만 보내므로 가볍습니다. 결과는 max_age초 주기로 백그라운드에서 갱신됩니다.
+    끊어진 연결의 재연결은 MCPSupervisor가 담당하며 여기서는 상태만 기록합니다.
+    """
+
+    def __init__(self, servers: List[Any], statuses: List[Dict[str, Any]], tools: Dict[str, List[Dict[str, str]]],
+                 max_age: float = SERVER_STATUS_MAX_AGE, ping_timeout: float = MCP_PING_TIMEOUT):
+        """
+        Args:
+            servers: 에이전트의 MCP 서버 (ManagedMCPServer / ManagedMCPServerPool)
+            statuses: 초기화 시 확인한 서버별 상태 (연결에 실패한 서버 포함)
+            tools: 서버 이름 -> [{"name", "description"}] 도구 목록
+        """
+        self.servers = {server.name: server for server in servers}
+        self.max_age = max_age
+        self.ping_timeout = ping_timeout
+        self.statuses: Dict[str, Dict[str, Any]] = {s['name']: dict(s) for s in statuses}
+        self.tools = dict(tools)
+        self.checked_at = time.time()
+        self._refreshing: Optional[asyncio.Task] = None
+        self._refreshing_tools = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """주기적 갱신 태스크를 시작합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, self._refreshing) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._refreshing = None
+
+    def add(self, server) -> None:
+        """설정 변경으로 추가/교체된 서버를 확인 대상에 넣고, 도구 목록까지 다시 가져오는 갱신을 시작합니다."""
+        self.servers[server.name] = server
+        self.statuses[server.name] = {
+            'name': server.name, 'type': 'HTTP' if 'url' in server.config else 'STDIO',
+            'status': 'WARN', 'tools': [], 'error': None, 'config': server.config,
+        }
+        self.tools.pop(server.name, None)
+        self._start_refresh(list_tools=True)
+
+    def remove(self, name: str) -> None:
+        """설정에서 제거된 서버를 확인 대상과 상태 목록에서 뺍니다."""
+        self.servers.pop(name, None)
+        self.statuses.pop(name, None)
+        self.tools.pop(name, None)
+
+    def mark_failed(self, name: str, error: str, config: Dict[str, Any]) -> None:
+        """연결에 실패해 에이전트에 들어가지 못한 서버를 실패 상태로 표시합니다 (기존 서버가 없을 때만)."""
+        if name in self.servers:
+            return
+        self.statuses[name] = {'name': name, 'type': 'HTTP' if 'url' in config else 'STDIO',
+                               'status': 'FAILED', 'tools': [], 'error': error, 'config': config}
+
+    def health_counts(self) -> Tuple[int, int]:
+        """(정상 서버 수, 실패 서버 수). 연결에 실패해 에이전트에 들어가지 못한 서버도 실패로 셉니다."""
+        failed = sum(1 for status in self.statuses.values() if status.get('status') == 'FAILED')
+        return len(self.statuses) - failed, failed
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.checked_at
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """캐시된 서버 상태 목록. 최대 나이를 넘었으면 기다리지 않고 백그라운드 갱신을 시작합니다."""
+        if self.age > self.max_age:
+            self._start_refresh(list_tools=False)
+        return list(self.statuses.values())
+
+    async def refresh(self, list_tools: bool = False) -> None:
+        """모든 서버에 ping을 보내 상태를 갱신합니다. 이미 갱신 중이면 그 결과를 함께 기다립니다 (single-flight).
+
+        Args:
+            list_tools: True이면 열린 세션으로 도구 목록도 다시 가져옵니다.
+        """
+        await asyncio.shield(self._start_refresh(list_tools))
+
+    def _start_refresh(self, list_tools: bool) -> asyncio.Task:
+        # 진행 중인 갱신이 도구 목록을 가져오지 않는데 도구 목록이 필요하면 새로 시작
+        if (self._refreshing is None or self._refreshing.done()
+                or (list_tools and not self._refreshing_tools)):
+            self._refreshing = asyncio.create_task(self._refresh(list_tools))
+            self._refreshing_tools = list_tools
+        return self._refreshing
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.max_age)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"MCP 서버 상태 갱신 실패: {e}")
+
+    async def _refresh(self, list_tools: bool) -> None:
+        servers = list(self.servers.items())
+        results = await asyncio.gather(*(self._check(server, list_tools) for _, server in servers))
+        for (name, server), (error, tools) in zip(servers, results):
+            if self.servers.get(name) is not server:
+                # 확인하는 동안 설정 변경으로 제거/교체된 서버의 결과는 버림
+                continue
+            status = self.statuses.setdefault(name, {'name': name, 'type': 'Unknown', 'tools': [], 'config': {}})
+            if tools is not None:
+                self.tools[name] = tools
+            tool_names = [t['name'] for t in self.tools.get(name, [])]
+            new_status = 'FAILED' if error else ('SUCCESS' if tool_names else 'WARN')
+            if status.get('status') != new_status:
+                logging.info(f"MCP 서버 상태 변경: name={name}, {status.get('status')} -> {new_status}")
+            status.update(status=new_status, error=error, tools=tool_names)
+        self.checked_at = time.time()
+
+    async def _check(self, server, list_tools: bool):
+        """(오류 메시지 또는 None, 새 도구 목록 또는 None)."""
+        if getattr(server, 'dormant', False):
+            # 유휴 종료된 지연 시작 서버는 다음 도구 호출 때 다시 시작되므로 정상으로 봄
+            return None, None
+        try:
+            await server.ping(self.ping_timeout)
+            if not list_tools:
+                return None, None
+            tools = await asyncio.wait_for(server.list_tools(), timeout=self.ping_timeout * 2)
+            return None, [{"name": tool.name, "description": getattr(tool, 'description', None) or "No description available"}
+                          for tool in tools]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return str(e) or type(e).__name__, None
@@ -0,0 +1,342 @@
+import re
+import time
+import asyncio
+import logging
+import itertools
+from datetime import timedelta
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from telegram import Bot, Message
+from telegram.error import RetryAfter
+
+from .config import (
+    TELEGRAM_MAX_MESSAGE_LENGTH,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_PRIVATE_CHAT_RATE,
+    TELEGRAM_GROUP_CHAT_RATE,
+    TELEGRAM_MAX_CONCURRENT_SENDS,
+    TELEGRAM_MAX_RETRIES,
+    TELEGRAM_CHAT_IDLE_SECONDS,
+)
+
+# 전송 우선순위 (값이 작을수록 먼저 전송)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BROADCAST = 10
+
+# 문장 경계: 마침표/물음표/느낌표(전각 포함) 뒤의 공백
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def split_message(text: str, limit: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+    """긴 텍스트를 텔레그램 메시지 길이 제한에 맞게 나눕니다.
+
+    문단 → 줄 → 문장 경계 순으로 자르고, 그래도 긴 조각은 글자 수로 자릅니다.
+    """
+    text = text or ''
+    if len(text) <= limit:
+        return [text] if text.strip() else []
+
+    chunks: List[str] = []
+    _pack(text.split('\n\n'), '\n\n', limit, chunks)
+    return [c for c in chunks if c.strip()]
+
+
+def _pack(pieces: List[str], separator: str, limit: int, out: List[str]) -> None:
+    """조각들을 limit 이내로 이어 붙이고, 넘치는 조각은 더 작은 경계로 다시 나눕니다."""
+    current = ''
+    for piece in pieces:
+        if len(piece) > limit:
+            if current:
+                out.append(current)
+                current = ''
+            _split_oversized(piece, separator, limit, out)
+            continue
+
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if len(candidate) <= limit:
+            current = candidate
+        else:
+            out.append(current)
+            current = piece
+    if current:
+        out.append(current)
+
+
+def _split_oversized(piece: str, separator: str, limit: int, out: List[str]) -> None:
+    """limit를 넘는 단일 조각을 다음 단계 경계로 나눕니다."""
+    if separator == '\n\n':
+        _pack(piece.split('\n'), '\n', limit, out)
+    elif separator == '\n':
+        _pack(_SENTENCE_BOUNDARY.split(piece), ' ', limit, out)
+    else:
+        # 문장 하나가 limit보다 길면 글자 수로 자릅니다.
+        for i in range(0, len(piece), limit):
+            out.append(piece[i:i + limit])
+
+
+class TokenBucket:
+    """초당 rate개 토큰을 채우는 토큰 버킷 (최대 capacity개까지 누적)."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """RetryAfter 등으로 일정 시간 동안 토큰 발급을 멈춥니다."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    async def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기합니다. 대기자는 도착 순서대로 처리됩니다."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class _SendJob:
+    """큐에 들어가는 단일 전송 작업."""
+
+    __slots__ = ('chat_id', 'call', 'future', 'priority', 'rate_limited')
+
+    def __init__(self, chat_id: int, call: Callable[[], Awaitable[Any]], future: asyncio.Future,
+                 priority: int, rate_limited: bool = True):
+        self.chat_id = chat_id
+        self.call = call
+        self.future = future
+        self.priority = priority
+        self.rate_limited = rate_limited  # False면 채팅별 전송 한도를 거치지 않음 (메시지 삭제 등)
+
+
+class _ChatState:
+    """채팅 하나의 전송 한도(토큰 버킷)와 아직 전역 큐에 넣지 않은 작업."""
+
+    __slots__ = ('bucket', 'pending', 'pump', 'evict_handle')
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.pending: Deque[_SendJob] = deque()
+        self.pump: Optional[asyncio.Task] = None
+        self.evict_handle: Optional[asyncio.TimerHandle] = None
+
+
+class TelegramSendQueue:
+    """텔레그램 발신 요청을 한 곳에서 스케줄링하는 전송 큐.
+
+    - 전역/채팅별 토큰 버킷으로 Flood control 한도를 지킵니다.
+    - RetryAfter(429)를 받으면 지정된 시간만큼 쉬고 자동으로 재시도합니다.
+    - 대화형 응답이 브로드캐스트보다 먼저 전송되도록 우선순위를 둡니다.
+    - 같은 채팅의 메시지는 큐에 들어간 순서대로 전송됩니다.
+
+    채팅별 한도를 통과한 작업만 전역 우선순위 큐에 들어가므로, 그룹 채팅이나 긴 답변의
+    조각이 채팅별 한도를 기다리는 동안 전송 슬롯과 전역 토큰을 차지하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        private_chat_rate: float = TELEGRAM_PRIVATE_CHAT_RATE,
+        group_chat_rate: float = TELEGRAM_GROUP_CHAT_RATE,
+        max_concurrent_sends: int = TELEGRAM_MAX_CONCURRENT_SENDS,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+        chat_idle_seconds: float = TELEGRAM_CHAT_IDLE_SECONDS,
+    ):
+        self.bot = bot
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.max_retries = max_retries
+        self.chat_idle_seconds = chat_idle_seconds
+        self._global_bucket = TokenBucket(global_rate)
+        self._chats: Dict[int, _ChatState] = {}
+        self._send_slots = asyncio.Semaphore(max_concurrent_sends)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """디스패처 태스크를 시작합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self) -> None:
+        """남은 전송을 마무리하고 디스패처를 종료합니다."""
+        pumps = [state.pump for state in self._chats.values() if state.pump is not None]
+        if pumps:
+            await asyncio.gather(*pumps, return_exceptions=True)
+        await self._queue.join()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    async def send_message(self, chat_id: int, text: str,
+                           priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Message:
+        """단일 메시지를 전송합니다 (길이 제한 이내의 텍스트)."""
+        return await self.submit(
+            chat_id, lambda: self.bot.send_message(chat_id=chat_id, text=text, **kwargs), priority
+        )
+
+    async def send_text(self, chat_id: int, text: str,
+                        priority: int = PRIORITY_INTERACTIVE, **kwargs) -> List[Message]:
+        """긴 텍스트를 나눠 전송합니다.
+
+        모든 조각을 한 번에 큐에 넣어 앞 조각의 응답을 기다리지 않고 파이프라인으로 전송합니다.
+        """
+        futures = [
+            self._enqueue(
+                chat_id,
+                lambda chunk=chunk: self.bot.send_message(chat_id=chat_id, text=chunk, **kwargs),
+                priority,
+            )
+            for chunk in split_message(text)
+        ]
+        return list(await asyncio.gather(*futures))
+
+    async def delete_message(self, chat_id: int, message_id: int,
+                             priority: int = PRIORITY_INTERACTIVE) -> bool:
+        """메시지를 삭제합니다. 삭제는 채팅별 전송 한도에 포함되지 않으므로 다음 응답을 늦추지 않습니다."""
+        return await self._enqueue(
+            chat_id, lambda: self.bot.delete_message(chat_id=chat_id, message_id=message_id), priority,
+            rate_limited=False,
+        )
+
+    async def broadcast(self, chat_ids: List[int], text: str, **kwargs) -> Dict[int, Any]:
+        """여러 채팅에 같은 텍스트를 낮은 우선순위로 전송합니다.
+
+        Returns:
+            Dict[int, Any]: 채팅 ID → 전송된 메시지 목록 또는 발생한 예외
+        """
+        results = await asyncio.gather(
+            *(self.send_text(chat_id, text, priority=PRIORITY_BROADCAST, **kwargs) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        return dict(zip(chat_ids, results))
+
+    async def submit(self, chat_id: int, call: Callable[[], Awaitable[Any]],
+                     priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """임의의 Bot API 호출을 큐를 통해 실행하고 결과를 기다립니다."""
+        return await self._enqueue(chat_id, call, priority)
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _enqueue(self, chat_id: int, call: Callable[[], Awaitable[Any]], priority: int,
+                 rate_limited: bool = True) -> asyncio.Future:
+        if self._dispatcher is None:
+            raise RuntimeError("TelegramSendQueue가 시작되지 않았습니다. start()를 먼저 호출하세요.")
+        future = asyncio.get_running_loop().create_future()
+        state = self._chat_state(chat_id)
+        state.pending.append(_SendJob(chat_id, call, future, priority, rate_limited))
+        if state.pump is None:
+            state.pump = asyncio.create_task(self._pump_chat(chat_id, state))
+        return future
+
+    def _chat_state(self, chat_id: int) -> _ChatState:
+        state = self._chats.get(chat_id)
+        if state is None:
+            # 음수 chat_id는 그룹/채널 (분당 20개 제한)
+            rate = self.group_chat_rate if chat_id < 0 else self.private_chat_rate
+            state = _ChatState(TokenBucket(rate, capacity=1.0 if chat_id < 0 else None))
+            self._chats[chat_id] = state
+        elif state.evict_handle is not None:
+            state.evict_handle.cancel()
+            state.evict_handle = None
+        return state
+
+    async def _pump_chat(self, chat_id: int, state: _ChatState) -> None:
+        """채팅의 작업을 순서대로 채팅별 한도에 맞춰 전역 큐에 넣고, 전송이 끝나야 다음 작업을 넣습니다."""
+        try:
+            while state.pending:
+                job = state.pending[0]
+                if job.rate_limited:
+                    await state.bucket.acquire()
+                state.pending.popleft()
+                self._queue.put_nowait((job.priority, next(self._seq), job))
+                # 앞 작업이 끝난 뒤에 다음 작업을 넣어 같은 채팅의 조각 순서를 유지
+                await asyncio.wait({job.future})
+        finally:
+            state.pump = None
+            # 유휴 채팅은 일정 시간 뒤 정리 (그동안 버킷이 가득 차므로 새로 만들어도 한도는 같음)
+            state.evict_handle = asyncio.get_running_loop().call_later(
+                self.chat_idle_seconds, self._evict_chat, chat_id, state
+            )
+
+    def _evict_chat(self, chat_id: int, state: _ChatState) -> None:
+        if self._chats.get(chat_id) is state and state.pump is None and not state.pending:
+            del self._chats[chat_id]
+
+    async def _dispatch_loop(self) -> None:
+        """채팅별 한도를 통과한 작업을 우선순위 순서대로 꺼내 전역 토큰을 배정하고 전송 태스크를 띄웁니다."""
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                await self._send_slots.acquire()
+                await self._global_bucket.acquire()
+            except asyncio.CancelledError:
+                self._queue.task_done()
+                raise
+            task = asyncio.create_task(self._run_job(job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_job(self, job: _SendJob) -> None:
+        try:
+            result = await self._call_with_retry(job, self._chats[job.chat_id].bucket)
+            if not job.future.done():
+                job.future.set_result(result)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._send_slots.release()
+            self._queue.task_done()
+
+    async def _call_with_retry(self, job: _SendJob, bucket: TokenBucket) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return await job.call()
+            except RetryAfter as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                logging.warning(
+                    "텔레그램 Flood control: chat_id=%s, %.1f초 후 재시도 (%d/%d)",
+                    job.chat_id, retry_after, attempt, self.max_retries
+                )
+                # 어느 한도에 걸렸는지 알 수 없으므로 전역/채팅 버킷을 모두 멈춥니다.
+                self._global_bucket.pause(retry_after)
+                bucket.pause(retry_after)
+                await bucket.acquire()
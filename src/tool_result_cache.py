@@ -0,0 +1,121 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from mcp.types import CallToolResult
+
+from .config import TOOL_RESULT_CACHE_MAX_ENTRIES, TOOL_RESULT_CACHE_MAX_BYTES
+
+
+def arguments_hash(arguments: Optional[Dict[str, Any]]) -> str:
+    """인자 순서나 공백과 관계없이 같은 인자면 같은 값이 나오는 해시."""
+    payload = json.dumps(arguments or {}, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ToolResultCache:
+    """멱등(idempotent) MCP 도구의 호출 결과를 저장하는 크기 제한 LRU 캐시.
+
+    키는 (서버 이름, 도구 이름, 인자 해시)이고 항목마다 TTL이 있습니다. 같은 키의 호출이
+    동시에 들어오면 실제 호출은 한 번만 하고 결과를 함께 받습니다 (single-flight).
+    오류 결과(isError)는 저장하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = TOOL_RESULT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = TOOL_RESULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, int, CallToolResult]]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def get_or_call(self, server_name: str, tool_name: str, arguments: Optional[Dict[str, Any]],
+                          ttl: float, call: Callable[[], Awaitable[CallToolResult]]) -> CallToolResult:
+        key = (server_name, tool_name, arguments_hash(arguments))
+        stats = self._tool_stats(server_name, tool_name)
+
+        cached = self._get(key)
+        if cached is not None:
+            stats['hits'] += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats['coalesced'] += 1
+        else:
+            stats['misses'] += 1
+            # 먼저 요청한 쪽이 취소되어도 함께 기다리는 호출은 결과를 받도록 별도 태스크로 실행
+            task = asyncio.create_task(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_call_done(key, ttl, t))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """도구별 hit/miss 지표와 캐시 사용량."""
+        tools = {}
+        for name, s in self._stats.items():
+            lookups = s['hits'] + s['misses'] + s['coalesced']
+            tools[name] = {**s, 'hit_rate': round((s['hits'] + s['coalesced']) / lookups, 3) if lookups else 0.0}
+        return {'entries': len(self._entries), 'bytes': self._bytes, 'tools': tools}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def invalidate_server(self, server_name: str) -> None:
+        """서버 하나의 캐시 항목을 모두 제거합니다 (서버 설정이 바뀐 경우)."""
+        for key in [key for key in self._entries if key[0] == server_name]:
+            self._remove(key)
+
+    def _tool_stats(self, server_name: str, tool_name: str) -> Dict[str, int]:
+        return self._stats.setdefault(f"{server_name}/{tool_name}", {'hits': 0, 'misses': 0, 'coalesced': 0})
+
+    def _get(self, key) -> Optional[CallToolResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, result = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _on_call_done(self, key, ttl: float, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.isError:
+            return
+        size = len(result.model_dump_json())
+        if size > self.max_bytes:
+            logging.info(f"도구 결과가 너무 커서 캐시하지 않습니다: server={key[0]}, tool={key[1]}, bytes={size}")
+            return
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, result)
+        self._bytes += size
+        # 개수/용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+_tool_result_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """프로세스 공용 도구 결과 캐시 (여러 사용자와 턴이 함께 사용)."""
+    global _tool_result_cache
+    if _tool_result_cache is None:
+        _tool_result_cache = ToolResultCache()
+    return _tool_result_cache
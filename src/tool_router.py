@@ -0,0 +1,154 @@
+import re
+import math
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from agents.agent import Agent
+from agents.mcp import MCPServer
+from mcp.types import CallToolResult, Tool as MCPTool
+
+from .config import TOOL_ROUTER_ENABLED, TOOL_ROUTER_TOP_K, TOOL_ROUTER_MIN_TOOLS
+
+_WORD = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> List[str]:
+    """영문/숫자는 단어 단위, 한글은 단어와 2글자 단위(조사가 붙어도 매칭되도록)로 나눕니다."""
+    tokens = []
+    for word in _WORD.findall(text.replace('_', ' ').replace('-', ' ')):
+        word = word.lower()
+        tokens.append(word)
+        if _HANGUL.match(word) and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def tool_document(tool: MCPTool) -> str:
+    """검색 대상 문서: 도구 이름, 설명, 인자 이름/설명."""
+    parts = [tool.name, tool.description or '']
+    for name, prop in (tool.inputSchema or {}).get('properties', {}).items():
+        parts.append(name)
+        if isinstance(prop, dict):
+            parts.append(str(prop.get('description', '')))
+    return ' '.join(parts)
+
+
+class BM25Index:
+    """도구 문서에 대한 BM25 점수 계산기."""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_tokens = [Counter(tokenize(doc)) for doc in documents]
+        self.doc_lengths = [sum(tokens.values()) for tokens in self.doc_tokens]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        doc_freq = Counter(token for tokens in self.doc_tokens for token in tokens)
+        n = len(documents)
+        self.idf = {token: math.log(1 + (n - df + 0.5) / (df + 0.5)) for token, df in doc_freq.items()}
+
+    def scores(self, query: str) -> List[float]:
+        query_tokens = set(tokenize(query))
+        results = []
+        for tokens, length in zip(self.doc_tokens, self.doc_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            for token in query_tokens:
+                tf = tokens.get(token)
+                if tf:
+                    score += self.idf[token] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+class ToolSubsetServer(MCPServer):
+    """MCP 서버의 일부 도구만 보여주는 뷰. 연결은 원래 서버가 관리합니다."""
+
+    def __init__(self, server: MCPServer, tool_names: Set[str]):
+        self.server = server
+        self.tool_names = tool_names
+
+    @property
+    def name(self) -> str:
+        return self.server.name
+
+    async def connect(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def list_tools(self) -> List[MCPTool]:
+        return [tool for tool in await self.server.list_tools() if tool.name in self.tool_names]
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> CallToolResult:
+        return await self.server.call_tool(tool_name, arguments)
+
+
+class ToolRouter:
+    """메시지마다 관련 있는 도구 top-K만 골라 에이전트에 노출합니다.
+
+    모든 MCP 서버의 도구 스키마가 매 LLM 호출에 실리므로 서버가 늘수록 프롬프트 토큰과
+    도구 선택 지연이 커집니다. 라우터는 도구 이름/설명에 대한 BM25 점수로 도구를 고르고,
+    전체 도구 수가 min_tools 이하이거나 메시지와 맞는 도구가 하나도 없으면 전체 도구를 그대로 씁니다.
+    """
+
+    def __init__(self, top_k: int = TOOL_ROUTER_TOP_K, min_tools: int = TOOL_ROUTER_MIN_TOOLS,
+                 enabled: bool = TOOL_ROUTER_ENABLED):
+        self.top_k = top_k
+        self.min_tools = min_tools
+        self.enabled = enabled
+        self._signature: Optional[Tuple] = None
+        self._index: Optional[BM25Index] = None
+        self._entries: List[Tuple[int, str]] = []  # (서버 순번, 도구 이름)
+
+    async def select(self, servers: Sequence[MCPServer], query: str) -> Optional[Dict[int, Set[str]]]:
+        """서버 순번별로 노출할 도구 이름 집합을 반환합니다. 전체 도구를 써야 하면 None."""
+        if not self.enabled or not servers:
+            return None
+        tool_lists = await asyncio.gather(*(server.list_tools() for server in servers))
+        self._refresh_index(tool_lists)
+        if len(self._entries) <= max(self.min_tools, self.top_k):
+            return None
+
+        scores = self._index.scores(query)
+        ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:self.top_k]
+        ranked = [i for i in ranked if scores[i] > 0]
+        if not ranked:
+            return None
+
+        selection: Dict[int, Set[str]] = {}
+        for i in ranked:
+            server_index, tool_name = self._entries[i]
+            selection.setdefault(server_index, set()).add(tool_name)
+        return selection
+
+    async def route(self, agent: Agent, query: str) -> Agent:
+        """메시지에 맞는 도구만 가진 에이전트 복사본을 반환합니다. 라우팅하지 않으면 원래 에이전트."""
+        try:
+            selection = await self.select(agent.mcp_servers, query)
+        except Exception as e:
+            logging.warning(f"도구 라우팅 실패, 전체 도구 사용: {e}")
+            return agent
+        if selection is None:
+            return agent
+        logging.info(
+            f"도구 라우팅: {sum(len(names) for names in selection.values())}/{len(self._entries)}개 도구 선택"
+        )
+        return agent.clone(mcp_servers=[
+            ToolSubsetServer(server, selection[i])
+            for i, server in enumerate(agent.mcp_servers) if i in selection
+        ])
+
+    def _refresh_index(self, tool_lists: List[List[MCPTool]]) -> None:
+        # 도구 구성이 바뀐 경우에만 인덱스를 다시 만듦
+        signature = tuple(
+            tuple((tool.name, tool.description) for tool in tools) for tools in tool_lists
+        )
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self._entries = [(i, tool.name) for i, tools in enumerate(tool_lists) for tool in tools]
+        self._index = BM25Index([tool_document(tool) for tools in tool_lists for tool in tools])
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from mcp.types import Tool as MCPTool
+
+from .config import TOOL_SCHEMA_CACHE_PATH, TOOL_SCHEMA_CACHE_ENABLED
+
+# 도구 스키마에 영향을 주지 않는 실행 옵션 (바뀌어도 캐시를 유지)
+RUNTIME_CONFIG_KEYS = ('replicas', 'lazy', 'idle_timeout', 'tool_cache', 'hedge_tools', 'in_process')
+
+
+def config_hash(server_config: Dict[str, Any]) -> str:
+    """서버 설정 항목의 해시. 실행 옵션은 제외합니다."""
+    entry = {k: v for k, v in server_config.items() if k not in RUNTIME_CONFIG_KEYS}
+    payload = json.dumps(entry, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def dump_tools(tools: List[MCPTool]) -> List[Dict[str, Any]]:
+    return [tool.model_dump(mode='json', exclude_none=True) for tool in tools]
+
+
+class ToolSchemaCache:
+    """MCP 서버별 도구 스키마를 디스크에 저장하는 캐시.
+
+    항목은 서버 이름으로 저장되고 설정 항목 해시(config_hash)와 서버 버전을 함께 기록합니다.
+    설정이 바뀌면 조회되지 않으며, 연결 후 서버 버전이나 도구 목록이 다르면 새 값으로 교체됩니다.
+    """
+
+    def __init__(self, path: str = TOOL_SCHEMA_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()  # Flask 스레드와 이벤트 루프에서 함께 사용
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def get(self, server_config: Dict[str, Any]) -> Optional[List[MCPTool]]:
+        """설정이 일치하는 캐시 항목의 도구 목록. 없으면 None."""
+        entry = self._entry(server_config)
+        if entry is None:
+            return None
+        try:
+            return [MCPTool.model_validate(tool) for tool in entry['tools']]
+        except Exception as e:
+            logging.warning(f"도구 스키마 캐시 항목을 읽을 수 없습니다: name={server_config.get('name')}, error={e}")
+            return None
+
+    def matches(self, server_config: Dict[str, Any], server_version: Optional[str],
+                tools: List[MCPTool]) -> bool:
+        """캐시 항목이 실제 서버 버전/도구 목록과 일치하는지 확인합니다."""
+        entry = self._entry(server_config)
+        return (
+            entry is not None
+            and entry.get('server_version') == server_version
+            and entry.get('tools') == dump_tools(tools)
+        )
+
+    def store(self, server_config: Dict[str, Any], server_version: Optional[str],
+              tools: List[MCPTool]) -> None:
+        if self.matches(server_config, server_version, tools):
+            return
+        entry = {
+            'config_hash': config_hash(server_config),
+            'server_version': server_version,
+            'tools': dump_tools(tools),
+            'cached_at': time.time(),
+        }
+        with self._lock:
+            entries = self._load()
+            entries[server_config.get('name')] = entry
+            self._save(entries)
+
+    def invalidate(self, server_config: Dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.pop(server_config.get('name'), None) is not None:
+                self._save(entries)
+
+    def _entry(self, server_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._load().get(server_config.get('name'))
+        if not entry or entry.get('config_hash') != config_hash(server_config):
+            return None
+        return entry
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (json.JSONDecodeError, OSError) as e:
+                logging.warning(f"도구 스키마 캐시 파일을 읽을 수 없어 비웁니다: {self.path}, error={e}")
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        # 임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 캐시 파일이 깨지지 않도록 함
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"도구 스키마 캐시 저장 실패: {self.path}, error={e}")
+
+
+_tool_schema_cache: Optional[ToolSchemaCache] = None
+
+
+def get_tool_schema_cache() -> Optional[ToolSchemaCache]:
+    """프로세스 공용 도구 스키마 캐시. TOOL_SCHEMA_CACHE_ENABLED가 false이면 None."""
+    global _tool_schema_cache
+    if not TOOL_SCHEMA_CACHE_ENABLED:
+        return None
+    if _tool_schema_cache is None:
+        _tool_schema_cache = ToolSchemaCache()
+    return _tool_schema_cache
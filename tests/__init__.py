@@ -0,0 +1,9 @@
+import os
+
+# src.config는 import 시점에 설정을 검증하므로 테스트용 키를 미리 채워 둠
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+# 테스트가 cache/의 실제 도구 스키마 캐시를 건드리지 않도록 끔
+os.environ.setdefault("TOOL_SCHEMA_CACHE_ENABLED", "false")
+# 테스트 실행이 logs/runs.jsonl에 기록되지 않도록 끔
+os.environ.setdefault("RUN_METRICS_ENABLED", "false")
@@ -0,0 +1,59 @@
+import asyncio
+from typing import List, Optional
+
+from mcp.types import CallToolResult, TextContent, Tool as MCPTool
+
+
+def make_tool(name: str, description: str = "") -> MCPTool:
+    return MCPTool(name=name, description=description, inputSchema={"type": "object", "properties": {}})
+
+
+def text_result(text: str, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+class FakeSession:
+    def __init__(self, server: "FakeMCPServer"):
+        self.server = server
+
+    async def send_ping(self):
+        if self.server.ping_error is not None:
+            raise self.server.ping_error
+
+
+class FakeMCPServer:
+    """연결/도구 호출을 흉내 내는 내부 MCP 서버 (MCPServerStdio 대신 사용)."""
+
+    def __init__(self, tools: Optional[List[MCPTool]] = None, connect_delay: float = 0.0,
+                 call_delay: float = 0.0, connect_error: Optional[BaseException] = None):
+        self.tools = tools if tools is not None else [make_tool("search")]
+        self.connect_delay = connect_delay
+        self.call_delay = call_delay
+        self.connect_error = connect_error
+        self.call_error: Optional[BaseException] = None
+        self.ping_error: Optional[BaseException] = None
+        self.session = None
+        self.connect_count = 0
+        self.cleanup_count = 0
+        self.calls = []
+
+    async def connect(self):
+        self.connect_count += 1
+        await asyncio.sleep(self.connect_delay)
+        if self.connect_error is not None:
+            raise self.connect_error
+        self.session = FakeSession(self)
+
+    async def cleanup(self):
+        self.cleanup_count += 1
+        self.session = None
+
+    async def list_tools(self):
+        return list(self.tools)
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls.append((tool_name, arguments))
+        await asyncio.sleep(self.call_delay)
+        if self.call_error is not None:
+            raise self.call_error
+        return text_result(f"{tool_name}:{len(self.calls)}")
@@ -0,0 +1,36 @@
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'app.py')
+MODULE_NAME = "frontend_app_under_test"
+
+
+def load_frontend_app():
+    """frontend/app.py를 모듈로 불러옵니다.
+
+    app.py는 import 시점에 .env를 만들고 작업 디렉터리와 환경 변수를 바꾸므로,
+    불러온 뒤 새로 생긴 .env를 지우고 작업 디렉터리와 환경 변수를 되돌립니다.
+    """
+    if MODULE_NAME in sys.modules:
+        return sys.modules[MODULE_NAME]
+
+    env_path = os.path.join(os.path.dirname(os.path.dirname(APP_PATH)), '.env')
+    env_existed = os.path.exists(env_path)
+    saved_cwd = os.getcwd()
+    saved_environ = dict(os.environ)
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        if not env_existed and os.path.exists(env_path):
+            os.remove(env_path)
+    sys.modules[MODULE_NAME] = module
+    return module
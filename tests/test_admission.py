@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+
+from src.admission import AdmissionController, AdmissionRejected
+
+
+class AdmissionControllerTest(unittest.IsolatedAsyncioTestCase):
+    def controller(self, **kwargs):
+        options = dict(max_in_flight=1, max_queue=1, per_user_limit=2, slo_seconds=10.0, latency_window=10)
+        options.update(kwargs)
+        return AdmissionController(**options)
+
+    async def test_idle_controller_admits_despite_slow_history(self):
+        admission = self.controller()
+        admission._latencies.extend([60.0] * 5)  # SLO보다 느린 실행 기록만 남은 상태
+
+        async with admission.admit("user"):
+            pass
+
+        self.assertEqual(admission.admitted_count, 1)
+        self.assertEqual(admission.rejected_count, 0)
+
+    async def test_busy_controller_rejects_when_estimate_exceeds_slo(self):
+        admission = self.controller(max_in_flight=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.admit("first"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        admission._latencies.extend([60.0] * 5)  # 실행 중에 SLO보다 느린 기록이 쌓인 상태
+        with self.assertRaises(AdmissionRejected) as raised:
+            async with admission.admit("second"):
+                pass
+        self.assertIn("SLO", raised.exception.reason)
+        release.set()
+        await holder
+
+    async def test_per_user_limit(self):
+        admission = self.controller(max_in_flight=3, per_user_limit=1)
+        release = asyncio.Event()
+
+        async def hold(user_id):
+            async with admission.admit(user_id):
+                await release.wait()
+
+        holder = asyncio.create_task(hold("alice"))
+        await asyncio.sleep(0)
+        with self.assertRaises(AdmissionRejected):
+            async with admission.admit("alice"):
+                pass
+        async with admission.admit("bob"):
+            pass
+        release.set()
+        await holder
+        self.assertEqual(admission.stats()['in_flight'], 0)
+
+    async def test_queue_hands_slot_to_waiter_and_rejects_when_full(self):
+        admission = self.controller()
+        release = asyncio.Event()
+        order = []
+
+        async def run(user_id):
+            async with admission.admit(user_id):
+                order.append(user_id)
+                await release.wait()
+
+        first = asyncio.create_task(run("a"))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(run("b"))
+        await asyncio.sleep(0)
+        with self.assertRaises(AdmissionRejected) as raised:
+            async with admission.admit("c"):
+                pass
+        self.assertIn("대기열", raised.exception.reason)
+
+        release.set()
+        await asyncio.gather(first, queued)
+        self.assertEqual(order, ["a", "b"])
+        self.assertEqual(admission.stats()['in_flight'], 0)
+        self.assertEqual(admission.stats()['queued'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import unittest
+
+from src.agent_setup import connect_servers, setup_agent_and_servers
+from src.managed_server import ManagedMCPServer
+from tests.fakes import FakeMCPServer, make_tool
+
+
+class ConnectServersTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        for server in getattr(self, 'servers', []):
+            await server.cleanup()
+
+    async def test_servers_connect_concurrently(self):
+        self.servers = [ManagedMCPServer(lambda: FakeMCPServer(connect_delay=0.2), f"s{i}") for i in range(3)]
+        start = time.perf_counter()
+        errors = await connect_servers(self.servers, timeout=5.0)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(errors, [None, None, None])
+        for server in self.servers:
+            self.assertEqual(server.tool_count, 1)
+            self.assertGreaterEqual(server.startup_ms, 200.0)
+
+    async def test_failures_are_reported_in_server_order(self):
+        inner = FakeMCPServer(tools=[make_tool("a"), make_tool("b")])
+        self.servers = [
+            ManagedMCPServer(lambda: FakeMCPServer(connect_error=ConnectionError("refused")), "broken"),
+            ManagedMCPServer(lambda: inner, "ok"),
+            ManagedMCPServer(lambda: FakeMCPServer(connect_delay=1.0), "slow"),
+        ]
+        errors = await connect_servers(self.servers, timeout=0.2)
+        self.assertIsInstance(errors[0], ConnectionError)
+        self.assertIsNone(errors[1])
+        self.assertIsInstance(errors[2], TimeoutError)
+        self.assertEqual(self.servers[1].tool_count, 2)
+        self.assertIsNone(self.servers[2].server.session)
+
+
+    async def test_setup_reuses_servers_connected_by_probe(self):
+        probed = ManagedMCPServer(FakeMCPServer, "probed")
+        await probed.connect()
+        probed.startup_ms, probed.tool_count = 10.0, 1  # check_server_connection이 기록하는 값
+        self.servers = [probed]
+        available = [{'config': {'name': 'probed', 'command': 'fake'}, 'connected': True, 'server': probed}]
+
+        agent, mcp_servers, server_names = await setup_agent_and_servers(available)
+
+        self.assertEqual(mcp_servers, [probed])
+        self.assertEqual(server_names, ["probed"])
+        self.assertEqual(probed.server.connect_count, 1)
+        self.assertIs(agent.mcp_servers[0], probed)
+
+
+if __name__ == '__main__':
+    unittest.main()
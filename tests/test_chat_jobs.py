@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from src.admission import AdmissionRejected
+from src.chat_jobs import ChatJobStore
+
+
+class ChatJobStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_job_runs_and_reports_result(self):
+        store = ChatJobStore(ttl=60, max_entries=10)
+
+        async def run():
+            return "answer"
+
+        job, created = store.submit("client", run)
+        self.assertTrue(created)
+        self.assertTrue(await job.wait(1.0))
+        self.assertEqual(job.to_dict()['status'], "done")
+        self.assertEqual(job.response, "answer")
+        self.assertIs(store.get(job.job_id), job)
+
+    async def test_same_idempotency_key_returns_existing_job(self):
+        store = ChatJobStore(ttl=60, max_entries=10)
+        calls = []
+
+        async def run():
+            calls.append(1)
+            return "answer"
+
+        first, created = store.submit("client", run, idempotency_key="k")
+        second, created_again = store.submit("client", run, idempotency_key="k")
+        other, created_other = store.submit("other-client", run, idempotency_key="k")
+        await asyncio.gather(first.wait(1.0), other.wait(1.0))
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertIs(first, second)
+        self.assertTrue(created_other)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(store.stats()['deduplicated'], 1)
+
+    async def test_rejected_and_failed_runs(self):
+        store = ChatJobStore(ttl=60, max_entries=10)
+
+        async def rejected():
+            raise AdmissionRejected("대기열 가득 참")
+
+        async def failed():
+            raise RuntimeError("boom")
+
+        rejected_job, _ = store.submit("client", rejected)
+        failed_job, _ = store.submit("client", failed)
+        with self.assertLogs(level='ERROR'):
+            await asyncio.gather(rejected_job.wait(1.0), failed_job.wait(1.0))
+
+        self.assertEqual(rejected_job.status, "rejected")
+        self.assertEqual(rejected_job.error, "대기열 가득 참")
+        self.assertEqual(failed_job.status, "error")
+        self.assertIn("boom", failed_job.error)
+
+    async def test_finished_jobs_expire_after_ttl(self):
+        store = ChatJobStore(ttl=0, max_entries=10)
+
+        async def run():
+            return "answer"
+
+        job, _ = store.submit("client", run, idempotency_key="k")
+        await job.wait(1.0)
+        self.assertIsNone(store.get(job.job_id))
+        # 만료된 작업의 멱등 키는 새 작업으로 다시 쓸 수 있음
+        again, created = store.submit("client", run, idempotency_key="k")
+        self.assertTrue(created)
+        await again.wait(1.0)
+
+    async def test_max_entries_evicts_oldest_finished_but_keeps_running(self):
+        store = ChatJobStore(ttl=60, max_entries=2)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        running, _ = store.submit("client", slow)
+        done, _ = store.submit("client", fast)
+        await done.wait(1.0)
+        newest, _ = store.submit("client", fast)
+        await newest.wait(1.0)
+
+        self.assertIs(store.get(running.job_id), running)
+        self.assertIsNone(store.get(done.job_id))
+        self.assertIs(store.get(newest.job_id), newest)
+        self.assertEqual(store.stats()['evicted'], 1)
+
+        release.set()
+        await running.wait(1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
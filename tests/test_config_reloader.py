@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.config_reloader import ConfigReloader, diff_server_configs, _servers_by_name
+from src.managed_server import ManagedMCPServer
+from src.mcp_supervisor import MCPSupervisor
+from tests.fakes import FakeMCPServer
+
+
+class DiffServerConfigsTest(unittest.TestCase):
+    def test_added_changed_removed(self):
+        old = {
+            'keep': {'name': 'keep', 'command': 'python', 'args': ['a.py']},
+            'edit': {'name': 'edit', 'command': 'python', 'args': ['b.py']},
+            'drop': {'name': 'drop', 'url': 'http://localhost:8000/mcp'},
+        }
+        new = {
+            'keep': {'name': 'keep', 'command': 'python', 'args': ['a.py']},
+            'edit': {'name': 'edit', 'command': 'python', 'args': ['b.py'], 'env': {'X': '1'}},
+            'new': {'name': 'new', 'command': 'node', 'args': ['c.js']},
+        }
+        self.assertEqual(diff_server_configs(old, new), (['new'], ['edit'], ['drop']))
+
+    def test_key_order_does_not_count_as_change(self):
+        old = {'s': {'name': 's', 'command': 'python', 'env': {'A': '1', 'B': '2'}}}
+        new = {'s': {'env': {'B': '2', 'A': '1'}, 'command': 'python', 'name': 's'}}
+        self.assertEqual(diff_server_configs(old, new), ([], [], []))
+
+    def test_servers_without_name_are_ignored(self):
+        config = {'mcpServers': [{'name': 'a', 'command': 'x'}, {'command': 'y'}]}
+        self.assertEqual(list(_servers_by_name(config)), ['a'])
+        self.assertEqual(_servers_by_name({}), {})
+
+
+class ConfigReloaderTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.mcp_path = os.path.join(tmp.name, "mcp_config.json")
+        self.llm_path = os.path.join(tmp.name, "llm_config.json")
+        self.configs = [{'name': 'keep', 'command': 'python', 'args': ['a.py']},
+                        {'name': 'edit', 'command': 'python', 'args': ['b.py']},
+                        {'name': 'drop', 'command': 'python', 'args': ['c.py']}]
+        self.write_config(self.configs)
+        self.connect_errors = {}
+        servers = [await self.connected_server(config) for config in self.configs]
+        self.agent = SimpleNamespace(mcp_servers=servers, model=None)
+        self.supervisor = MCPSupervisor(servers, interval=60.0)
+        self.supervisor.start()
+        self.addAsyncCleanup(self.supervisor.stop)
+        self.reloader = ConfigReloader(self.agent, self.supervisor, mcp_config_path=self.mcp_path,
+                                       llm_config_path=self.llm_path)
+        self.addAsyncCleanup(self.reloader.stop)
+        patcher = mock.patch('src.config_reloader.create_mcp_server', self.create_server)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_config(self, configs):
+        with open(self.mcp_path, 'w', encoding='utf-8') as f:
+            json.dump({'mcpServers': configs}, f)
+
+    def create_server(self, config):
+        error = self.connect_errors.get(config['name'])
+        server = ManagedMCPServer(lambda: FakeMCPServer(connect_error=error), config['name'], config)
+        self.addAsyncCleanup(server.cleanup)
+        return server
+
+    async def connected_server(self, config):
+        server = self.create_server(config)
+        await server.connect()
+        return server
+
+    async def test_only_changed_servers_are_reconnected(self):
+        keep, edit, drop = self.agent.mcp_servers
+        self.write_config([self.configs[0], {**self.configs[1], 'env': {'X': '1'}},
+                           {'name': 'new', 'command': 'node', 'args': ['d.js']}])
+
+        summary = await self.reloader.reload()
+        await self.reloader.stop()  # 교체/제거된 서버의 종료를 기다림
+
+        self.assertEqual((summary['added'], summary['changed'], summary['removed']), (['new'], ['edit'], ['drop']))
+        names = [server.name for server in self.agent.mcp_servers]
+        self.assertEqual(names, ['keep', 'edit', 'new'])
+        self.assertIs(self.agent.mcp_servers[0], keep)
+        self.assertIsNot(self.agent.mcp_servers[1], edit)
+        self.assertTrue(keep.server_connected)
+        self.assertFalse(edit.server_connected)
+        self.assertFalse(drop.server_connected)
+        self.assertEqual(sorted(self.supervisor.stats()), ['edit', 'keep', 'new'])
+        self.assertEqual(self.reloader.reload_count, 1)
+
+    async def test_failed_connect_keeps_existing_server(self):
+        edit = self.agent.mcp_servers[1]
+        self.connect_errors['edit'] = ConnectionError("refused")
+        self.write_config([self.configs[0], {**self.configs[1], 'args': ['b2.py']}, self.configs[2]])
+
+        with self.assertLogs(level='ERROR'):
+            summary = await self.reloader.reload()
+
+        self.assertIn('edit', summary['failed'])
+        self.assertIs(self.agent.mcp_servers[1], edit)
+        self.assertTrue(edit.server_connected)
+        # 실패한 변경은 다음 확인 때 다시 시도
+        self.connect_errors.clear()
+        summary = await self.reloader.reload()
+        self.assertEqual(summary['changed'], ['edit'])
+
+    async def test_unchanged_files_do_nothing(self):
+        summary = await self.reloader.reload()
+        self.assertEqual((summary['added'], summary['changed'], summary['removed']), ([], [], []))
+        self.assertEqual(self.reloader.reload_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
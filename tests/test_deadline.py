@@ -0,0 +1,145 @@
+import asyncio
+import contextvars
+import unittest
+
+from mcp.types import CallToolResult, TextContent
+
+from src.deadline import (
+    WRAP_UP_INSTRUCTION,
+    DeadlineAwareModel,
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+)
+from src.managed_server import ManagedMCPServer
+
+
+class FakeModel:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        self.calls.append((system_instructions, tools))
+        await asyncio.sleep(self.delay)
+        return "response"
+
+
+_span = contextvars.ContextVar("span", default=None)
+
+
+class FakeStreamModel:
+    """이벤트 사이에 contextvar를 설정/해제하는 스트림 (Agents SDK의 tracing span과 같은 방식)."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, *, previous_response_id=None):
+        token = _span.set("span")
+        try:
+            for index in range(3):
+                await asyncio.sleep(self.delay)
+                yield index
+        finally:
+            _span.reset(token)
+
+
+class FakeServer:
+    def __init__(self):
+        self.calls = []
+        self.session = object()  # 연결된 상태
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls.append(tool_name)
+        return CallToolResult(content=[TextContent(type="text", text="ok")])
+
+
+async def _current():
+    return current_deadline()
+
+
+def call_model(model, tools):
+    return model.get_response("system", "input", None, tools, None, [], None)
+
+
+class DeadlineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_timeout_is_capped_by_remaining_budget(self):
+        with deadline_scope(10.0) as deadline:
+            self.assertEqual(deadline.timeout(5.0), 5.0)
+            self.assertAlmostEqual(deadline.timeout(60.0), 10.0, delta=0.1)
+            self.assertAlmostEqual(deadline.timeout(60.0, reserve=4.0), 6.0, delta=0.1)
+            self.assertEqual(deadline.timeout(60.0, reserve=20.0), 0.0)
+
+    async def test_scope_propagates_to_tasks_and_resets(self):
+        self.assertIsNone(current_deadline())
+        with deadline_scope(30.0) as deadline:
+            seen = await asyncio.create_task(_current())
+            self.assertIs(seen, deadline)
+        self.assertIsNone(current_deadline())
+
+
+class DeadlineAwareModelTest(unittest.IsolatedAsyncioTestCase):
+    async def test_without_deadline_passes_through(self):
+        inner = FakeModel()
+        self.assertEqual(await call_model(DeadlineAwareModel(inner), ["tool"]), "response")
+        self.assertEqual(inner.calls, [("system", ["tool"])])
+
+    async def test_wrap_up_removes_tools(self):
+        inner = FakeModel()
+        with deadline_scope(5.0):  # DEADLINE_WRAP_UP_SECONDS보다 적게 남음
+            await call_model(DeadlineAwareModel(inner), ["tool"])
+        self.assertEqual(inner.calls, [("system" + WRAP_UP_INSTRUCTION, [])])
+
+    async def test_slow_model_raises_deadline_exceeded(self):
+        with deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceeded):
+                await call_model(DeadlineAwareModel(FakeModel(delay=1.0)), [])
+
+    async def test_expired_deadline_skips_call(self):
+        inner = FakeModel()
+        with deadline_scope(0.0):
+            with self.assertRaises(DeadlineExceeded):
+                await call_model(DeadlineAwareModel(inner), [])
+        self.assertEqual(inner.calls, [])
+
+
+class DeadlineAwareStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def stream(self, model):
+        return [event async for event in model.stream_response("system", "input", None, [], None, [], None)]
+
+    async def test_stream_keeps_context_of_current_task(self):
+        with deadline_scope(60.0):
+            events = await self.stream(DeadlineAwareModel(FakeStreamModel()))
+        self.assertEqual(events, [0, 1, 2])
+
+    async def test_slow_stream_raises_deadline_exceeded(self):
+        with deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceeded):
+                await self.stream(DeadlineAwareModel(FakeStreamModel(delay=1.0)))
+        # 시간 초과 후에도 현재 태스크는 취소된 상태로 남지 않음
+        await asyncio.sleep(0)
+        self.assertEqual(asyncio.current_task().cancelling(), 0)
+
+
+class ManagedServerDeadlineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_tool_call_skipped_when_budget_is_below_reserve(self):
+        inner = FakeServer()
+        server = ManagedMCPServer(lambda: inner, "fake")
+        with deadline_scope(5.0):  # DEADLINE_FINAL_ANSWER_RESERVE_SECONDS보다 적게 남음
+            result = await server.call_tool("search", {})
+        self.assertTrue(result.isError)
+        self.assertEqual(inner.calls, [])
+
+    async def test_tool_call_runs_within_budget(self):
+        inner = FakeServer()
+        server = ManagedMCPServer(lambda: inner, "fake")
+        with deadline_scope(60.0):
+            result = await server.call_tool("search", {})
+        self.assertFalse(result.isError)
+        self.assertEqual(inner.calls, ["search"])
+
+
+if __name__ == '__main__':
+    unittest.main()
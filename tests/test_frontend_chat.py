@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src.run_metrics import RunRecord
+from src.server_health import ServerHealthMonitor
+
+from tests.frontend_app import load_frontend_app
+
+
+class ChatEndpointTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_module = load_frontend_app()
+        # with 블록 없이 만들어 lifespan(에이전트 초기화)을 실행하지 않음
+        cls.client = TestClient(cls.app_module.app)
+
+    def test_invalid_json_is_rejected(self):
+        response = self.client.post('/chat', content=b"not json", headers={'content-type': 'application/json'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_object_body_is_rejected(self):
+        response = self.client.post('/chat', json=["hello"])
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_string_message_is_rejected(self):
+        for path in ('/chat', '/chat/stream', '/api/jobs'):
+            for message in (123, None, ["hi"], {'text': "hi"}):
+                response = self.client.post(path, json={'message': message})
+                self.assertEqual(response.status_code, 400, (path, message))
+
+    def test_empty_message_is_rejected(self):
+        response = self.client.post('/chat', json={'message': "   "})
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_ready_agent_returns_503(self):
+        self.assertFalse(self.app_module.agent_ready)
+        response = self.client.post('/chat', json={'message': "hello"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_stream_validates_like_chat(self):
+        self.assertEqual(self.client.post('/chat/stream', json={'message': ""}).status_code, 400)
+        self.assertEqual(self.client.post('/chat/stream', json={'message': "hello"}).status_code, 503)
+
+    def test_sse_event_format(self):
+        event = self.app_module.sse_event('token', {'delta': "안녕"})
+        self.assertEqual(event, 'event: token\ndata: {"delta": "안녕"}\n\n')
+
+    def test_jobs_validate_like_chat_and_unknown_job_is_404(self):
+        self.assertEqual(self.client.post('/api/jobs', json={'message': "hello"}).status_code, 503)
+        self.assertEqual(self.client.get('/api/jobs/missing').status_code, 404)
+
+    def test_config_endpoint_runs_without_agent(self):
+        response = self.client.get('/api/config')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), dict)
+
+
+class EtagResponseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_module = load_frontend_app()
+
+    def request(self, if_none_match=None):
+        headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+        return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers})
+
+    def test_matching_etag_returns_304(self):
+        first = self.app_module.etag_json_response(self.request(), {'a': 1})
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        again = self.app_module.etag_json_response(self.request(etag), {'a': 1})
+        self.assertEqual(again.status_code, 304)
+        changed = self.app_module.etag_json_response(self.request(etag), {'a': 2})
+        self.assertEqual(changed.status_code, 200)
+
+    def test_etag_source_ignores_other_fields(self):
+        first = self.app_module.etag_json_response(self.request(), {'v': 1, 'uptime': 1.0}, etag_source={'v': 1})
+        second = self.app_module.etag_json_response(self.request(), {'v': 1, 'uptime': 2.0}, etag_source={'v': 1})
+        self.assertEqual(first.headers['ETag'], second.headers['ETag'])
+
+
+class FakeSupervisor:
+    def __init__(self):
+        self.uptime = 1.0
+
+    def stats(self):
+        self.uptime += 1.0  # 호출마다 바뀌는 지표
+        return {'search': {'healthy': True, 'uptime_seconds': self.uptime, 'outstanding': int(self.uptime),
+                           'latency': {'p50_ms': self.uptime * 10}}}
+
+
+class ServerStatusEtagTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_module = load_frontend_app()
+        cls.client = TestClient(cls.app_module.app)
+
+    def setUp(self):
+        statuses = [{'name': "search", 'type': "STDIO", 'status': "SUCCESS", 'error': None, 'tools': ["search"]},
+                    {'name': "news", 'type': "HTTP", 'status': "FAILED", 'error': "refused", 'tools': []}]
+        self.monitor = ServerHealthMonitor([], statuses, {}, max_age=60.0)
+        for name, value in (('health_monitor', self.monitor), ('supervisor', FakeSupervisor())):
+            patcher = mock.patch.object(self.app_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, etag=None):
+        return self.client.get('/api/server-status', headers={'If-None-Match': etag} if etag else {})
+
+    def test_changing_metrics_keep_the_etag(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['active_servers'][0]['uptime_seconds'], 2.0)
+        self.app_module.get_run_recorder().finish(RunRecord("test"))
+        self.monitor.checked_at += 10.0
+        self.assertEqual(self.get(first.headers['ETag']).status_code, 304)
+
+    def test_health_change_updates_the_etag(self):
+        etag = self.get().headers['ETag']
+        self.monitor.statuses["news"].update(status="SUCCESS", error=None, tools=["news"])
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['active_count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.managed_server import ManagedMCPServer
+from src.server_health import ServerHealthMonitor
+from tests.fakes import FakeMCPServer
+from tests.frontend_app import load_frontend_app
+
+GLOBALS = ('current_generation', 'main_agent', 'mcp_servers', 'agent_ready', 'supervisor', 'health_monitor',
+           'all_server_status', 'last_server_status_check', 'cached_mcp_tools', 'init_task')
+
+
+class AgentGenerationTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_module = load_frontend_app()
+
+    async def asyncSetUp(self):
+        # swap_generation이 바꾸는 모듈 전역 변수를 테스트가 끝나면 되돌림
+        for name in GLOBALS:
+            patcher = mock.patch.object(self.app_module, name, getattr(self.app_module, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def make_generation(self, name="agent", statuses=()):
+        server = ManagedMCPServer(FakeMCPServer, name)
+        await server.connect()
+        self.addAsyncCleanup(server.cleanup)
+        monitor = ServerHealthMonitor([server], [{'name': n, 'status': s} for n, s in statuses], {})
+        return self.app_module.AgentGeneration(name, [server], None, monitor)
+
+    async def test_retire_waits_for_in_flight_runs(self):
+        generation = await self.make_generation()
+        server = generation.servers[0]
+        with generation.use() as agent:
+            self.assertEqual(agent, "agent")
+            retiring = asyncio.create_task(generation.retire(drain_timeout=5.0))
+            await asyncio.sleep(0.05)
+            self.assertFalse(retiring.done())
+            self.assertTrue(server.server_connected)
+        await asyncio.wait_for(retiring, timeout=1.0)
+        self.assertFalse(server.server_connected)
+
+    async def test_retire_closes_anyway_after_drain_timeout(self):
+        generation = await self.make_generation()
+        with generation.use():
+            await generation.retire(drain_timeout=0.05)
+            self.assertFalse(generation.servers[0].server_connected)
+
+    async def test_initialize_swaps_in_new_generation_and_retires_old(self):
+        old = await self.make_generation("old")
+        new = await self.make_generation("new")
+        self.app_module.swap_generation(old, [], {})
+
+        async def build():
+            return new, [{'name': "new"}], {"new": []}
+
+        with mock.patch.object(self.app_module, 'build_agent_generation', build):
+            self.assertTrue(await self.app_module.initialize_agent())
+        self.addAsyncCleanup(new.health_monitor.stop)
+
+        self.assertIs(self.app_module.current_generation, new)
+        self.assertEqual(self.app_module.main_agent, "new")
+        await asyncio.gather(*self.app_module.retiring_tasks)
+        self.assertFalse(old.servers[0].server_connected)
+        self.assertTrue(new.servers[0].server_connected)
+
+    async def test_failed_initialize_keeps_previous_generation(self):
+        old = await self.make_generation("old")
+        self.app_module.swap_generation(old, [], {})
+
+        async def build():
+            raise ConnectionError("no servers")
+
+        with mock.patch.object(self.app_module, 'build_agent_generation', build):
+            self.assertFalse(await self.app_module.initialize_agent())
+        self.assertIs(self.app_module.current_generation, old)
+        self.assertTrue(old.servers[0].server_connected)
+
+    async def test_unhealthy_new_generation_is_not_swapped_in(self):
+        old = await self.make_generation("old", statuses=[("search", "SUCCESS"), ("news", "SUCCESS")])
+        new = await self.make_generation("new", statuses=[("search", "SUCCESS"), ("news", "FAILED")])
+        self.app_module.swap_generation(old, [], {})
+
+        async def build():
+            return new, [], {}
+
+        with mock.patch.object(self.app_module, 'build_agent_generation', build):
+            self.assertFalse(await self.app_module.initialize_agent())
+        self.assertIs(self.app_module.current_generation, old)
+        self.assertFalse(new.servers[0].server_connected)
+
+    def test_health_gate_allows_failures_without_fewer_healthy_servers(self):
+        def generation(name):
+            statuses = [{'name': "search", 'status': "SUCCESS"}, {'name': "news", 'status': "FAILED"}]
+            return self.app_module.AgentGeneration(name, [], None, ServerHealthMonitor([], statuses, {}))
+
+        old, new = generation("old"), generation("new")
+        self.assertTrue(self.app_module.generation_is_healthy(new, old))
+
+    async def test_concurrent_reinitialize_joins_running_init(self):
+        release = asyncio.Event()
+
+        async def initialize():
+            await release.wait()
+            return True
+
+        with mock.patch.object(self.app_module, 'initialize_agent', initialize):
+            first = self.app_module.reinitialize_agent()
+            second = self.app_module.reinitialize_agent()
+            self.assertIs(first, second)
+            release.set()
+            self.assertTrue(await first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import time
+import asyncio
+import tempfile
+import textwrap
+import unittest
+
+from src.inprocess_server import InProcessMCPServer
+
+SCRIPT = textwrap.dedent('''
+    import time
+    import asyncio
+    from mcp.server.fastmcp import FastMCP
+
+    __version__ = "1.2.3"
+    mcp = FastMCP("inprocess-test")
+
+    @mcp.tool()
+    def slow_echo(text: str) -> str:
+        """동기 도구"""
+        time.sleep(0.2)
+        return text
+
+    @mcp.tool()
+    async def async_echo(text: str) -> str:
+        """비동기 도구"""
+        await asyncio.sleep(0)
+        return text.upper()
+
+    @mcp.tool()
+    def running_loop() -> str:
+        """도구가 실행된 스레드의 이벤트 루프 여부"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return "none"
+        return "running"
+
+    @mcp.tool()
+    def lookup(key: str) -> dict:
+        """dict를 돌려주는 동기 도구"""
+        return {"key": key, "value": "값"}
+
+    @mcp.tool(name="renamed_echo")
+    def echo_with_other_name(text: str) -> str:
+        """모듈 함수 이름과 도구 이름이 다른 도구"""
+        return text
+
+    @mcp.tool()
+    def fail() -> str:
+        """항상 실패하는 도구"""
+        raise ValueError("boom")
+''')
+
+
+class InProcessMCPServerTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.script = os.path.join(cls.tmp.name, "inprocess_test_server.py")
+        with open(cls.script, 'w', encoding='utf-8') as f:
+            f.write(SCRIPT)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    async def asyncSetUp(self):
+        self.server = InProcessMCPServer(self.script, "local")
+        await self.server.connect()
+
+    async def test_connect_lists_tools_and_version(self):
+        tools = await self.server.list_tools()
+        self.assertEqual(sorted(tool.name for tool in tools),
+                         ["async_echo", "fail", "lookup", "renamed_echo", "running_loop", "slow_echo"])
+        self.assertEqual(self.server.server_initialize_result.serverInfo.version, "1.2.3")
+
+    async def test_sync_and_async_tools(self):
+        result = await self.server.call_tool("slow_echo", {'text': "hi"})
+        self.assertEqual(result.content[0].text, "hi")
+        result = await self.server.call_tool("async_echo", {'text': "hi"})
+        self.assertEqual(result.content[0].text, "HI")
+
+    async def test_sync_tools_run_in_thread_without_event_loop(self):
+        result = await self.server.call_tool("running_loop", {})
+        self.assertEqual(result.content[0].text, "none")
+
+    async def test_sync_tool_dict_result_is_structured(self):
+        result = await self.server.call_tool("lookup", {'key': "k"})
+        self.assertEqual(result.structuredContent, {'key': "k", 'value': "값"})
+        self.assertIn('"값"', result.content[0].text)
+
+    async def test_renamed_sync_tool_goes_through_fastmcp(self):
+        result = await self.server.call_tool("renamed_echo", {'text': "hi"})
+        self.assertFalse(result.isError)
+        self.assertEqual(result.content[0].text, "hi")
+
+    async def test_sync_tools_do_not_block_event_loop(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.server.call_tool("slow_echo", {'text': str(i)}) for i in range(3)))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    async def test_tool_exception_becomes_error_result(self):
+        result = await self.server.call_tool("fail", {})
+        self.assertTrue(result.isError)
+        self.assertIn("boom", result.content[0].text)
+
+    async def test_calls_after_cleanup_fail(self):
+        await self.server.cleanup()
+        with self.assertRaises(ConnectionError):
+            await self.server.call_tool("async_echo", {'text': "hi"})
+
+
+if __name__ == '__main__':
+    unittest.main()
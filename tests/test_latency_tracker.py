@@ -0,0 +1,54 @@
+import unittest
+
+from src.latency_tracker import LatencyTracker
+from src.managed_server import ManagedMCPServer
+from tests.fakes import FakeMCPServer
+
+
+class LatencyTrackerTimeoutTest(unittest.TestCase):
+    def test_default_until_enough_samples(self):
+        tracker = LatencyTracker(window=10, min_samples=3)
+        tracker.record(0.1)
+        tracker.record(0.1)
+        self.assertEqual(tracker.timeout(30.0, multiplier=3.0, min_timeout=1.0), 30.0)
+
+    def test_shrinks_to_observed_quantile_within_bounds(self):
+        tracker = LatencyTracker(window=10, min_samples=3)
+        for _ in range(5):
+            tracker.record(2.0)
+        self.assertEqual(tracker.timeout(30.0, quantile=0.99, multiplier=3.0, min_timeout=1.0), 6.0)
+
+        fast = LatencyTracker(window=10, min_samples=3)
+        for _ in range(5):
+            fast.record(0.01)
+        self.assertEqual(fast.timeout(30.0, multiplier=3.0, min_timeout=1.0), 1.0)
+
+    def test_timeouts_recorded_at_timeout_value_grow_back_to_default(self):
+        tracker = LatencyTracker(window=10, min_samples=3)
+        for _ in range(10):
+            tracker.record(1.0)
+        timeout = tracker.timeout(30.0, quantile=0.99, multiplier=3.0, min_timeout=1.0)
+        self.assertEqual(timeout, 3.0)
+
+        # 서버가 느려져 호출마다 타임아웃: 타임아웃 값을 표본으로 남기면 다시 늘어나야 함
+        for _ in range(5):
+            tracker.record(timeout)
+            timeout = tracker.timeout(30.0, quantile=0.99, multiplier=3.0, min_timeout=1.0)
+        self.assertEqual(timeout, 30.0)
+
+
+class ManagedServerTimeoutTest(unittest.IsolatedAsyncioTestCase):
+    async def test_timed_out_call_is_recorded_at_timeout_value(self):
+        server = ManagedMCPServer(lambda: FakeMCPServer(call_delay=1.0), "slow", tool_call_timeout=0.05)
+        await server.connect()
+        self.addAsyncCleanup(server.cleanup)
+
+        with self.assertLogs(level='WARNING'):
+            result = await server.call_tool("search", {})
+
+        self.assertTrue(result.isError)
+        self.assertEqual(list(server.latency._samples), [0.05])
+
+
+if __name__ == '__main__':
+    unittest.main()
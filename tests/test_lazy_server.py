@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+
+from src.managed_server import ManagedMCPServer
+from tests.fakes import FakeMCPServer
+
+
+class LazyServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.created = []
+
+        def factory():
+            self.created.append(FakeMCPServer())
+            return self.created[-1]
+
+        self.server = ManagedMCPServer(factory, "lazy")
+        self.server.enable_lazy(idle_timeout=0.1, spawn_timeout=1.0)
+        self.addAsyncCleanup(self.server.cleanup)
+
+    async def test_first_call_spawns_server(self):
+        self.assertTrue(self.server.dormant)
+        self.assertEqual(self.created[-1].connect_count, 0)
+
+        result = await self.server.call_tool("search", {})
+
+        self.assertFalse(result.isError)
+        self.assertFalse(self.server.dormant)
+        self.assertEqual(self.server.spawn_count, 1)
+        self.assertIsNotNone(self.server.last_spawn_ms)
+
+    async def test_concurrent_first_calls_spawn_once(self):
+        await asyncio.gather(*(self.server.call_tool("search", {}) for _ in range(3)))
+        self.assertEqual(self.server.spawn_count, 1)
+        self.assertEqual(sum(server.connect_count for server in self.created), 1)
+
+    async def test_idle_server_shuts_down_and_respawns(self):
+        await self.server.call_tool("search", {})
+        first = self.server.server
+
+        # 유휴 감시는 최소 1초 간격으로 확인
+        for _ in range(30):
+            if self.server.dormant:
+                break
+            await asyncio.sleep(0.1)
+        self.assertTrue(self.server.dormant)
+        self.assertIsNone(first.session)
+
+        await self.server.call_tool("search", {})
+        self.assertEqual(self.server.spawn_count, 2)
+        self.assertIsNot(self.server.server, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
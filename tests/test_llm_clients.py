@@ -0,0 +1,40 @@
+import unittest
+
+from src.llm_clients import LLMClientRegistry, get_llm_client_registry
+from src.llm_factory import LLMFactory
+
+
+class LLMClientRegistryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.registry = LLMClientRegistry()
+        self.addAsyncCleanup(self.registry.aclose)
+
+    async def test_same_provider_and_url_share_client(self):
+        first = self.registry.get("ollama", "http://localhost:11434/v1", "ollama")
+        second = self.registry.get("ollama", "http://localhost:11434/v1", "ollama")
+        self.assertIs(first, second)
+
+    async def test_different_base_urls_get_separate_clients(self):
+        first = self.registry.get("ollama", "http://localhost:11434/v1", "ollama")
+        second = self.registry.get("ollama", "http://gpu-box:11434/v1", "ollama")
+        self.assertIsNot(first, second)
+
+    async def test_changed_api_key_replaces_client(self):
+        first = self.registry.get("openai", None, "key-1")
+        second = self.registry.get("openai", None, "key-2")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.api_key, "key-2")
+        self.assertIs(self.registry.get("openai", None, "key-2"), second)
+
+
+class LLMFactoryClientReuseTest(unittest.TestCase):
+    def test_rebuilt_factories_reuse_the_pooled_client(self):
+        config = {'llm_provider': 'ollama', 'ollama_base_url': 'http://localhost:11434/v1', 'model_name': 'llama3'}
+        first = LLMFactory(config)
+        second = LLMFactory(config)
+        self.assertIs(first.client, second.client)
+        self.assertIs(first.client, get_llm_client_registry().get("ollama", 'http://localhost:11434/v1', "ollama"))
+
+
+if __name__ == '__main__':
+    unittest.main()
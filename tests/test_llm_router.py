@@ -0,0 +1,154 @@
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+import httpx
+import openai
+
+from src.config import validate_llm_provider
+from src.llm_factory import LLMFactory
+from src.llm_router import ModelBackend, RoutedModel, is_failover_error
+
+REQUEST = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+
+
+def status_error(status_code: int) -> openai.APIStatusError:
+    return openai.APIStatusError("error", response=httpx.Response(status_code, request=REQUEST), body=None)
+
+
+class FakeModel:
+    def __init__(self, name, error=None, delay=0.0, events=("a", "b")):
+        self.name = name
+        self.error = error
+        self.delay = delay
+        self.events = events
+        self.calls = 0
+
+    async def get_response(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+    async def stream_response(self, *args, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        for event in self.events:
+            yield f"{self.name}:{event}"
+
+
+def call(model):
+    return model.get_response("system", "input", None, [], None, [], None)
+
+
+class IsFailoverErrorTest(unittest.TestCase):
+    def test_provider_side_errors_fail_over(self):
+        self.assertTrue(is_failover_error(openai.APIConnectionError(request=REQUEST)))
+        self.assertTrue(is_failover_error(asyncio.TimeoutError()))
+        for status_code in (404, 429, 500, 503):
+            self.assertTrue(is_failover_error(status_error(status_code)), status_code)
+
+    def test_request_errors_do_not_fail_over(self):
+        self.assertFalse(is_failover_error(status_error(400)))
+        self.assertFalse(is_failover_error(ValueError("bad input")))
+
+
+class RoutedModelTest(unittest.IsolatedAsyncioTestCase):
+    def routed(self, *models, **kwargs):
+        return RoutedModel([ModelBackend(m.name, m) for m in models], **kwargs)
+
+    async def test_fails_over_and_cools_down_failed_provider(self):
+        primary = FakeModel("primary", error=openai.APIConnectionError(request=REQUEST))
+        backup = FakeModel("backup")
+        model = self.routed(primary, backup)
+
+        self.assertEqual(await call(model), "backup")
+        self.assertEqual(model.failover_count, 1)
+        self.assertFalse(model.backends[0].available)
+
+        # 제외 중인 제공자는 다음 요청에서 맨 뒤로
+        self.assertEqual([b.name for b in model.candidates()], ["backup", "primary"])
+        self.assertEqual(await call(model), "backup")
+        self.assertEqual(primary.calls, 1)
+
+    async def test_request_error_is_not_retried_on_other_provider(self):
+        primary = FakeModel("primary", error=status_error(400))
+        backup = FakeModel("backup")
+        with self.assertRaises(openai.APIStatusError):
+            await call(self.routed(primary, backup))
+        self.assertEqual(backup.calls, 0)
+
+    async def test_all_providers_failing_raises_last_error(self):
+        model = self.routed(FakeModel("a", error=status_error(503)), FakeModel("b", error=status_error(502)))
+        with self.assertRaises(openai.APIStatusError) as raised:
+            await call(model)
+        self.assertEqual(raised.exception.status_code, 502)
+
+    async def test_success_clears_cooldown(self):
+        backend = ModelBackend("a", FakeModel("a"))
+        backend.record_failure(status_error(503))
+        self.assertFalse(backend.available)
+        backend.record_success(0.1)
+        self.assertTrue(backend.available)
+        self.assertEqual(backend.consecutive_failures, 0)
+
+    async def test_stream_fails_over_before_first_event(self):
+        primary = FakeModel("primary", error=status_error(429))
+        model = self.routed(primary, FakeModel("backup"))
+        events = [e async for e in model.stream_response("system", "input", None, [], None, [], None)]
+        self.assertEqual(events, ["backup:a", "backup:b"])
+
+    async def test_hedged_request_uses_faster_provider(self):
+        primary = FakeModel("primary", delay=1.0)
+        backup = FakeModel("backup")
+        model = self.routed(primary, backup, hedge=True)
+        for _ in range(10):
+            model.backends[0].ttft.record(0.01)
+
+        self.assertEqual(await call(model), "backup")
+        self.assertEqual((model.hedged_count, model.hedge_wins), (1, 1))
+
+    def test_unknown_strategy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.routed(FakeModel("a"), strategy="random")
+
+
+class LLMFactoryProvidersTest(unittest.TestCase):
+    def test_providers_list_builds_routed_model(self):
+        factory = LLMFactory({
+            'providers': [
+                {'llm_provider': 'openai', 'model_name': 'gpt-4o-mini'},
+                {'llm_provider': 'ollama', 'model_name': 'qwen3:8b', 'weight': 0.5},
+            ],
+            'routing': 'weighted',
+        })
+        model = factory.get_model()
+        self.assertIsInstance(model, RoutedModel)
+        self.assertEqual([b.name for b in model.backends], ["openai/gpt-4o-mini", "ollama/qwen3:8b"])
+        self.assertEqual(model.strategy, "weighted")
+
+    def test_single_provider_is_not_routed(self):
+        factory = LLMFactory({'llm_provider': 'ollama', 'model_name': 'qwen3:8b'})
+        self.assertNotIsInstance(factory.get_model(), RoutedModel)
+
+
+class ValidateLLMProviderTest(unittest.TestCase):
+    def test_openai_key_comes_from_api_key_env(self):
+        with mock.patch.dict(os.environ, {'GROQ_API_KEY': 'gk'}):
+            validate_llm_provider({'llm_provider': 'openai', 'api_key_env': 'GROQ_API_KEY'})
+        with mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'ok'}):
+            os.environ.pop('MISSING_API_KEY', None)
+            with self.assertRaisesRegex(ValueError, "MISSING_API_KEY"):
+                validate_llm_provider({'llm_provider': 'openai', 'api_key_env': 'MISSING_API_KEY'})
+
+    def test_unsupported_provider_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "anthropic"):
+            validate_llm_provider({'llm_provider': 'anthropic'})
+        validate_llm_provider({'llm_provider': 'Ollama'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from src.managed_server import ManagedMCPServer
+from src.mcp_supervisor import MCPSupervisor
+from tests.fakes import FakeMCPServer
+
+
+class MCPSupervisorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.created = []
+        self.next_errors = []
+
+        def factory():
+            error = self.next_errors.pop(0) if self.next_errors else None
+            self.created.append(FakeMCPServer(connect_error=error))
+            return self.created[-1]
+
+        self.server = ManagedMCPServer(factory, "fake")
+        await self.server.connect()
+        self.supervisor = MCPSupervisor([self.server], interval=0.02, ping_timeout=0.1,
+                                        base_delay=0.01, max_delay=0.02, reconnect_timeout=1.0)
+
+    async def asyncTearDown(self):
+        await self.supervisor.stop()
+        await self.server.cleanup()
+
+    async def wait_for(self, condition, timeout=1.0):
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout
+        while not condition():
+            self.assertLess(loop.time(), end, "조건을 기다리다 시간 초과")
+            await asyncio.sleep(0.01)
+
+    async def test_failed_ping_swaps_in_new_connection(self):
+        first = self.server.server
+        first.ping_error = ConnectionError("broken pipe")
+        self.supervisor.start()
+
+        await self.wait_for(lambda: self.server.reconnect_count == 1)
+        self.assertIsNot(self.server.server, first)
+        self.assertTrue(self.server.server_connected)
+        self.assertIsNone(first.session)
+        self.assertTrue(self.supervisor.stats()['fake']['healthy'])
+
+    async def test_reconnect_retries_with_backoff_and_keeps_old_connection(self):
+        first = self.server.server
+        first.ping_error = ConnectionError("broken pipe")
+        self.next_errors = [ConnectionError("refused"), ConnectionError("refused")]
+        self.supervisor.start()
+
+        await self.wait_for(lambda: self.server.reconnect_count == 1)
+        self.assertEqual(len(self.created), 4)  # 최초 연결 + 실패 2회 + 성공 1회
+        self.assertIsNot(self.server.server, first)
+
+    async def test_tool_call_failure_triggers_immediate_check(self):
+        self.supervisor.interval = 60.0
+        self.supervisor.start()
+        first = self.server.server
+        first.call_error = ConnectionError("closed")
+        first.ping_error = ConnectionError("closed")
+
+        with self.assertRaises(ConnectionError):
+            await self.server.call_tool("search", {})
+        await self.wait_for(lambda: self.server.reconnect_count == 1)
+
+    async def test_stop_when_failure_is_signalled_at_the_same_time(self):
+        self.supervisor.interval = 60.0
+        self.supervisor.start()
+        await asyncio.sleep(0)  # 감시 태스크가 failure_event를 기다리기 시작
+
+        # 알림과 취소가 같은 루프 반복에 도착해도(wait_for가 취소를 삼켜도) 종료되어야 함
+        self.server.failure_event.set()
+        await asyncio.wait_for(self.supervisor.stop(), timeout=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
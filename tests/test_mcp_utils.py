@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+
+from src.managed_server import ManagedMCPServer
+from src.mcp_utils import check_server_connection
+from tests.fakes import FakeMCPServer
+
+
+class CheckServerConnectionTest(unittest.IsolatedAsyncioTestCase):
+    def patch_server(self, inner):
+        server = ManagedMCPServer(lambda: inner, "fake")
+        return mock.patch('src.mcp_utils.create_mcp_server', return_value=server)
+
+    async def test_keep_connection_returns_connected_server(self):
+        inner = FakeMCPServer()
+        with self.patch_server(inner):
+            result = await check_server_connection({'name': 'fake', 'command': 'fake'}, keep_connection=True)
+        self.assertTrue(result['connected'])
+        self.assertEqual([tool['name'] for tool in result['tools']], ['search'])
+        server = result['server']
+        self.assertTrue(server.server_connected)
+        self.assertEqual(server.tool_count, 1)
+        await server.cleanup()
+
+    async def test_probe_connection_is_closed_by_default(self):
+        inner = FakeMCPServer()
+        with self.patch_server(inner):
+            result = await check_server_connection({'name': 'fake', 'command': 'fake'})
+        self.assertTrue(result['connected'])
+        self.assertNotIn('server', result)
+        self.assertEqual(inner.cleanup_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from agents.items import ModelResponse
+from agents.usage import Usage
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from src.config import CASCADE_ESCALATE_MARKER
+from src.model_cascade import _SIMPLE_PATTERNS, CascadeModel, ModelTier, classify_complexity, latest_user_message
+
+
+def response(text: str) -> ModelResponse:
+    message = ResponseOutputMessage(
+        id="msg", type="message", role="assistant", status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+    return ModelResponse(output=[message], usage=Usage(requests=1, input_tokens=100, output_tokens=10), response_id=None)
+
+
+class FakeModel:
+    def __init__(self, text: str):
+        self.text = text
+        self.instructions = []
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        self.instructions.append(system_instructions)
+        return response(self.text)
+
+
+def call(model, text):
+    return model.get_response("system", text, None, [], None, [], None)
+
+
+class ClassifyComplexityTest(unittest.TestCase):
+    def test_greetings_and_thanks_are_simple(self):
+        for text in ("hi there", "Thanks!", "안녕", "ok"):
+            self.assertLess(classify_complexity(text), 0.5, text)
+
+    def test_korean_greetings_with_endings_match_simple_pattern(self):
+        for text in ("안녕하세요", "감사합니다", "고마워요", "네, 알겠어요", "안녕하세요!"):
+            self.assertIsNotNone(_SIMPLE_PATTERNS.match(text), text)
+            self.assertLess(classify_complexity(text), 0.5, text)
+
+    def test_words_starting_with_greeting_syllables_do_not_match(self):
+        for text in ("네트워크 설정을 바꿔줘", "안녕하세요 두 제품의 장단점을 비교해줘", "history"):
+            self.assertIsNone(_SIMPLE_PATTERNS.match(text), text)
+
+    def test_analysis_requests_are_complex(self):
+        for text in ("두 제품의 장단점을 비교해서 분석해줘", "Explain why the build fails and write a plan"):
+            self.assertGreaterEqual(classify_complexity(text), 0.5, text)
+
+    def test_latest_user_message_from_input_items(self):
+        items = [
+            {'role': 'user', 'content': "첫 질문"},
+            {'role': 'assistant', 'content': "답변"},
+            {'role': 'user', 'content': [{'type': 'input_text', 'text': "두 번째"}, {'type': 'input_text', 'text': "질문"}]},
+        ]
+        self.assertEqual(latest_user_message(items), "두 번째 질문")
+
+    def test_tool_outputs_in_the_turn_do_not_change_the_score(self):
+        items = [{'role': 'user', 'content': "오늘 서울 날씨 알려줘"}]
+        before = classify_complexity(items)
+        for i in range(4):
+            items += [{'type': 'function_call', 'call_id': f"c{i}", 'name': "weather", 'arguments': "{}"},
+                      {'type': 'function_call_output', 'call_id': f"c{i}", 'output': "맑음"}]
+        self.assertEqual(classify_complexity(items), before)
+
+
+class CascadeModelTest(unittest.IsolatedAsyncioTestCase):
+    def cascade(self, small_text="small answer", mode="classifier"):
+        self.small = FakeModel(small_text)
+        self.large = FakeModel("large answer")
+        return CascadeModel(
+            ModelTier("small", self.small, input_cost_per_1m=0.1, output_cost_per_1m=0.4),
+            ModelTier("large", self.large, input_cost_per_1m=2.0, output_cost_per_1m=8.0),
+            mode=mode,
+        )
+
+    async def test_simple_message_goes_to_small_model(self):
+        model = self.cascade()
+        await call(model, "hi")
+        self.assertEqual((len(self.small.instructions), len(self.large.instructions)), (1, 0))
+
+    async def test_complex_message_goes_to_large_model(self):
+        model = self.cascade()
+        await call(model, "두 제품의 장단점을 비교해서 분석해줘")
+        self.assertEqual((len(self.small.instructions), len(self.large.instructions)), (0, 1))
+        self.assertEqual(model.stats()['escalations']['classifier'], 1)
+
+    async def test_confidence_mode_escalates_on_marker(self):
+        model = self.cascade(small_text=CASCADE_ESCALATE_MARKER, mode="confidence")
+        result = await call(model, "hi")
+        self.assertEqual(result.output[0].content[0].text, "large answer")
+        self.assertIn(CASCADE_ESCALATE_MARKER, self.small.instructions[0])
+        self.assertEqual(self.large.instructions, ["system"])
+        self.assertEqual(model.stats()['escalations']['confidence'], 1)
+
+    async def test_costs_are_tracked_per_tier(self):
+        model = self.cascade()
+        await call(model, "hi")
+        stats = model.stats()
+        self.assertEqual(stats['tiers']['small']['input_tokens'], 100)
+        self.assertAlmostEqual(stats['cost_usd'], (100 * 0.1 + 10 * 0.4) / 1_000_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
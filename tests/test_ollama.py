@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.ollama import OllamaQueuedModel, OllamaServer
+
+
+class FakeModel:
+    def __init__(self, server: OllamaServer, delay: float = 0.05):
+        self.server = server
+        self.delay = delay
+        self.max_in_flight = 0
+
+    async def get_response(self, *args, **kwargs):
+        self.max_in_flight = max(self.max_in_flight, self.server.in_flight)
+        await asyncio.sleep(self.delay)
+        return "response"
+
+
+class OllamaServerTest(unittest.IsolatedAsyncioTestCase):
+    def test_api_url_drops_openai_suffix(self):
+        self.assertEqual(OllamaServer("http://localhost:11434/v1").api_url, "http://localhost:11434")
+        self.assertEqual(OllamaServer("http://gpu:11434/v1/").api_url, "http://gpu:11434")
+
+    async def test_requests_queue_to_server_parallelism(self):
+        server = OllamaServer("http://localhost:11434/v1", num_parallel=2)
+        inner = FakeModel(server)
+        model = OllamaQueuedModel(inner, server, "qwen3:8b", keep_warm=False)
+
+        await asyncio.gather(*(model.get_response("system", "hi", None, [], None, [], None) for _ in range(5)))
+
+        self.assertEqual(inner.max_in_flight, 2)
+        self.assertEqual(server.in_flight, 0)
+        stats = server.stats()
+        self.assertEqual(stats['queue_wait']['samples'], 5)
+        self.assertGreater(stats['queue_wait']['p95_ms'], 40.0)
+
+    async def test_keep_warm_starts_loop_and_warms_new_models(self):
+        server = OllamaServer("http://localhost:11434/v1")
+        warmed = []
+
+        async def fake_warm(model_name):
+            warmed.append(model_name)
+
+        with mock.patch.object(server, '_warm', fake_warm):
+            server.keep_warm("qwen3:8b")
+            await asyncio.sleep(0)
+            server.keep_warm("qwen3:8b")
+            server.keep_warm("llama3")
+            await asyncio.sleep(0)
+            server.stop()
+
+        self.assertEqual(sorted(warmed), ["llama3", "qwen3:8b"])
+        self.assertEqual(server.stats()['warm_models'], ["llama3", "qwen3:8b"])
+
+    async def test_warm_all_waits_for_models_registered_outside_the_loop(self):
+        server = OllamaServer("http://localhost:11434/v1")
+        server.models.add("qwen3:8b")  # 이벤트 루프 밖(import 시점)에서 만든 모델
+        warmed = []
+
+        async def fake_warm(model_name):
+            await asyncio.sleep(0.05)
+            warmed.append(model_name)
+
+        with mock.patch.object(server, '_warm', fake_warm):
+            await server.warm_all()
+            self.assertEqual(warmed, ["qwen3:8b"])
+            # 방금 불러왔으므로 keep_alive 루프는 주기만큼 기다린 뒤 다시 보냄
+            await asyncio.sleep(0.1)
+            self.assertEqual(warmed, ["qwen3:8b"])
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+from agents.tool import FunctionTool
+
+from src.prompt_assembly import StablePromptModel, canonical_schema, stable_tools
+from src.run_metrics import RunRecord
+
+
+async def _invoke(ctx, args):
+    return args
+
+
+def make_function_tool(name, schema):
+    return FunctionTool(name=name, description=name, params_json_schema=schema, on_invoke_tool=_invoke)
+
+
+class RecordingModel:
+    def __init__(self):
+        self.tools = None
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        self.tools = tools
+        return "response"
+
+
+class CanonicalOrderTest(unittest.TestCase):
+    def test_schema_keys_are_sorted_recursively(self):
+        a = {"type": "object", "properties": {"query": {"type": "string"}, "display": {"type": "integer"}},
+             "required": ["query"]}
+        b = {"required": ["query"], "properties": {"display": {"type": "integer"}, "query": {"type": "string"}},
+             "type": "object"}
+        self.assertEqual(json.dumps(canonical_schema(a)), json.dumps(canonical_schema(b)))
+        # 리스트 순서는 의미가 있으므로 유지
+        self.assertEqual(canonical_schema({"enum": ["b", "a"]}), {"enum": ["b", "a"]})
+
+    def test_tools_serialize_identically_regardless_of_server_order(self):
+        search = make_function_tool("search", {"type": "object", "properties": {"q": {}}})
+        news = make_function_tool("news", {"properties": {"q": {}}, "type": "object"})
+        first = stable_tools([search, news])
+        second = stable_tools([news, search])
+        self.assertEqual([tool.name for tool in first], ["news", "search"])
+        self.assertEqual(
+            [json.dumps(tool.params_json_schema) for tool in first],
+            [json.dumps(tool.params_json_schema) for tool in second],
+        )
+
+
+class StablePromptModelTest(unittest.IsolatedAsyncioTestCase):
+    async def test_model_receives_sorted_tools(self):
+        inner = RecordingModel()
+        tools = [make_function_tool("search", {}), make_function_tool("news", {})]
+        await StablePromptModel(inner).get_response("system", "hi", None, tools, None, [], None)
+        self.assertEqual([tool.name for tool in inner.tools], ["news", "search"])
+
+    async def test_disabled_keeps_original_order(self):
+        inner = RecordingModel()
+        tools = [make_function_tool("search", {}), make_function_tool("news", {})]
+        await StablePromptModel(inner, enabled=False).get_response("system", "hi", None, tools, None, [], None)
+        self.assertEqual(inner.tools, tools)
+
+
+class CachedRatioTest(unittest.TestCase):
+    def test_cached_ratio(self):
+        record = RunRecord("test")
+        self.assertIsNone(record.summary()['cached_ratio'])
+        usage = SimpleNamespace(input_tokens=400, output_tokens=10,
+                                input_tokens_details=SimpleNamespace(cached_tokens=300))
+        record.record_llm_call(0.1, 0.2, usage)
+        self.assertEqual(record.summary()['cached_ratio'], 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+
+import anyio
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from src.managed_server import ManagedMCPServer, MCPReplicaPool, ToolCallNotSent
+from tests.fakes import FakeMCPServer
+
+
+class MCPReplicaPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def make_pool(self, *inners, config=None):
+        pool = MCPReplicaPool(
+            [ManagedMCPServer(lambda inner=inner: inner, f"pool#{i}") for i, inner in enumerate(inners)],
+            "pool",
+            config,
+        )
+        self.addAsyncCleanup(pool.cleanup)
+        await pool.connect()
+        return pool
+
+    async def test_concurrent_calls_go_to_least_outstanding_replica(self):
+        inners = [FakeMCPServer(call_delay=0.05) for _ in range(3)]
+        pool = await self.make_pool(*inners)
+
+        await asyncio.gather(*(pool.call_tool("search", {}) for _ in range(3)))
+
+        self.assertEqual([len(inner.calls) for inner in inners], [1, 1, 1])
+
+    async def test_unhealthy_replica_is_skipped(self):
+        inners = [FakeMCPServer(), FakeMCPServer()]
+        pool = await self.make_pool(*inners)
+        pool.replicas[0].healthy = False
+
+        for _ in range(3):
+            await pool.call_tool("search", {})
+
+        self.assertEqual([len(inner.calls) for inner in inners], [0, 3])
+
+    async def test_closed_transport_retries_on_other_replica(self):
+        inners = [FakeMCPServer(), FakeMCPServer()]
+        inners[0].call_error = anyio.ClosedResourceError()  # 요청을 쓰기 전에 스트림이 닫혀 있음
+        pool = await self.make_pool(*inners)
+
+        result = await pool.call_tool("search", {})
+
+        self.assertFalse(result.isError)
+        self.assertFalse(pool.replicas[0].healthy)
+        self.assertEqual(len(inners[1].calls), 1)
+
+    async def test_disconnected_server_does_not_send(self):
+        inner = FakeMCPServer()
+        server = ManagedMCPServer(lambda: inner, "search")
+        await server.connect()
+        self.addAsyncCleanup(server.cleanup)
+        inner.session = None
+
+        with self.assertRaises(ToolCallNotSent):
+            await server.call_tool("search", {})
+        self.assertEqual(inner.calls, [])
+
+    async def test_errors_after_send_are_not_retried(self):
+        for error in (McpError(ErrorData(code=-32000, message="Connection closed")), ConnectionError("reset"),
+                      RuntimeError("tool crashed")):
+            inners = [FakeMCPServer(), FakeMCPServer()]
+            inners[0].call_error = error
+            pool = await self.make_pool(*inners)
+
+            with self.assertRaises(type(error)):
+                await pool.call_tool("search", {})
+
+            # 도구가 이미 실행됐을 수 있으므로 다시 보내지 않고, 복제본도 배정에서 빼지 않음
+            self.assertEqual([len(inner.calls) for inner in inners], [1, 0])
+            self.assertTrue(pool.replicas[0].healthy)
+
+    async def test_single_replica_reports_unsent_call(self):
+        inner = FakeMCPServer()
+        inner.call_error = anyio.BrokenResourceError()
+        pool = await self.make_pool(inner)
+
+        with self.assertRaises(ToolCallNotSent):
+            await pool.call_tool("search", {})
+
+    async def test_connect_succeeds_when_some_replicas_fail(self):
+        pool = await self.make_pool(FakeMCPServer(connect_error=OSError("spawn failed")), FakeMCPServer())
+
+        self.assertTrue(pool.server_connected)
+        stats = pool.health_stats()
+        self.assertEqual((stats['replicas'], stats['healthy_replicas']), (2, 1))
+
+    async def test_connect_fails_when_all_replicas_fail(self):
+        pool = MCPReplicaPool(
+            [ManagedMCPServer(lambda: FakeMCPServer(connect_error=OSError("spawn failed")), f"pool#{i}")
+             for i in range(2)],
+            "pool",
+        )
+        with self.assertRaises(OSError):
+            await pool.connect()
+
+
+    async def test_slow_hedged_call_is_answered_by_backup_replica(self):
+        inners = [FakeMCPServer(call_delay=1.0), FakeMCPServer()]
+        pool = await self.make_pool(*inners, config={'hedge_tools': ['search']})
+        for _ in range(20):
+            pool.latency.record(0.01)
+
+        start = asyncio.get_running_loop().time()
+        result = await pool.call_tool("search", {})
+
+        self.assertLess(asyncio.get_running_loop().time() - start, 0.5)
+        self.assertEqual(result.content[0].text, "search:1")
+        self.assertEqual((pool.hedged_count, pool.hedge_wins), (1, 1))
+        self.assertEqual(len(inners[1].calls), 1)
+
+    async def test_tools_outside_hedge_list_are_not_hedged(self):
+        inners = [FakeMCPServer(call_delay=0.1), FakeMCPServer()]
+        pool = await self.make_pool(*inners, config={'hedge_tools': ['search']})
+        for _ in range(20):
+            pool.latency.record(0.01)
+
+        await pool.call_tool("post", {})
+
+        self.assertEqual(pool.hedged_count, 0)
+        self.assertEqual(len(inners[1].calls), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
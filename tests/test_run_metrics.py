@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from agents.usage import Usage
+
+from src.admission import AdmissionRejected
+from src.managed_server import ManagedMCPServer
+from src.run_metrics import MeteredModel, RunRecord, RunRecorder, current_run, run_scope
+from tests.fakes import FakeMCPServer
+
+
+class FakeStreamModel:
+    async def get_response(self, *args, previous_response_id=None):
+        return SimpleNamespace(usage=Usage(requests=1, input_tokens=100, output_tokens=10))
+
+    async def stream_response(self, *args, previous_response_id=None):
+        await asyncio.sleep(0.05)
+        yield SimpleNamespace(type="response.created")
+        await asyncio.sleep(0.05)
+        usage = SimpleNamespace(input_tokens=200, output_tokens=20,
+                                input_tokens_details=SimpleNamespace(cached_tokens=150))
+        yield SimpleNamespace(type="response.completed", response=SimpleNamespace(usage=usage))
+
+
+class RunRecordTest(unittest.TestCase):
+    def test_summary_totals_calls(self):
+        record = RunRecord("test")
+        record.record_llm_call(0.1, 0.5, Usage(requests=1, input_tokens=100, output_tokens=10))
+        record.record_llm_call(0.2, 0.25, Usage(requests=1, input_tokens=50, output_tokens=5))
+        record.record_tool_call("search", "web_search", 0.3, 1200, False)
+        summary = record.summary()
+        self.assertEqual(summary['turns'], 2)
+        self.assertEqual(summary['llm_ms'], 750.0)
+        self.assertEqual(summary['tool_ms'], 300.0)
+        self.assertEqual((summary['input_tokens'], summary['output_tokens']), (150, 15))
+        self.assertEqual(summary['tool_call_count'], 1)
+
+    def test_phases_accumulate(self):
+        record = RunRecord("test")
+        record.add_phase('telegram_io', 0.1)
+        record.add_phase('telegram_io', 0.2)
+        self.assertEqual(record.phases, {'telegram_io': 300.0})
+
+
+class RunRecorderTest(unittest.TestCase):
+    def test_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "runs.jsonl")
+            recorder = RunRecorder(path=path, enabled=True)
+            record = RunRecord("web", client="c1")
+            record.record_llm_call(0.1, 0.2)
+            recorder.finish(record)
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['source'], "web")
+        self.assertEqual(lines[0]['client'], "c1")
+        self.assertEqual(lines[0]['turns'], 1)
+
+    def test_rejected_runs_are_excluded_from_percentiles(self):
+        recorder = RunRecorder(enabled=False)
+        ok = RunRecord("test")
+        ok.record_llm_call(0.1, 0.2)
+        recorder.finish(ok)
+        failed = RunRecord("test")
+        failed.fail(RuntimeError("boom"))
+        recorder.finish(failed)
+        rejected = RunRecord("test")
+        rejected.fail(AdmissionRejected("busy"))
+        recorder.finish(rejected)
+
+        stats = recorder.stats()
+        self.assertEqual((stats['runs'], stats['errors'], stats['rejected']), (2, 1, 1))
+        self.assertEqual(stats['window'], 2)
+        self.assertEqual(stats['llm_ttft_ms']['p50'], 100.0)
+
+
+class RunRecorderFlushTest(unittest.IsolatedAsyncioTestCase):
+    async def test_records_in_the_loop_are_written_on_flush(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "runs.jsonl")
+            recorder = RunRecorder(path=path, enabled=True)
+            for source in ("a", "b"):
+                recorder.finish(RunRecord(source))
+            # 이벤트 루프 안에서는 바로 쓰지 않고 모아 둠
+            self.assertFalse(os.path.exists(path))
+            await recorder.flush()
+            with open(path, encoding='utf-8') as f:
+                sources = [json.loads(line)['source'] for line in f]
+        self.assertEqual(sources, ["a", "b"])
+
+
+class RunScopeTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.recorder = RunRecorder(enabled=False)
+        patcher = mock.patch('src.run_metrics._run_recorder', self.recorder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_tool_calls_in_tasks_are_recorded(self):
+        server = ManagedMCPServer(FakeMCPServer, "search")
+        await server.connect()
+        self.addAsyncCleanup(server.cleanup)
+
+        with run_scope("test") as run:
+            await asyncio.gather(server.call_tool("search", {}), server.call_tool("search", {}))
+        self.assertIsNone(current_run())
+        self.assertEqual([call['server'] for call in run.tool_calls], ["search", "search"])
+        self.assertEqual(self.recorder.runs, 1)
+        self.assertIsNotNone(run.total_ms)
+
+    async def test_error_is_recorded_and_reraised(self):
+        with self.assertRaises(ValueError):
+            with run_scope("test") as run:
+                raise ValueError("bad")
+        self.assertEqual(run.status, "error")
+        self.assertEqual(self.recorder.errors, 1)
+
+    async def test_non_streamed_call_has_no_ttft(self):
+        model = MeteredModel(FakeStreamModel())
+        with run_scope("test") as run:
+            await model.get_response("system", "hi", None, [], None, [], None)
+        call = run.llm_calls[0]
+        self.assertIsNone(call['ttft_ms'])
+        self.assertFalse(call['streamed'])
+        self.assertEqual(call['input_tokens'], 100)
+        self.assertEqual(self.recorder.stats()['llm_ttft_ms']['p50'], None)
+
+    async def test_metered_stream_records_ttft_and_usage(self):
+        model = MeteredModel(FakeStreamModel())
+        with run_scope("test") as run:
+            events = [event async for event in model.stream_response(
+                "system", "hi", None, [], None, [], None)]
+        self.assertEqual(len(events), 2)
+        call = run.llm_calls[0]
+        self.assertTrue(call['streamed'])
+        self.assertGreaterEqual(call['ttft_ms'], 40.0)
+        self.assertLess(call['ttft_ms'], call['total_ms'])
+        self.assertEqual((call['input_tokens'], call['cached_tokens']), (200, 150))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+from src.managed_server import ManagedMCPServer
+from src.server_health import ServerHealthMonitor
+from tests.fakes import FakeMCPServer, make_tool
+
+
+class ServerHealthMonitorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.inner = FakeMCPServer(tools=[make_tool("search", "웹 검색")])
+        self.server = ManagedMCPServer(lambda: self.inner, "search")
+        await self.server.connect()
+        self.addAsyncCleanup(self.server.cleanup)
+        statuses = [{'name': "search", 'type': "stdio", 'status': "SUCCESS", 'error': None, 'tools': ["search"]}]
+        self.monitor = ServerHealthMonitor([self.server], statuses, {"search": [{"name": "search"}]},
+                                           max_age=60.0, ping_timeout=0.5)
+        self.addAsyncCleanup(self.monitor.stop)
+
+    async def test_healthy_server_stays_success(self):
+        await self.monitor.refresh()
+        self.assertEqual(self.monitor.snapshot()[0]['status'], "SUCCESS")
+
+    async def test_failed_ping_is_recorded(self):
+        self.inner.ping_error = ConnectionError("broken pipe")
+        await self.monitor.refresh()
+        status = self.monitor.snapshot()[0]
+        self.assertEqual((status['status'], status['error']), ("FAILED", "broken pipe"))
+
+    async def test_list_tools_refresh_updates_tools(self):
+        self.inner.tools = [make_tool("search"), make_tool("news", "뉴스 검색")]
+        await self.monitor.refresh(list_tools=True)
+        self.assertEqual([t['name'] for t in self.monitor.tools["search"]], ["search", "news"])
+        self.assertEqual(self.monitor.snapshot()[0]['tools'], ["search", "news"])
+        # 도구 목록은 열린 세션으로 가져오므로 새로 연결하지 않음
+        self.assertEqual(self.inner.connect_count, 1)
+
+    async def test_concurrent_refreshes_share_one_check(self):
+        pings = []
+        session = self.inner.session
+        original = session.send_ping
+
+        async def slow_ping():
+            pings.append(1)
+            await asyncio.sleep(0.05)
+            await original()
+
+        session.send_ping = slow_ping
+        await asyncio.gather(*(self.monitor.refresh() for _ in range(5)))
+        self.assertEqual(len(pings), 1)
+
+    async def test_stale_snapshot_refreshes_in_background(self):
+        self.monitor.max_age = 0.0
+        self.inner.ping_error = ConnectionError("broken pipe")
+        # 기다리지 않고 캐시된 상태를 바로 반환
+        self.assertEqual(self.monitor.snapshot()[0]['status'], "SUCCESS")
+        await self.monitor._refreshing
+        self.assertEqual(self.monitor.statuses["search"]['status'], "FAILED")
+
+    async def test_dormant_lazy_server_counts_as_healthy(self):
+        self.server.lazy = True
+        self.server._sleeping = True
+        self.inner.ping_error = ConnectionError("stopped")
+        await self.monitor.refresh()
+        self.assertEqual(self.monitor.snapshot()[0]['status'], "SUCCESS")
+
+    async def test_added_server_lists_tools_and_removed_server_disappears(self):
+        news = ManagedMCPServer(lambda: FakeMCPServer(tools=[make_tool("news")]), "news", {'command': 'python'})
+        await news.connect()
+        self.addAsyncCleanup(news.cleanup)
+
+        self.monitor.add(news)
+        self.assertEqual(self.monitor.statuses["news"]['status'], "WARN")
+        await self.monitor._refreshing
+        self.assertEqual(self.monitor.statuses["news"]['tools'], ["news"])
+
+        self.monitor.remove("search")
+        self.assertEqual([s['name'] for s in self.monitor.snapshot()], ["news"])
+
+    async def test_server_removed_during_refresh_is_not_restored(self):
+        session = self.inner.session
+        original = session.send_ping
+
+        async def slow_ping():
+            await asyncio.sleep(0.05)
+            await original()
+
+        session.send_ping = slow_ping
+        refreshing = asyncio.create_task(self.monitor.refresh(list_tools=True))
+        await asyncio.sleep(0.01)
+        self.monitor.remove("search")
+        await refreshing
+        self.assertEqual(self.monitor.snapshot(), [])
+        self.assertNotIn("search", self.monitor.tools)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import asyncio
+import unittest
+
+from src.telegram_sender import TelegramSendQueue, split_message
+
+
+class FakeBot:
+    def __init__(self):
+        self.calls = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.calls.append(('send', chat_id, text, time.monotonic()))
+        return text
+
+    async def delete_message(self, chat_id, message_id):
+        self.calls.append(('delete', chat_id, message_id, time.monotonic()))
+        return True
+
+
+class SplitMessageTest(unittest.TestCase):
+    def test_splits_on_paragraphs_within_limit(self):
+        text = "a" * 30 + "\n\n" + "b" * 30
+        self.assertEqual(split_message(text, limit=40), ["a" * 30, "b" * 30])
+
+    def test_splits_oversized_sentence_by_length(self):
+        chunks = split_message("x" * 95, limit=40)
+        self.assertEqual([len(c) for c in chunks], [40, 40, 15])
+
+
+class TelegramSendQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bot = FakeBot()
+        self.queue = TelegramSendQueue(self.bot, private_chat_rate=1.0, group_chat_rate=0.5,
+                                       chat_idle_seconds=0.05)
+        self.queue.start()
+
+    async def asyncTearDown(self):
+        await self.queue.stop()
+
+    async def test_delete_does_not_wait_for_chat_limit(self):
+        start = time.monotonic()
+        await self.queue.send_message(1, "thinking")
+        await self.queue.delete_message(1, 10)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    async def test_waiting_group_chat_does_not_block_other_chats(self):
+        group = asyncio.create_task(self.queue.send_text(-100, "a" * 5000))  # 2조각, 두 번째는 2초 대기
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await self.queue.send_message(2, "hi")
+        self.assertLess(time.monotonic() - start, 0.5)
+        group.cancel()
+
+    async def test_chunks_of_one_chat_keep_order(self):
+        self.queue.private_chat_rate = 1000.0
+        paragraphs = [str(i) * 3000 for i in range(4)]  # 문단마다 한 조각
+        await self.queue.send_text(3, "\n\n".join(paragraphs))
+        sent = [text for kind, chat_id, text, _ in self.bot.calls if chat_id == 3]
+        self.assertEqual(sent, paragraphs)
+
+    async def test_idle_chat_state_is_evicted(self):
+        await self.queue.send_message(4, "hi")
+        self.assertIn(4, self.queue._chats)
+        await asyncio.sleep(0.1)
+        self.assertNotIn(4, self.queue._chats)
+
+
+if __name__ == '__main__':
+    unittest.main()
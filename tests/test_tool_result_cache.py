@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+from src.managed_server import ManagedMCPServer
+from src.tool_result_cache import ToolResultCache, arguments_hash
+from tests.fakes import FakeMCPServer, text_result
+
+
+class CountingCall:
+    def __init__(self, text: str = "result", delay: float = 0.0, is_error: bool = False):
+        self.text = text
+        self.delay = delay
+        self.is_error = is_error
+        self.count = 0
+
+    async def __call__(self):
+        self.count += 1
+        await asyncio.sleep(self.delay)
+        return text_result(self.text, self.is_error)
+
+
+class ArgumentsHashTest(unittest.TestCase):
+    def test_key_order_does_not_matter(self):
+        self.assertEqual(arguments_hash({'q': 'a', 'n': 1}), arguments_hash({'n': 1, 'q': 'a'}))
+
+    def test_none_and_empty_are_equal(self):
+        self.assertEqual(arguments_hash(None), arguments_hash({}))
+
+
+class ToolResultCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_hit_within_ttl(self):
+        cache = ToolResultCache()
+        call = CountingCall()
+        for _ in range(3):
+            await cache.get_or_call("news", "search", {'q': 'a'}, 60.0, call)
+        self.assertEqual(call.count, 1)
+        self.assertEqual(cache.stats()['tools']['news/search']['hits'], 2)
+
+    async def test_expired_entry_calls_again(self):
+        cache = ToolResultCache()
+        call = CountingCall()
+        await cache.get_or_call("news", "search", {}, 0.05, call)
+        await asyncio.sleep(0.06)
+        await cache.get_or_call("news", "search", {}, 0.05, call)
+        self.assertEqual(call.count, 2)
+
+    async def test_concurrent_calls_are_coalesced(self):
+        cache = ToolResultCache()
+        call = CountingCall(delay=0.05)
+        results = await asyncio.gather(*(cache.get_or_call("news", "search", {}, 60.0, call) for _ in range(5)))
+        self.assertEqual(call.count, 1)
+        self.assertEqual({r.content[0].text for r in results}, {"result"})
+        self.assertEqual(cache.stats()['tools']['news/search']['coalesced'], 4)
+
+    async def test_error_results_are_not_cached(self):
+        cache = ToolResultCache()
+        call = CountingCall(is_error=True)
+        await cache.get_or_call("news", "search", {}, 60.0, call)
+        await cache.get_or_call("news", "search", {}, 60.0, call)
+        self.assertEqual(call.count, 2)
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = ToolResultCache(max_entries=2)
+        calls = {q: CountingCall(q) for q in "abc"}
+        for q in "ab":
+            await cache.get_or_call("news", "search", {'q': q}, 60.0, calls[q])
+        await cache.get_or_call("news", "search", {'q': 'a'}, 60.0, calls['a'])  # a를 최근 사용으로
+        await cache.get_or_call("news", "search", {'q': 'c'}, 60.0, calls['c'])  # b가 밀려남
+
+        await cache.get_or_call("news", "search", {'q': 'a'}, 60.0, calls['a'])
+        await cache.get_or_call("news", "search", {'q': 'b'}, 60.0, calls['b'])
+        self.assertEqual((calls['a'].count, calls['b'].count), (1, 2))
+
+    async def test_byte_limit_bounds_cache_size(self):
+        cache = ToolResultCache(max_bytes=300)
+        for q in "abcd":
+            await cache.get_or_call("news", "search", {'q': q}, 60.0, CountingCall(q * 50))
+        self.assertLessEqual(cache.stats()['bytes'], 300)
+        self.assertLess(cache.stats()['entries'], 4)
+
+
+    async def test_invalidate_server_drops_only_its_entries(self):
+        cache = ToolResultCache()
+        news, weather = CountingCall(), CountingCall()
+        await cache.get_or_call("news", "search", {}, 60.0, news)
+        await cache.get_or_call("weather", "search", {}, 60.0, weather)
+        cache.invalidate_server("news")
+        await cache.get_or_call("news", "search", {}, 60.0, news)
+        await cache.get_or_call("weather", "search", {}, 60.0, weather)
+        self.assertEqual((news.count, weather.count), (2, 1))
+
+    async def test_server_uses_cache_only_for_configured_tools(self):
+        inner = FakeMCPServer()
+        server = ManagedMCPServer(lambda: inner, "cached-news")
+        server.tool_cache_ttls = {'search': 60.0}
+        await server.connect()
+        self.addAsyncCleanup(server.cleanup)
+
+        for _ in range(2):
+            await server.call_tool("search", {'q': 'a'})
+            await server.call_tool("post", {'q': 'a'})
+
+        self.assertEqual([name for name, _ in inner.calls], ["search", "post", "post"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from agents.agent import Agent
+
+from src.tool_router import BM25Index, ToolRouter, ToolSubsetServer, tokenize
+from tests.fakes import make_tool
+
+
+class ToolListServer:
+    def __init__(self, name, tools):
+        self.name = name
+        self.tools = tools
+
+    async def list_tools(self):
+        return list(self.tools)
+
+
+def servers():
+    return [
+        ToolListServer("naver", [
+            make_tool("search_news", "네이버 뉴스 검색"),
+            make_tool("search_blog", "네이버 블로그 검색"),
+            make_tool("search_shop", "쇼핑 상품 가격 검색"),
+        ]),
+        ToolListServer("weather", [
+            make_tool("get_forecast", "지역별 날씨 예보"),
+            make_tool("get_air_quality", "미세먼지 대기질 조회"),
+        ]),
+    ]
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_splits_identifiers_and_adds_hangul_bigrams(self):
+        self.assertEqual(tokenize("search_news"), ["search", "news"])
+        self.assertEqual(tokenize("날씨를"), ["날씨를", "날씨", "씨를"])
+
+
+class BM25IndexTest(unittest.TestCase):
+    def test_matching_document_ranks_first(self):
+        index = BM25Index(["뉴스 검색", "날씨 예보", "블로그 검색"])
+        scores = index.scores("오늘 날씨 어때")
+        self.assertEqual(max(range(3), key=lambda i: scores[i]), 1)
+        self.assertEqual(scores[0], 0.0)
+
+
+class ToolRouterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_selects_top_k_tools_grouped_by_server(self):
+        router = ToolRouter(top_k=2, min_tools=2, enabled=True)
+        selection = await router.select(servers(), "내일 서울 날씨 예보랑 미세먼지 알려줘")
+        self.assertEqual(selection, {1: {"get_forecast", "get_air_quality"}})
+
+    async def test_small_tool_sets_are_not_routed(self):
+        router = ToolRouter(top_k=2, min_tools=10, enabled=True)
+        self.assertIsNone(await router.select(servers(), "날씨"))
+
+    async def test_no_matching_tool_keeps_all_tools(self):
+        router = ToolRouter(top_k=2, min_tools=2, enabled=True)
+        self.assertIsNone(await router.select(servers(), "hello"))
+
+    async def test_route_returns_agent_with_tool_subset(self):
+        agent = Agent(name="test", instructions="", mcp_servers=servers())
+        router = ToolRouter(top_k=1, min_tools=2, enabled=True)
+
+        routed = await router.route(agent, "뉴스 찾아줘")
+
+        self.assertIsNot(routed, agent)
+        self.assertEqual(len(routed.mcp_servers), 1)
+        self.assertIsInstance(routed.mcp_servers[0], ToolSubsetServer)
+        self.assertEqual([tool.name for tool in await routed.mcp_servers[0].list_tools()], ["search_news"])
+        self.assertEqual(len(agent.mcp_servers), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from src.agent_setup import connect_server
+from src.managed_server import ManagedMCPServer
+from src.tool_schema_cache import ToolSchemaCache, config_hash
+from tests.fakes import FakeMCPServer, make_tool
+
+CONFIG = {'name': 'search', 'command': 'python', 'args': ['src/search.py']}
+
+
+class ConfigHashTest(unittest.TestCase):
+    def test_key_order_does_not_matter(self):
+        reordered = {'args': ['src/search.py'], 'command': 'python', 'name': 'search'}
+        self.assertEqual(config_hash(CONFIG), config_hash(reordered))
+
+    def test_runtime_options_are_ignored(self):
+        self.assertEqual(config_hash(CONFIG), config_hash({**CONFIG, 'replicas': 3}))
+
+    def test_command_change_changes_hash(self):
+        self.assertNotEqual(config_hash(CONFIG), config_hash({**CONFIG, 'args': ['src/other.py']}))
+
+
+class ToolSchemaCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'tool_schemas.json')
+
+    def test_store_and_get_across_instances(self):
+        tools = [make_tool("search", "웹 검색")]
+        ToolSchemaCache(self.path).store(CONFIG, "1.0", tools)
+
+        cached = ToolSchemaCache(self.path).get(CONFIG)
+
+        self.assertEqual([tool.name for tool in cached], ["search"])
+        self.assertEqual(cached[0].description, "웹 검색")
+
+    def test_changed_config_misses(self):
+        cache = ToolSchemaCache(self.path)
+        cache.store(CONFIG, "1.0", [make_tool("search")])
+        self.assertIsNone(cache.get({**CONFIG, 'args': ['src/other.py']}))
+        self.assertIsNotNone(cache.get({**CONFIG, 'replicas': 2}))
+
+    def test_matches_checks_version_and_tools(self):
+        cache = ToolSchemaCache(self.path)
+        tools = [make_tool("search")]
+        cache.store(CONFIG, "1.0", tools)
+        self.assertTrue(cache.matches(CONFIG, "1.0", tools))
+        self.assertFalse(cache.matches(CONFIG, "1.1", tools))
+        self.assertFalse(cache.matches(CONFIG, "1.0", tools + [make_tool("news")]))
+
+    def test_corrupt_file_is_treated_as_empty(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(ToolSchemaCache(self.path).get(CONFIG))
+
+    def test_invalidate_removes_entry(self):
+        cache = ToolSchemaCache(self.path)
+        cache.store(CONFIG, "1.0", [make_tool("search")])
+        cache.invalidate(CONFIG)
+        self.assertIsNone(ToolSchemaCache(self.path).get(CONFIG))
+
+
+class WarmStartTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ToolSchemaCache(os.path.join(self.tmp.name, 'tool_schemas.json'))
+        patcher = mock.patch('src.agent_setup.get_tool_schema_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_cached_schema_serves_tools_before_connect(self):
+        self.cache.store(CONFIG, None, [make_tool("search")])
+        inner = FakeMCPServer(tools=[make_tool("search"), make_tool("news")], connect_delay=0.2)
+        server = ManagedMCPServer(lambda: inner, "search", CONFIG)
+        self.addAsyncCleanup(server.cleanup)
+
+        await connect_server(server, timeout=5.0)
+
+        self.assertTrue(server.schema_from_cache)
+        self.assertLess(server.startup_ms, 100.0)
+        self.assertEqual([tool.name for tool in await server.list_tools()], ["search"])
+
+        # 연결이 끝나면 실제 도구 목록으로 캐시와 서버가 갱신됨
+        await server.wait_connected()
+        await asyncio.sleep(0.05)
+        self.assertFalse(server.schema_from_cache)
+        self.assertEqual([tool.name for tool in self.cache.get(CONFIG)], ["search", "news"])
+
+    async def test_cold_start_stores_schema(self):
+        server = ManagedMCPServer(lambda: FakeMCPServer(), "search", CONFIG)
+        self.addAsyncCleanup(server.cleanup)
+
+        await connect_server(server, timeout=5.0)
+
+        self.assertFalse(server.schema_from_cache)
+        self.assertEqual([tool.name for tool in self.cache.get(CONFIG)], ["search"])
+
+
+if __name__ == '__main__':
+    unittest.main()